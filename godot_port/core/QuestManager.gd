@@ -9,13 +9,25 @@
 #   QuestManager.get_all_quests()                    -> Array   (for QuestLogScene)
 #   QuestManager.is_quest_active(quest_id)           -> bool
 #   QuestManager.is_quest_complete(quest_id)         -> bool
+#
+# Dialog selection uses the precompiled decision tables in
+# data/quest_tables.json (tools/quest_tool.py --compile --write) when present,
+# and falls back to walking the quest JSON for NPCs the tables don't cover.
+# Tables compiled from different quest files (their "sources" hash no longer
+# matches data/quests/*.json) are ignored with a warning.
 
 extends Node
 
 const _ChoicePanel := preload("res://ui/dialog/ChoicePanel.tscn")
 const _ItemPopup   := preload("res://ui/popup/ItemAcquiredPopup.tscn")
 
+const TABLES_PATH := "res://data/quest_tables.json"
+const TABLES_VERSION := 2
+
 var _quests: Dictionary = {}  # quest_id -> data dict
+var _source_hashes: Dictionary = {}      # quest file name -> SHA-256 hex
+var _table_keys: PackedStringArray = []  # stable state-key numbering
+var _npc_tables: Dictionary = {}         # npc_id -> {"keys": PackedStringArray, "rules": Array}
 
 # ---------------------------------------------------------------------------
 # Lifecycle
@@ -23,6 +35,7 @@ var _quests: Dictionary = {}  # quest_id -> data dict
 
 func _ready() -> void:
 	_load_quests()
+	_load_tables()
 
 
 func _load_quests() -> void:
@@ -36,6 +49,8 @@ func _load_quests() -> void:
 		if not dir.current_is_dir() and fname.ends_with(".json"):
 			var path := "res://data/quests/" + fname
 			var text := FileAccess.get_file_as_string(path)
+			# Hash LF-normalized text so CRLF checkouts match quest_tool
+			_source_hashes[fname] = text.replace("\r\n", "\n").sha256_text()
 			var data = JSON.parse_string(text)
 			if data == null:
 				push_error("QuestManager: failed to parse %s" % path)
@@ -44,6 +59,39 @@ func _load_quests() -> void:
 		fname = dir.get_next()
 	dir.list_dir_end()
 
+
+func _load_tables() -> void:
+	if not FileAccess.file_exists(TABLES_PATH):
+		return
+	var data = JSON.parse_string(FileAccess.get_file_as_string(TABLES_PATH))
+	if not data is Dictionary or int(data.get("version", 0)) != TABLES_VERSION:
+		push_warning("QuestManager: ignoring %s (unreadable or wrong version)" % TABLES_PATH)
+		return
+	if data.get("sources", "") != _sources_hash():
+		push_warning("QuestManager: ignoring %s (quest files changed since it was compiled; run tools/quest_tool.py --compile --write)" % TABLES_PATH)
+		return
+	_table_keys = PackedStringArray(data["keys"])
+	for npc_id in data["npcs"]:
+		var table: Dictionary = data["npcs"][npc_id]
+		var keys := PackedStringArray()
+		for i in table["keys"]:
+			keys.append(_table_keys[int(i)])
+		# JSON numbers arrive as floats; convert masks once here
+		var rules := []
+		for rule in table["rules"]:
+			rules.append([int(rule[0]), int(rule[1]), rule[2]])
+		_npc_tables[npc_id] = {"keys": keys, "rules": rules}
+
+## Same as quest_tool.quest_sources_hash(): SHA-256 of "<file>:<sha256>\n"
+## lines in sorted file-name order, each file hashed with CRLF read as LF.
+func _sources_hash() -> String:
+	var names := _source_hashes.keys()
+	names.sort()
+	var text := ""
+	for fname in names:
+		text += "%s:%s\n" % [fname, _source_hashes[fname]]
+	return text.sha256_text()
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -53,6 +101,9 @@ func _load_quests() -> void:
 ## Returns "" if npc_id is not found in any quest.
 func get_npc_dialog(npc_id: String) -> String:
 	var pd := ProgressData.new()
+	var table = _npc_tables.get(npc_id)
+	if table != null:
+		return _lookup_compiled(table, pd)
 	for quest in _quests.values():
 		var npc_data = quest.get("npcs", {}).get(npc_id)
 		if npc_data == null:
@@ -135,6 +186,20 @@ func _check_requires(requires: Dictionary, pd: ProgressData) -> bool:
 			return false
 	return true
 
+
+## Packs the NPC's few relevant flags into an int (bit i = table keys[i]),
+## then returns the dialog of the first rule whose masked bits match.
+func _lookup_compiled(table: Dictionary, pd: ProgressData) -> String:
+	var state := 0
+	var keys: PackedStringArray = table["keys"]
+	for i in keys.size():
+		if pd.get_quest(keys[i]):
+			state |= 1 << i
+	for rule in table["rules"]:
+		if (state & rule[0]) == rule[1]:
+			return rule[2]
+	return ""
+
 # ---------------------------------------------------------------------------
 # Internal — action execution
 # ---------------------------------------------------------------------------
@@ -1,36 +1,153 @@
-"""Generate pixel art sprites for tutorial level entities."""
-from PIL import Image
+"""Generate pixel art sprites for tutorial level entities.
+
+Sprites are drawn on an array-backed Canvas: every pixel holds an index into
+the canvas palette (0 = transparent), so a sprite can be recoloured by
+swapping palettes without redrawing it.  PIL is only used to save.
+
+Usage:
+  python generate_sprites.py
+      Write sprites/*.png.
+
+  python generate_sprites.py --variants 200
+      Also write 200 hue-shifted variants of every sprite to
+      sprites/variants/<name>_<n>.png.  The folder gets a .gdignore so
+      Godot does not import the variants as game assets; use
+      --variants-out DIR to write them elsewhere.
+"""
+import argparse
 import os
 
+import numpy as np
+from PIL import Image
+
 OUT = os.path.dirname(__file__)
 SPRITES = os.path.join(OUT, "sprites")
 os.makedirs(SPRITES, exist_ok=True)
 
-def px(img, x, y, color):
-    """Set a pixel with bounds check."""
-    if 0 <= x < img.width and 0 <= y < img.height:
-        img.putpixel((x, y), color)
-
-def rect(img, x1, y1, x2, y2, color):
-    """Fill a rectangle."""
-    for y in range(y1, y2 + 1):
-        for x in range(x1, x2 + 1):
-            px(img, x, y, color)
-
-def outline_rect(img, x1, y1, x2, y2, color):
-    """Draw rectangle outline."""
-    for x in range(x1, x2 + 1):
-        px(img, x, y1, color)
-        px(img, x, y2, color)
-    for y in range(y1, y2 + 1):
-        px(img, x1, y, color)
-        px(img, x2, y, color)
+CLEAR = (0, 0, 0, 0)
+
+# =============================================================================
+# CANVAS
+# =============================================================================
+class Canvas:
+    """RGBA pixel canvas stored as palette indices.
+
+    Like Image.putpixel, drawing replaces pixels (no alpha blending) and
+    anything outside the canvas is clipped.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.index = np.zeros((height, width), dtype=np.uint16)
+        self.colors = [CLEAR]
+        self._lookup = {CLEAR: 0}
+
+    def ink(self, color):
+        """Palette index for an RGBA tuple, adding it if new."""
+        color = tuple(color)
+        i = self._lookup.get(color)
+        if i is None:
+            i = self._lookup[color] = len(self.colors)
+            self.colors.append(color)
+        return i
+
+    def px(self, x, y, color):
+        """Set a pixel with bounds check."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.index[y, x] = self.ink(color)
+
+    def points(self, coords, color):
+        """Set a list of (x, y) pixels."""
+        xy = np.asarray(coords, dtype=np.int64).reshape(-1, 2)
+        keep = (xy[:, 0] >= 0) & (xy[:, 0] < self.width) & (xy[:, 1] >= 0) & (xy[:, 1] < self.height)
+        xy = xy[keep]
+        self.index[xy[:, 1], xy[:, 0]] = self.ink(color)
+
+    def _clip(self, x1, y1, x2, y2):
+        return max(x1, 0), max(y1, 0), min(x2, self.width - 1) + 1, min(y2, self.height - 1) + 1
+
+    def rect(self, x1, y1, x2, y2, color):
+        """Fill a rectangle (inclusive corners)."""
+        x1, y1, x2, y2 = self._clip(x1, y1, x2, y2)
+        self.index[y1:y2, x1:x2] = self.ink(color)
+
+    def outline_rect(self, x1, y1, x2, y2, color):
+        """Draw rectangle outline."""
+        self.rect(x1, y1, x2, y1, color)
+        self.rect(x1, y2, x2, y2, color)
+        self.rect(x1, y1, x1, y2, color)
+        self.rect(x2, y1, x2, y2, color)
+
+    def line(self, x1, y1, x2, y2, color):
+        """One pixel wide line, one pixel per step along the major axis."""
+        steps = max(abs(x2 - x1), abs(y2 - y1))
+        t = np.arange(steps + 1) / max(steps, 1)
+        xs = np.floor(x1 + (x2 - x1) * t + 0.5).astype(np.int64)
+        ys = np.floor(y1 + (y2 - y1) * t + 0.5).astype(np.int64)
+        self.points(np.stack([xs, ys], axis=1), color)
+
+    def fill_empty(self, x1, y1, x2, y2, color):
+        """Fill the transparent pixels of a rectangle."""
+        x1, y1, x2, y2 = self._clip(x1, y1, x2, y2)
+        region = self.index[y1:y2, x1:x2]
+        region[region == 0] = self.ink(color)
+
+    def mirror(self):
+        """Copy the left half onto the right half, flipped (left-right symmetry)."""
+        half = self.width // 2
+        self.index[:, self.width - half:] = self.index[:, :half][:, ::-1]
+
+    def blit(self, x, y, rows, palette):
+        """Paint a character map: ``palette[ch]`` per character, spaces left alone."""
+        for dy, row in enumerate(rows):
+            for ch in set(row) - {" "}:
+                xs = [x + dx for dx, c in enumerate(row) if c == ch]
+                self.points([(px, y + dy) for px in xs], palette[ch])
+
+    def rgba(self, palettes=None):
+        """uint8 pixels: (h, w, 4), or (n, h, w, 4) for an (n, colors, 4) palette stack."""
+        if palettes is None:
+            palettes = np.array(self.colors, dtype=np.uint8)
+        return np.asarray(palettes, dtype=np.uint8)[..., self.index, :]
+
+    def image(self):
+        return Image.fromarray(self.rgba(), "RGBA")
+
+    def save(self, name):
+        self.image().save(os.path.join(SPRITES, name))
+        print(f"  {name} ({self.width}x{self.height})")
+
+
+def hue_variants(colors, count):
+    """``count`` palettes with every colour's hue rotated by i / count turns.
+
+    Rotates chroma in YIQ space, so brightness is kept; alpha is untouched
+    and index 0 stays transparent.
+    """
+    base = np.array(colors, dtype=np.float64)
+    to_yiq = np.array([[0.299, 0.587, 0.114],
+                       [0.596, -0.274, -0.322],
+                       [0.211, -0.523, 0.312]])
+    angle = 2.0 * np.pi * np.arange(count) / count
+    rot = np.zeros((count, 3, 3))
+    rot[:, 0, 0] = 1.0
+    rot[:, 1, 1] = rot[:, 2, 2] = np.cos(angle)
+    rot[:, 1, 2] = -np.sin(angle)
+    rot[:, 2, 1] = np.sin(angle)
+    m = np.linalg.inv(to_yiq) @ rot @ to_yiq                     # (count, 3, 3)
+    rgb = np.einsum("nij,cj->nci", m, base[:, :3])
+    out = np.empty((count, len(colors), 4), dtype=np.uint8)
+    out[..., :3] = np.clip(np.rint(rgb), 0, 255)
+    out[..., 3] = base[:, 3]
+    out[:, 0] = CLEAR
+    return out
 
 # =============================================================================
 # FIGHTER — 16x16 armored humanoid with sword (red/brown palette)
 # =============================================================================
-def make_fighter():
-    img = Image.new("RGBA", (16, 16), (0, 0, 0, 0))
+def draw_fighter():
+    c = Canvas(16, 16)
 
     # Colors
     helmet = (180, 60, 60, 255)      # dark red
@@ -46,78 +163,54 @@ def make_fighter():
     boot = (80, 50, 40, 255)        # boots
 
     # Helmet (rows 1-4, centered)
-    rect(img, 5, 1, 10, 1, helmet)        # top
-    rect(img, 4, 2, 11, 2, helmet)        # wider
-    rect(img, 4, 3, 11, 3, helmet)
-    px(img, 6, 2, helmet_hi)              # highlight
-    px(img, 7, 2, helmet_hi)
+    c.rect(5, 1, 10, 1, helmet)           # top
+    c.rect(4, 2, 11, 3, helmet)           # wider
+    c.rect(6, 2, 7, 2, helmet_hi)         # highlight
     # Visor slit
-    rect(img, 5, 4, 10, 4, helmet)
-    px(img, 6, 4, visor)
-    px(img, 7, 4, visor)
-    px(img, 9, 4, visor)
+    c.rect(5, 4, 10, 4, helmet)
+    c.points([(6, 4), (7, 4), (9, 4)], visor)
 
     # Neck
-    px(img, 7, 5, skin)
-    px(img, 8, 5, skin)
+    c.rect(7, 5, 8, 5, skin)
 
     # Shoulders + armor body (rows 6-10)
-    rect(img, 3, 6, 12, 6, armor)         # shoulders
-    px(img, 3, 6, armor_hi)
-    rect(img, 4, 7, 11, 7, armor)
-    rect(img, 5, 8, 10, 8, armor)
-    rect(img, 5, 9, 10, 9, armor_dk)
-    rect(img, 5, 10, 10, 10, armor)
+    c.rect(3, 6, 12, 6, armor)            # shoulders
+    c.px(3, 6, armor_hi)
+    c.rect(4, 7, 11, 7, armor)
+    c.rect(5, 8, 10, 8, armor)
+    c.rect(5, 9, 10, 9, armor_dk)
     # Belt
-    rect(img, 5, 10, 10, 10, hilt)
+    c.rect(5, 10, 10, 10, hilt)
 
     # Armor chest highlight
-    px(img, 6, 7, armor_hi)
-    px(img, 7, 7, armor_hi)
-    px(img, 6, 8, armor_hi)
+    c.points([(6, 7), (7, 7), (6, 8)], armor_hi)
 
     # Sword (right side, rows 3-11)
-    px(img, 13, 3, sword_hi)              # blade tip
-    px(img, 13, 4, sword)
-    px(img, 13, 5, sword)
-    px(img, 13, 6, sword)
-    px(img, 13, 7, sword)
-    px(img, 13, 8, sword_hi)
-    px(img, 12, 9, hilt)                  # crossguard
-    px(img, 13, 9, hilt)
-    px(img, 14, 9, hilt)
-    px(img, 13, 10, hilt)                 # grip
+    c.line(13, 4, 13, 7, sword)
+    c.points([(13, 3), (13, 8)], sword_hi)  # blade tip + highlight
+    c.line(12, 9, 14, 9, hilt)            # crossguard
+    c.px(13, 10, hilt)                    # grip
 
     # Arms
-    px(img, 3, 7, skin)
-    px(img, 3, 8, skin)
-    px(img, 12, 7, skin)
-    px(img, 12, 8, skin)
+    c.points([(3, 7), (3, 8), (12, 7), (12, 8)], skin)
 
     # Legs (rows 11-13)
-    rect(img, 5, 11, 7, 13, armor_dk)     # left leg
-    rect(img, 8, 11, 10, 13, armor_dk)    # right leg
+    c.rect(5, 11, 10, 13, armor_dk)
 
     # Boots
-    rect(img, 5, 14, 7, 14, boot)
-    rect(img, 8, 14, 10, 14, boot)
-    px(img, 4, 14, boot)                  # boot edges
-    px(img, 11, 14, boot)
+    c.rect(4, 14, 11, 14, boot)
 
     # Shield (left side)
-    rect(img, 1, 6, 3, 10, (100, 100, 120, 255))
-    px(img, 2, 7, (130, 130, 150, 255))   # shield highlight
-    px(img, 2, 8, (130, 130, 150, 255))
-    outline_rect(img, 1, 6, 3, 10, (70, 70, 85, 255))
-
-    img.save(os.path.join(SPRITES, "fighter.png"))
-    print("  fighter.png (16x16)")
+    c.rect(1, 6, 3, 10, (100, 100, 120, 255))
+    c.rect(2, 7, 2, 8, (130, 130, 150, 255))  # shield highlight
+    c.outline_rect(1, 6, 3, 10, (70, 70, 85, 255))
+    return c
 
 # =============================================================================
 # WORM — 16x12 segmented worm creature (green/yellow palette)
 # =============================================================================
-def make_worm():
-    img = Image.new("RGBA", (16, 12), (0, 0, 0, 0))
+def draw_worm():
+    c = Canvas(16, 12)
 
     # Colors
     body = (100, 160, 50, 255)       # green body
@@ -127,75 +220,54 @@ def make_worm():
     eye_w = (255, 255, 255, 255)     # eye white
     eye_p = (20, 20, 20, 255)        # pupil
     segment = (80, 140, 40, 255)     # segment lines
+    mouth = (180, 60, 60, 255)
 
     # Body curve (wider in front, tapers to tail)
     # Head (rows 2-6, cols 10-15)
-    rect(img, 11, 2, 14, 3, body)
-    rect(img, 10, 4, 15, 6, body)
-    rect(img, 11, 7, 14, 7, body)
-    px(img, 12, 3, body_hi)
-    px(img, 13, 3, body_hi)
-    px(img, 12, 5, body_hi)
+    c.rect(11, 2, 14, 3, body)
+    c.rect(10, 4, 15, 6, body)
+    c.rect(11, 7, 14, 7, body)
+    c.points([(12, 3), (13, 3), (12, 5)], body_hi)
 
     # Eyes
-    px(img, 13, 4, eye_w)
-    px(img, 14, 4, eye_p)
-    px(img, 13, 5, eye_w)  # second eye slightly lower for depth
+    c.px(13, 4, eye_w)
+    c.px(14, 4, eye_p)
+    c.px(13, 5, eye_w)  # second eye slightly lower for depth
 
     # Mouth
-    px(img, 15, 5, (180, 60, 60, 255))
-    px(img, 15, 6, (180, 60, 60, 255))
+    c.line(15, 5, 15, 6, mouth)
 
     # Mid-body segments (cols 4-10)
-    rect(img, 5, 4, 10, 7, body)
-    rect(img, 6, 3, 9, 3, body)
+    c.rect(5, 4, 10, 7, body)
+    c.rect(6, 3, 9, 3, body)
     # Belly
-    rect(img, 6, 7, 10, 7, belly)
-    rect(img, 12, 7, 13, 7, belly)
+    c.rect(6, 7, 10, 7, belly)
+    c.rect(12, 7, 13, 7, belly)
 
     # Segment lines
-    px(img, 8, 3, segment)
-    px(img, 8, 4, segment)
-    px(img, 8, 5, segment)
-    px(img, 8, 6, segment)
-    px(img, 8, 7, segment)
-
-    px(img, 11, 3, segment)
-    px(img, 11, 4, segment)
-    px(img, 11, 5, segment)
-    px(img, 11, 6, segment)
-    px(img, 11, 7, segment)
+    c.line(8, 3, 8, 7, segment)
+    c.line(11, 3, 11, 7, segment)
 
     # Highlights on segments
-    px(img, 6, 4, body_hi)
-    px(img, 7, 4, body_hi)
-    px(img, 9, 4, body_hi)
-    px(img, 10, 4, body_hi)
+    c.points([(6, 4), (7, 4), (9, 4), (10, 4)], body_hi)
 
     # Tail (cols 1-5)
-    rect(img, 2, 5, 5, 7, body)
-    rect(img, 3, 4, 4, 4, body)
-    px(img, 1, 6, body_dk)            # tail tip
-    px(img, 2, 5, body_dk)
+    c.rect(2, 5, 5, 7, body)
+    c.rect(3, 4, 4, 4, body)
+    c.points([(1, 6), (2, 5)], body_dk)  # tail tip
 
     # Segment line on tail
-    px(img, 5, 4, segment)
-    px(img, 5, 5, segment)
-    px(img, 5, 6, segment)
-    px(img, 5, 7, segment)
+    c.line(5, 4, 5, 7, segment)
 
     # Shadow underneath
-    for x in range(3, 14):
-        px(img, x, 8, (50, 80, 30, 100))
-
-    img.save(os.path.join(SPRITES, "worm.png"))
-    print("  worm.png (16x12)")
+    c.line(3, 8, 13, 8, (50, 80, 30, 100))
+    return c
 
 # =============================================================================
 # THIEF — 16x16 cloaked rogue with dagger (purple/dark palette)
 # =============================================================================
-def make_thief():
-    img = Image.new("RGBA", (16, 16), (0, 0, 0, 0))
+def draw_thief():
+    c = Canvas(16, 16)
 
     # Colors
     cloak = (80, 40, 100, 255)       # dark purple cloak
@@ -211,77 +283,48 @@ def make_thief():
     boot = (50, 30, 40, 255)
 
     # Hood (rows 1-5)
-    rect(img, 5, 1, 10, 1, hood)
-    rect(img, 4, 2, 11, 2, hood)
-    rect(img, 4, 3, 11, 4, hood)
-    px(img, 6, 2, hood_hi)
-    px(img, 7, 2, hood_hi)
+    c.rect(5, 1, 10, 1, hood)
+    c.rect(4, 2, 11, 4, hood)
+    c.rect(6, 2, 7, 2, hood_hi)
 
     # Face under hood (shadowed, just eyes visible)
-    rect(img, 5, 5, 10, 5, cloak_dk)
-    px(img, 6, 5, eye)                # left eye
-    px(img, 9, 5, eye)                # right eye
+    c.rect(5, 5, 10, 5, cloak_dk)
+    c.points([(6, 5), (9, 5)], eye)
 
     # Cloak body (rows 6-12, wider flowing shape)
-    rect(img, 3, 6, 12, 6, cloak)
-    rect(img, 3, 7, 12, 7, cloak)
-    rect(img, 2, 8, 13, 8, cloak)     # wider
-    rect(img, 2, 9, 13, 9, cloak)
-    rect(img, 2, 10, 13, 10, cloak)
-    rect(img, 3, 11, 12, 11, cloak)
-    rect(img, 3, 12, 12, 12, cloak_dk)
+    c.rect(3, 6, 12, 7, cloak)
+    c.rect(2, 8, 13, 10, cloak)       # wider
+    c.rect(3, 11, 12, 11, cloak)
+    c.rect(3, 12, 12, 12, cloak_dk)
 
     # Cloak highlight (left side catches light)
-    px(img, 4, 7, cloak_hi)
-    px(img, 4, 8, cloak_hi)
-    px(img, 3, 9, cloak_hi)
-    px(img, 3, 10, cloak_hi)
-    px(img, 4, 11, cloak_hi)
+    c.points([(4, 7), (4, 8), (3, 9), (3, 10), (4, 11)], cloak_hi)
 
     # Cloak shadow (right side)
-    px(img, 11, 7, cloak_dk)
-    px(img, 12, 8, cloak_dk)
-    px(img, 12, 9, cloak_dk)
-    px(img, 12, 10, cloak_dk)
-    px(img, 11, 11, cloak_dk)
+    c.points([(11, 7), (12, 8), (12, 9), (12, 10), (11, 11)], cloak_dk)
 
     # Cloak hem detail
-    px(img, 3, 12, cloak)
-    px(img, 5, 12, cloak)
-    px(img, 7, 12, cloak)
-    px(img, 9, 12, cloak)
-    px(img, 11, 12, cloak)
+    c.points([(x, 12) for x in range(3, 12, 2)], cloak)
 
     # Dagger (right hand, poking out of cloak)
-    px(img, 13, 7, skin)              # hand
-    px(img, 14, 6, dagger_hi)         # blade
-    px(img, 14, 5, dagger)
-    px(img, 14, 4, dagger)
-    px(img, 14, 3, dagger_hi)         # tip
-    px(img, 14, 7, hilt)              # hilt
+    c.px(13, 7, skin)                 # hand
+    c.line(14, 4, 14, 5, dagger)      # blade
+    c.points([(14, 3), (14, 6)], dagger_hi)  # tip + highlight
+    c.px(14, 7, hilt)                 # hilt
 
     # Legs peeking below cloak
-    rect(img, 5, 13, 6, 14, cloak_dk)
-    rect(img, 9, 13, 10, 14, cloak_dk)
+    c.rect(5, 13, 6, 14, cloak_dk)
+    c.rect(9, 13, 10, 14, cloak_dk)
 
     # Boots
-    px(img, 4, 14, boot)
-    px(img, 5, 14, boot)
-    px(img, 6, 14, boot)
-    px(img, 7, 14, boot)
-    px(img, 8, 14, boot)
-    px(img, 9, 14, boot)
-    px(img, 10, 14, boot)
-    px(img, 11, 14, boot)
-
-    img.save(os.path.join(SPRITES, "thief.png"))
-    print("  thief.png (16x16)")
+    c.rect(4, 14, 11, 14, boot)
+    return c
 
 # =============================================================================
 # DOOR — 12x32 wooden door with planks and iron bands
 # =============================================================================
-def make_door():
-    img = Image.new("RGBA", (12, 32), (0, 0, 0, 0))
+def draw_door():
+    c = Canvas(12, 32)
 
     # Colors
     wood = (140, 90, 50, 255)
@@ -289,54 +332,38 @@ def make_door():
     wood_dk = (100, 65, 35, 255)
     iron = (80, 85, 95, 255)
     iron_hi = (110, 115, 125, 255)
+    rivet = (60, 65, 75, 255)
 
     # Fill with wood base
-    rect(img, 0, 0, 11, 31, wood)
+    c.rect(0, 0, 11, 31, wood)
 
     # Plank lines (vertical)
-    for y in range(32):
-        px(img, 4, y, wood_dk)
-        px(img, 8, y, wood_dk)
+    for x in (4, 8):
+        c.line(x, 0, x, 31, wood_dk)
 
     # Plank highlights
-    for y in range(32):
-        px(img, 2, y, wood_hi)
-        px(img, 6, y, wood_hi)
-        px(img, 10, y, wood_hi)
+    for x in (2, 6, 10):
+        c.line(x, 0, x, 31, wood_hi)
 
-    # Iron bands (horizontal)
+    # Iron bands (horizontal) with highlights and rivets
     for band_y in [3, 15, 27]:
-        rect(img, 0, band_y, 11, band_y + 1, iron)
-        px(img, 1, band_y, iron_hi)
-        px(img, 5, band_y, iron_hi)
-        px(img, 9, band_y, iron_hi)
-
-    # Iron rivets on bands
-    for band_y in [3, 15, 27]:
-        px(img, 2, band_y, (60, 65, 75, 255))
-        px(img, 6, band_y, (60, 65, 75, 255))
-        px(img, 10, band_y, (60, 65, 75, 255))
+        c.rect(0, band_y, 11, band_y + 1, iron)
+        c.points([(1, band_y), (5, band_y), (9, band_y)], iron_hi)
+        c.points([(2, band_y), (6, band_y), (10, band_y)], rivet)
 
     # Door handle (right side, middle)
-    px(img, 10, 16, iron_hi)
-    px(img, 10, 17, iron)
+    c.px(10, 16, iron_hi)
+    c.px(10, 17, iron)
 
     # Edges (darker frame)
-    for y in range(32):
-        px(img, 0, y, wood_dk)
-        px(img, 11, y, wood_dk)
-    for x in range(12):
-        px(img, x, 0, wood_dk)
-        px(img, x, 31, wood_dk)
-
-    img.save(os.path.join(SPRITES, "door.png"))
-    print("  door.png (12x32)")
+    c.outline_rect(0, 0, 11, 31, wood_dk)
+    return c
 
 # =============================================================================
 # BUTTON — 10x10 wall-mounted switch
 # =============================================================================
-def make_button():
-    img = Image.new("RGBA", (10, 10), (0, 0, 0, 0))
+def draw_button():
+    c = Canvas(10, 10)
 
     plate = (100, 100, 110, 255)     # metal plate
     plate_hi = (140, 140, 155, 255)
@@ -345,78 +372,50 @@ def make_button():
     frame = (60, 60, 70, 255)
 
     # Plate background
-    rect(img, 1, 1, 8, 8, plate)
-    outline_rect(img, 0, 0, 9, 9, frame)
+    c.rect(1, 1, 8, 8, plate)
+    c.outline_rect(0, 0, 9, 9, frame)
 
     # Highlight on plate
-    px(img, 2, 2, plate_hi)
-    px(img, 3, 2, plate_hi)
+    c.rect(2, 2, 3, 2, plate_hi)
 
     # Button (center circle-ish)
-    rect(img, 3, 3, 6, 6, btn_off)
-    px(img, 4, 4, btn_hi)
-    px(img, 5, 4, btn_hi)
-
-    img.save(os.path.join(SPRITES, "button.png"))
-    print("  button.png (10x10)")
+    c.rect(3, 3, 6, 6, btn_off)
+    c.rect(4, 4, 5, 4, btn_hi)
+    return c
 
 # =============================================================================
 # KEY — 10x16 golden key
 # =============================================================================
-def make_key():
-    img = Image.new("RGBA", (10, 16), (0, 0, 0, 0))
+def draw_key():
+    c = Canvas(10, 16)
 
     gold = (230, 190, 50, 255)
     gold_hi = (255, 220, 90, 255)
     gold_dk = (180, 140, 30, 255)
 
-    # Ring (top, rows 1-5)
-    rect(img, 3, 1, 6, 1, gold)
-    px(img, 2, 2, gold)
-    px(img, 7, 2, gold)
-    px(img, 2, 3, gold)
-    px(img, 7, 3, gold)
-    px(img, 2, 4, gold)
-    px(img, 7, 4, gold)
-    rect(img, 3, 5, 6, 5, gold)
-    # Ring interior
-    px(img, 4, 2, gold_hi)
-    px(img, 5, 2, gold_hi)
-    px(img, 4, 3, (0, 0, 0, 0))  # hollow
-    px(img, 5, 3, (0, 0, 0, 0))
-    px(img, 4, 4, (0, 0, 0, 0))
-    px(img, 5, 4, (0, 0, 0, 0))
-    # Ring highlight
-    px(img, 3, 2, gold_hi)
-    px(img, 3, 3, gold_hi)
-
-    # Shaft (rows 6-12)
-    for y in range(6, 13):
-        px(img, 4, y, gold)
-        px(img, 5, y, gold_dk)
-    px(img, 4, 6, gold_hi)
-
-    # Teeth (rows 10-12, right side)
-    px(img, 6, 10, gold)
-    px(img, 7, 10, gold_dk)
-    px(img, 6, 12, gold)
-    px(img, 7, 12, gold)
-    px(img, 8, 12, gold_dk)
-
-    # Bottom tooth
-    px(img, 4, 13, gold)
-    px(img, 5, 13, gold)
-    px(img, 6, 13, gold)
-    px(img, 7, 13, gold_dk)
-
-    img.save(os.path.join(SPRITES, "key.png"))
-    print("  key.png (10x16)")
+    # Ring (rows 1-5, hollow), shaft (rows 6-12), teeth and bottom tooth
+    c.blit(2, 1, [
+        " gggg ",
+        "gHHH g",
+        "gH   g",
+        "g    g",
+        " gggg ",
+        "  Hd",
+        "  gd",
+        "  gd",
+        "  gd",
+        "  gdgd",
+        "  gd",
+        "  gdggd",
+        "  gggd",
+    ], {"g": gold, "H": gold_hi, "d": gold_dk})
+    return c
 
 # =============================================================================
 # TELEPORTER — 16x16 blue swirling pad
 # =============================================================================
-def make_teleporter():
-    img = Image.new("RGBA", (16, 16), (0, 0, 0, 0))
+def draw_teleporter():
+    c = Canvas(16, 16)
 
     outer = (30, 60, 180, 200)
     mid = (60, 100, 220, 220)
@@ -424,66 +423,95 @@ def make_teleporter():
     core = (180, 220, 255, 255)
     spark = (220, 240, 255, 255)
 
-    # Outer ring
-    ring_pixels = [
-        (5,1),(6,1),(7,1),(8,1),(9,1),(10,1),
-        (3,2),(4,2),(11,2),(12,2),
-        (2,3),(13,3),
-        (2,4),(13,4),
-        (1,5),(14,5),
-        (1,6),(14,6),
-        (1,7),(14,7),
-        (1,8),(14,8),
-        (1,9),(14,9),
-        (1,10),(14,10),
-        (2,11),(13,11),
-        (2,12),(13,12),
-        (3,13),(4,13),(11,13),(12,13),
-        (5,14),(6,14),(7,14),(8,14),(9,14),(10,14),
-    ]
-    for x, y in ring_pixels:
-        px(img, x, y, outer)
-
-    # Mid ring fill
-    mid_pixels = [
-        (5,2),(6,2),(7,2),(8,2),(9,2),(10,2),
-        (3,3),(4,3),(5,3),(10,3),(11,3),(12,3),
-        (3,4),(4,4),(11,4),(12,4),
-        (2,5),(3,5),(12,5),(13,5),
-        (2,6),(3,6),(12,6),(13,6),
-        (2,7),(3,7),(12,7),(13,7),
-        (2,8),(3,8),(12,8),(13,8),
-        (2,9),(3,9),(12,9),(13,9),
-        (2,10),(3,10),(12,10),(13,10),
-        (3,11),(4,11),(11,11),(12,11),
-        (3,12),(4,12),(5,12),(10,12),(11,12),(12,12),
-        (5,13),(6,13),(7,13),(8,13),(9,13),(10,13),
-    ]
-    for x, y in mid_pixels:
-        px(img, x, y, mid)
+    # Outer ring and mid ring fill, left half; the pad is left-right symmetric
+    c.points([
+        (5,1),(6,1),(7,1),
+        (3,2),(4,2),
+        (2,3),(2,4),
+        (1,5),(1,6),(1,7),(1,8),(1,9),(1,10),
+        (2,11),(2,12),
+        (3,13),(4,13),
+        (5,14),(6,14),(7,14),
+    ], outer)
+    c.points([
+        (5,2),(6,2),(7,2),
+        (3,3),(4,3),(5,3),
+        (3,4),(4,4),
+        (2,5),(3,5),(2,6),(3,6),(2,7),(3,7),(2,8),(3,8),(2,9),(3,9),(2,10),(3,10),
+        (3,11),(4,11),
+        (3,12),(4,12),(5,12),
+        (5,13),(6,13),(7,13),
+    ], mid)
+    c.mirror()
 
     # Inner area
-    for y in range(4, 12):
-        for x in range(4, 12):
-            if img.getpixel((x, y))[3] == 0:
-                px(img, x, y, inner)
+    c.fill_empty(4, 4, 11, 11, inner)
 
     # Core glow
-    rect(img, 6, 6, 9, 9, core)
-    px(img, 7, 7, spark)
-    px(img, 8, 8, spark)
+    c.rect(6, 6, 9, 9, core)
+    c.points([(7, 7), (8, 8)], spark)
 
     # Swirl sparkles
-    px(img, 5, 5, spark)
-    px(img, 10, 6, spark)
-    px(img, 4, 8, spark)
-    px(img, 11, 10, spark)
-    px(img, 6, 11, spark)
+    c.points([(5, 5), (10, 6), (4, 8), (11, 10), (6, 11)], spark)
+    return c
+
+# =============================================================================
+# OUTPUT
+# =============================================================================
+SPRITE_DEFS = {
+    "fighter": draw_fighter,
+    "worm": draw_worm,
+    "thief": draw_thief,
+    "door": draw_door,
+    "button": draw_button,
+    "key": draw_key,
+    "teleporter": draw_teleporter,
+}
+
+
+def make_fighter():
+    draw_fighter().save("fighter.png")
+
+def make_worm():
+    draw_worm().save("worm.png")
+
+def make_thief():
+    draw_thief().save("thief.png")
+
+def make_door():
+    draw_door().save("door.png")
+
+def make_button():
+    draw_button().save("button.png")
+
+def make_key():
+    draw_key().save("key.png")
+
+def make_teleporter():
+    draw_teleporter().save("teleporter.png")
+
+
+def make_variants(count, out_dir):
+    """Write ``count`` hue-shifted copies of every sprite; returns the number of files."""
+    os.makedirs(out_dir, exist_ok=True)
+    # Keep the editor from importing (and res:// from shipping) the variants
+    open(os.path.join(out_dir, ".gdignore"), "w").close()
+    written = 0
+    for name, draw in SPRITE_DEFS.items():
+        canvas = draw()
+        frames = canvas.rgba(hue_variants(canvas.colors, count))   # (count, h, w, 4)
+        for i, pixels in enumerate(frames):
+            Image.fromarray(pixels, "RGBA").save(os.path.join(out_dir, f"{name}_{i:03d}.png"))
+            written += 1
+    return written
 
-    img.save(os.path.join(SPRITES, "teleporter.png"))
-    print("  teleporter.png (16x16)")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate tutorial level sprites")
+    parser.add_argument("--variants", type=int, default=0, help="Also write N recoloured variants per sprite")
+    parser.add_argument("--variants-out", default=os.path.join(SPRITES, "variants"))
+    args = parser.parse_args()
+
     print("Generating tutorial sprites...")
     make_fighter()
     make_worm()
@@ -492,4 +520,7 @@ if __name__ == "__main__":
     make_button()
     make_key()
     make_teleporter()
+    if args.variants > 0:
+        n = make_variants(args.variants, args.variants_out)
+        print(f"  {n} variant(s) written to {args.variants_out}")
     print("Done! Sprites saved to:", SPRITES)
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+atlas_pack.py -- Pack small sprites into power-of-two texture atlases
+
+Each atlas group (ATLAS_GROUPS below, or --group NAME=GLOB ...) is packed
+with MaxRects (best short side fit) into the smallest power-of-two page that
+holds it, up to --max-size; what does not fit spills onto further pages.
+Every sprite is surrounded by --extrude pixels copied from its own edge (so
+filtering / subpixel camera moves never sample a neighbour) and --padding
+transparent pixels.
+
+Strips are packed frame by frame, each frame a sprite with its own
+extrusion and padding: strips named ``<name>_<frames>.png`` are cut into
+equal cells, split_sprites.py strips into the cells of the ``*_frames.json``
+beside them.  For every input the tool writes an AtlasTexture .tres pointing
+at its region of the atlas -- for a strip, one per frame
+(Owlet_Monster_Idle_4.png -> Owlet_Monster_Idle_4_0.tres .. _3.tres).  The
+manifest maps each source res:// path to its atlas page and offset: a region
+``Rect2(x, y, w, h)`` of the old texture becomes
+``Rect2(x + rect[0], y + rect[1], w, h)`` of ``atlas``; for a strip, each of
+its ``frames`` has its own ``atlas`` and ``rect``, and ``cell`` is the
+frame's rectangle in the strip.
+
+Packing only depends on the input pixels and options (inputs are ordered by
+size, then path), and files are only rewritten when their bytes change, so
+repacking unchanged inputs leaves the output byte-identical.  Files listed
+in the previous manifest that are no longer produced are removed.
+
+Usage:
+  python tools/atlas_pack.py
+      Pack the default groups into assets/sprites/atlas/.
+
+  python tools/atlas_pack.py --group enemies="levels/*/sprites/*.png" --out assets/sprites/enemy_atlas
+      Pack a custom group elsewhere (the output must be inside the project).
+
+  python tools/atlas_pack.py --check
+      Exit 1 if any output would change (nothing is written).
+"""
+
+import argparse
+import io
+import json
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+import atomic_write
+from tres_parser import quote
+
+TOOLS_DIR   = Path(__file__).parent
+GODOT_DIR   = TOOLS_DIR.parent
+DEFAULT_OUT = GODOT_DIR / "assets" / "sprites" / "atlas"
+MANIFEST    = "atlas_manifest.json"
+
+# group -> globs relative to the Godot project
+ATLAS_GROUPS = {
+    "player": [
+        "player/sprites/Owlet_Monster*.png",
+        "items/sprites/rocket_flame_4.png",
+        "assets/sprites/player/player_*.png",     # split_sprites.py output, when present
+    ],
+    "tutorial": [
+        "levels/level_tutorial/sprites/fighter.png",
+        "levels/level_tutorial/sprites/worm.png",
+        "levels/level_tutorial/sprites/thief.png",
+        "levels/level_tutorial/sprites/door.png",
+        "levels/level_tutorial/sprites/teleporter.png",
+    ],
+}
+
+_FRAMES_RE = re.compile(r"_(\d+)$")
+
+# ---------------------------------------------------------------------------
+# MaxRects
+# ---------------------------------------------------------------------------
+
+def _split_free(free: list, used: tuple) -> list:
+    """Cut ``used`` out of every free rectangle, then drop contained ones."""
+    ux, uy, uw, uh = used
+    out = []
+    for fx, fy, fw, fh in free:
+        if ux >= fx + fw or ux + uw <= fx or uy >= fy + fh or uy + uh <= fy:
+            out.append((fx, fy, fw, fh))
+            continue
+        if ux > fx:
+            out.append((fx, fy, ux - fx, fh))
+        if ux + uw < fx + fw:
+            out.append((ux + uw, fy, fx + fw - ux - uw, fh))
+        if uy > fy:
+            out.append((fx, fy, fw, uy - fy))
+        if uy + uh < fy + fh:
+            out.append((fx, uy + uh, fw, fy + fh - uy - uh))
+    pruned = []
+    for i, a in enumerate(out):
+        contained = False
+        for j, b in enumerate(out):
+            if i != j and b[0] <= a[0] and b[1] <= a[1] and a[0] + a[2] <= b[0] + b[2] \
+                    and a[1] + a[3] <= b[1] + b[3] and (a != b or j < i):
+                contained = True
+                break
+        if not contained:
+            pruned.append(a)
+    return pruned
+
+
+def maxrects(sizes: list, width: int, height: int) -> list:
+    """Place (w, h) boxes in order; returns [(x, y) or None] (None = did not fit)."""
+    free = [(0, 0, width, height)]
+    placed = []
+    for w, h in sizes:
+        best = None
+        for fx, fy, fw, fh in free:
+            if w <= fw and h <= fh:
+                key = (min(fw - w, fh - h), max(fw - w, fh - h), fy, fx)
+                if best is None or key < best:
+                    best = key
+        if best is None:
+            placed.append(None)
+            continue
+        x, y = best[3], best[2]
+        placed.append((x, y))
+        free = _split_free(free, (x, y, w, h))
+    return placed
+
+
+def _page_sizes(max_size: int) -> list:
+    sides = []
+    s = 1
+    while s <= max_size:
+        sides.append(s)
+        s *= 2
+    return sorted(((w, h) for w in sides for h in sides), key=lambda wh: (wh[0] * wh[1], max(wh), -wh[0]))
+
+
+def pack_pages(sizes: list, max_size: int, padding: int) -> list:
+    """Split boxes over pages; returns [((w, h), {index: (x, y)})].
+
+    Boxes include their padding, which may overhang the right / bottom edge
+    of the page (it is transparent anyway).
+    """
+    too_big = [i for i, (w, h) in enumerate(sizes) if w - padding > max_size or h - padding > max_size]
+    if too_big:
+        raise ValueError(f"{len(too_big)} sprite(s) larger than --max-size {max_size}")
+    remaining = list(range(len(sizes)))
+    pages = []
+    while remaining:
+        boxes = [sizes[i] for i in remaining]
+        area = sum(w * h for w, h in boxes)
+        for pw, ph in _page_sizes(max_size):
+            if (pw + padding) * (ph + padding) < area:
+                continue
+            placed = maxrects(boxes, pw + padding, ph + padding)
+            if all(p is not None for p in placed):
+                pages.append(((pw, ph), dict(zip(remaining, placed))))
+                remaining = []
+                break
+        else:
+            placed = maxrects(boxes, max_size + padding, max_size + padding)
+            pages.append(((max_size, max_size), {i: p for i, p in zip(remaining, placed) if p is not None}))
+            remaining = [i for i, p in zip(remaining, placed) if p is None]
+    return pages
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+def _res(path: Path) -> str:
+    return "res://" + path.resolve().relative_to(GODOT_DIR.resolve()).as_posix()
+
+
+def atlas_texture_tres(atlas_res: str, rect: tuple, margin: tuple = None) -> str:
+    """AtlasTexture resource text; ``margin`` (x, y, w, h) pads a trimmed region
+    back out to its original frame size."""
+    x, y, w, h = rect
+    extra = ""
+    if margin is not None and any(margin):
+        extra = "margin = Rect2(%d, %d, %d, %d)\n" % tuple(margin)
+    return (
+        '[gd_resource type="AtlasTexture" load_steps=2 format=3]\n\n'
+        f'[ext_resource type="Texture2D" path={quote(atlas_res)} id="1_atlas"]\n\n'
+        "[resource]\n"
+        'atlas = ExtResource("1_atlas")\n'
+        f"region = Rect2({x}, {y}, {w}, {h})\n"
+        f"{extra}"
+        "filter_clip = true\n"
+    )
+
+
+def _png_bytes(pixels: np.ndarray) -> bytes:
+    buf = io.BytesIO()
+    Image.fromarray(pixels, "RGBA").save(buf, "PNG", optimize=False)
+    return buf.getvalue()
+
+
+class _Outputs:
+    """Collects output files; writes only those whose bytes changed."""
+
+    def __init__(self, check: bool):
+        self.check = check
+        self.files = {}
+
+    def add(self, path: Path, data: bytes):
+        self.files[path] = data
+
+    def commit(self, stale: list) -> list:
+        """Write changed files and delete ``stale`` ones; returns changed paths."""
+        changed = []
+        for path, data in sorted(self.files.items()):
+            try:
+                if path.read_bytes() == data:
+                    continue
+            except OSError:
+                pass
+            changed.append(path)
+            if not self.check:
+                atomic_write.write_bytes(path, data)
+        for path in stale:
+            if path in self.files or not path.exists():
+                continue
+            changed.append(path)
+            if not self.check:
+                path.unlink()
+        return changed
+
+# ---------------------------------------------------------------------------
+# Packing
+# ---------------------------------------------------------------------------
+
+def _inputs(globs: list) -> list:
+    seen = {}
+    for pattern in globs:
+        for path in sorted(GODOT_DIR.glob(pattern)):
+            if path.suffix.lower() == ".png":
+                seen[path.resolve()] = None
+    return list(seen)
+
+
+def _texture_names(paths: list) -> dict:
+    """path -> .tres stem; the parent directory is prefixed on a clash."""
+    stems = {}
+    for p in paths:
+        stems.setdefault(p.stem, []).append(p)
+    return {p: (p.stem if len(group) == 1 else f"{p.parent.name}_{p.stem}")
+            for group in stems.values() for p in group}
+
+
+def _split_metadata(path: Path) -> list:
+    """Frame cells for a split_sprites.py strip, from a *_frames.json beside it."""
+    for meta_path in sorted(path.parent.glob("*_frames.json")):
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        for row in meta.get("rows", []):
+            if row.get("file") == path.name:
+                return [tuple(f["cell"]) for f in row["frames"]]
+    return []
+
+
+def frame_cells(path: Path, width: int, height: int) -> list:
+    """[(x, y, w, h)] frame cells of an image: those in a split_sprites.py
+    *_frames.json beside it, else ``<name>_<frames>.png`` equal cells, else
+    the whole image."""
+    cells = _split_metadata(path)
+    if cells:
+        return cells
+    m = _FRAMES_RE.search(path.stem)
+    count = int(m.group(1)) if m else 1
+    if count < 1 or width % count:
+        print(f"  WARN: {path.name}: width {width} is not {count} equal frames; using one frame",
+              file=sys.stderr)
+        count = 1
+    fw = width // count
+    return [(i * fw, 0, fw, height) for i in range(count)]
+
+
+def pack_group(group: str, paths: list, out_dir: Path, outputs: _Outputs,
+               padding: int, extrude: int, max_size: int) -> dict:
+    """Pack one group; returns its manifest part {"atlases": ..., "sprites": ...}.
+
+    Every frame of a strip is packed as a sprite of its own, with its own
+    extrusion and padding, so a frame never samples its neighbour.
+    """
+    images = {p: np.asarray(Image.open(p).convert("RGBA")) for p in paths}
+    cells = {p: frame_cells(p, images[p].shape[1], images[p].shape[0]) for p in paths}
+    boxes = [(p, f) for p in paths for f in range(len(cells[p]))]
+    border = extrude * 2 + padding
+    order = sorted(boxes, key=lambda b: (-max(cells[b[0]][b[1]][2:]),
+                                         -cells[b[0]][b[1]][2] * cells[b[0]][b[1]][3], _res(b[0]), b[1]))
+    sizes = [(cells[p][f][2] + border, cells[p][f][3] + border) for p, f in order]
+    names = _texture_names(sorted(paths, key=_res))
+    tex_dir = out_dir / group
+
+    atlases, regions = {}, {}
+    for page_no, ((pw, ph), placed) in enumerate(pack_pages(sizes, max_size, padding)):
+        page_name = f"{group}_{page_no}"
+        page_path = out_dir / f"{page_name}.png"
+        page_res = _res(page_path)
+        canvas = np.zeros((ph, pw, 4), dtype=np.uint8)
+        used = 0
+        for i, (x, y) in sorted(placed.items()):
+            src, f = order[i]
+            cx, cy, w, h = cells[src][f]
+            pixels = images[src][cy:cy + h, cx:cx + w]
+            if extrude:
+                pixels = np.pad(pixels, ((extrude, extrude), (extrude, extrude), (0, 0)), mode="edge")
+            canvas[y:y + pixels.shape[0], x:x + pixels.shape[1]] = pixels
+            regions[src, f] = (page_res, (x + extrude, y + extrude, w, h))
+            used += w * h
+        outputs.add(page_path, _png_bytes(canvas))
+        atlases[page_name] = {"file": page_res, "size": [pw, ph], "sprites": len(placed),
+                              "fill": round(used / (pw * ph), 3)}
+
+    sprites = {}
+    for src in sorted(paths, key=_res):
+        if len(cells[src]) == 1:
+            page_res, rect = regions[src, 0]
+            tex_path = tex_dir / f"{names[src]}.tres"
+            outputs.add(tex_path, atlas_texture_tres(page_res, rect).encode("utf-8"))
+            sprites[_res(src)] = {"atlas": page_res, "rect": list(rect), "texture": _res(tex_path)}
+            continue
+        frames = []
+        for f, cell in enumerate(cells[src]):
+            page_res, rect = regions[src, f]
+            frame_path = tex_dir / f"{names[src]}_{f}.tres"
+            outputs.add(frame_path, atlas_texture_tres(page_res, rect).encode("utf-8"))
+            frames.append({"atlas": page_res, "rect": list(rect), "cell": list(cell),
+                           "texture": _res(frame_path)})
+        sprites[_res(src)] = {"frames": frames}
+    return {"atlases": atlases, "sprites": sprites}
+
+
+def pack(groups: dict, out_dir: Path, padding: int = 1, extrude: int = 1, max_size: int = 1024,
+         check: bool = False) -> tuple:
+    """Pack every group into ``out_dir``; returns (manifest, changed paths)."""
+    out_dir = out_dir.resolve()
+    outputs = _Outputs(check)
+    manifest = {"padding": padding, "extrude": extrude, "max_size": max_size, "atlases": {}, "sprites": {}}
+    for group, globs in groups.items():
+        paths = _inputs(globs)
+        if not paths:
+            print(f"  WARN: group {group!r} matched no PNGs", file=sys.stderr)
+            continue
+        part = pack_group(group, paths, out_dir, outputs, padding, extrude, max_size)
+        manifest["atlases"].update(part["atlases"])
+        manifest["sprites"].update(part["sprites"])
+
+    manifest_path = out_dir / MANIFEST
+    stale = []
+    try:
+        previous = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        previous = {}
+    for entry in previous.get("atlases", {}).values():
+        stale.append(GODOT_DIR / entry["file"][len("res://"):])
+    for entry in previous.get("sprites", {}).values():
+        frames = [f["texture"] if isinstance(f, dict) else f for f in entry.get("frames", [])]
+        for res in [entry.get("texture", "")] + frames:
+            if res:
+                stale.append(GODOT_DIR / res[len("res://"):])
+    outputs.add(manifest_path, (json.dumps(manifest, indent=2, sort_keys=True) + "\n").encode("utf-8"))
+    return manifest, outputs.commit([p.resolve() for p in stale])
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pack sprites into power-of-two atlases with AtlasTexture resources",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--group",    action="append", default=[], metavar="NAME=GLOB",
+                        help="Atlas group and an input glob (repeatable; replaces the default groups)")
+    parser.add_argument("--out",      type=Path, default=DEFAULT_OUT, help="Output directory (inside the project)")
+    parser.add_argument("--padding",  type=int, default=1, help="Transparent pixels between sprites")
+    parser.add_argument("--extrude",  type=int, default=1, help="Edge pixels repeated around each sprite")
+    parser.add_argument("--max-size", type=int, default=1024, help="Largest page side (power of two)")
+    parser.add_argument("--check",    action="store_true", help="Only report whether anything would change")
+    args = parser.parse_args()
+
+    if args.max_size & (args.max_size - 1):
+        parser.error("--max-size must be a power of two")
+    out_dir = (GODOT_DIR / args.out) if not args.out.is_absolute() else args.out
+    if not out_dir.resolve().is_relative_to(GODOT_DIR.resolve()):
+        parser.error("--out must be inside the Godot project (textures are referenced by res:// path)")
+    groups = ATLAS_GROUPS
+    if args.group:
+        groups = {}
+        for spec in args.group:
+            name, sep, pattern = spec.partition("=")
+            if not sep or not name or not pattern:
+                parser.error(f"--group expects NAME=GLOB, got {spec!r}")
+            groups.setdefault(name, []).append(pattern)
+
+    try:
+        manifest, changed = pack(groups, out_dir, args.padding, args.extrude, args.max_size, args.check)
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    for name, atlas in manifest["atlases"].items():
+        w, h = atlas["size"]
+        print(f"  {name:<12} {w}x{h}  {atlas['sprites']:>3} sprite(s)  {atlas['fill']:.0%} used")
+    verb = "would change" if args.check else "written"
+    for path in changed:
+        print(f"  {verb}: {path}")
+    if not changed:
+        print("  Up to date.")
+    if args.check and changed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
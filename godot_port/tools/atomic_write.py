@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+atomic_write.py -- Replace output files atomically, keeping their permissions
+
+Every generator in this directory writes through a temp file in the target's
+directory and ``os.replace``s it over the target, so a crash or Ctrl-C never
+leaves a half-written file behind.  ``tempfile.mkstemp`` creates that temp
+file with mode 0600, and ``os.replace`` would carry it over to the target;
+here the temp file first gets the target's current mode, or
+``0o666 & ~umask`` for a new file -- what a plain ``open(path, "w")`` gives.
+
+  AtomicWriter(path, "w", encoding="utf-8")
+                   context manager; write to it, call discard() to keep the
+                   old file after all
+  write_bytes(path, data)
+                   replace ``path`` with ``data``
+  write_if_changed(path, data)
+                   same, unless ``path`` already holds exactly ``data``
+"""
+
+import os
+import stat
+import tempfile
+from pathlib import Path
+
+
+def _umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def target_mode(path: Path) -> int:
+    """Permission bits a replacement for ``path`` should get."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        return 0o666 & ~_umask()
+
+
+class AtomicWriter:
+    """Write ``path`` through a temp file that replaces it on a clean exit.
+
+    On an exception, or after ``discard()``, the temp file is deleted and
+    ``path`` is left untouched.  ``name`` is the temp file's path, for
+    writers that want a file name rather than a file object.
+    """
+
+    def __init__(self, path: Path, mode: str = "wb", encoding: str = None):
+        self.path = Path(path)
+        self.mode = mode
+        self.encoding = encoding
+        self.file = None
+        self.name = None
+        self._discarded = False
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self.name = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            os.chmod(self.name, target_mode(self.path))
+            self.file = open(fd, self.mode, encoding=self.encoding)
+        except BaseException:
+            os.close(fd)
+            os.unlink(self.name)
+            raise
+        return self
+
+    def write(self, data):
+        return self.file.write(data)
+
+    def discard(self):
+        self._discarded = True
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.file.close()
+            if exc_type is None and not self._discarded:
+                os.replace(self.name, self.path)
+                return False
+        except BaseException:
+            self._unlink()
+            raise
+        self._unlink()
+        return False
+
+    def _unlink(self):
+        try:
+            os.unlink(self.name)
+        except OSError:
+            pass
+
+
+def write_bytes(path: Path, data: bytes):
+    with AtomicWriter(path) as f:
+        f.write(data)
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """Atomically replace ``path`` with ``data`` unless it already holds it."""
+    try:
+        if Path(path).read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    write_bytes(path, data)
+    return True
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+gdscript_consts.py -- Read top-level ``const`` literals out of GDScript files
+
+Evaluates the right-hand side of ``const NAME := ...`` / ``const NAME: T = ...``
+when it is a literal expression: dictionaries (``"k": v`` and ``k = v``
+forms), arrays, strings (single, double, triple-quoted, ``&""`` / ``^""``),
+ints (incl. hex / binary / ``1_000``), floats, bools, null, unary minus,
+``Vector2/Vector2i/Vector3/Color(...)``, ``preload("...")``, other
+constructor calls and references to earlier consts in the same file.
+Consts whose value is anything else (arithmetic, function calls on
+objects, enum members) are skipped, not guessed.
+
+Results are memoized by the file's SHA-1, so repeated calls on an unchanged
+file (dashboard rebuilds under --serve) cost one read + hash.
+
+Vector2 / Color / ... are NamedTuples and preload() paths are ``str``
+subclasses, so ``json.dumps`` turns them into ``[x, y]`` / ``"res://..."``.
+
+Usage:
+  python tools/gdscript_consts.py data/LevelDefs.gd data/ItemDefs.gd
+      Print every parsed const as JSON.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+from tres_parser import Constructor
+
+# ---------------------------------------------------------------------------
+# Values
+# ---------------------------------------------------------------------------
+
+class Vector2(NamedTuple):
+    x: float
+    y: float
+
+
+class Vector2i(NamedTuple):
+    x: int
+    y: int
+
+
+class Vector3(NamedTuple):
+    x: float
+    y: float
+    z: float
+
+
+class Color(NamedTuple):
+    r: float
+    g: float
+    b: float
+    a: float = 1.0
+
+
+class Preload(str):
+    """The path of a ``preload("res://...")``."""
+
+
+_CONSTRUCTORS = {"Vector2": Vector2, "Vector2i": Vector2i, "Vector3": Vector3, "Color": Color}
+
+_KEYWORDS = {"true": True, "false": False, "null": None,
+             "PI": 3.141592653589793, "TAU": 6.283185307179586,
+             "INF": float("inf"), "NAN": float("nan")}
+
+
+class GDScriptParseError(ValueError):
+    def __init__(self, msg: str, lineno: int, colno: int):
+        super().__init__(f"{msg} (line {lineno}, column {colno})")
+        self.msg = msg
+        self.lineno = lineno
+        self.colno = colno
+
+# ---------------------------------------------------------------------------
+# Tokenizer
+# ---------------------------------------------------------------------------
+
+_TOKEN_RE = re.compile(r'''
+    (?P<skip>[ \t\r\n]+|\#[^\n]*|\\\n)
+  | (?P<string>[&^r]?(?:"""(?:[^\\]|\\.)*?"""|\'\'\'(?:[^\\]|\\.)*?\'\'\'
+                      |"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*'))
+  | (?P<number>0x[0-9a-fA-F_]+|0b[01_]+|(?:\d[\d_]*\.?[\d_]*|\.\d[\d_]*)(?:[eE][-+]?\d+)?)
+  | (?P<ident>[A-Za-z_]\w*)
+  | (?P<punct>:=|[\[\]{}(),:=.+\-;])
+''', re.VERBOSE | re.DOTALL)
+
+_CONST_RE = re.compile(r'^const[ \t]+(\w+)[ \t]*(?::[ \t]*[^=\n]*?)?[ \t]*:?=', re.MULTILINE)
+
+_ESCAPE_RE = re.compile(r'\\(u[0-9a-fA-F]{4}|U[0-9a-fA-F]{6}|.)', re.DOTALL)
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "a": "\a", "v": "\v"}
+
+
+def _string_value(tok: str) -> str:
+    if tok[0] in "&^":
+        tok = tok[1:]
+    raw = tok[0] == "r"
+    if raw:
+        tok = tok[1:]
+    q = 3 if tok[:3] in ('"""', "'''") else 1
+    body = tok[q:-q]
+    if raw or "\\" not in body:
+        return body
+
+    def sub(m: re.Match) -> str:
+        e = m.group(1)
+        if e[0] in "uU" and len(e) > 1:
+            return chr(int(e[1:], 16))
+        return "" if e == "\n" else _ESCAPES.get(e, e)
+    return _ESCAPE_RE.sub(sub, body)
+
+
+def _number_value(tok: str):
+    tok = tok.replace("_", "")
+    if tok[:2] in ("0x", "0b"):
+        return int(tok, 0)
+    return float(tok) if any(c in tok for c in ".eE") else int(tok)
+
+# ---------------------------------------------------------------------------
+# Expression parser
+# ---------------------------------------------------------------------------
+
+class _Expr:
+    """Parses one literal expression starting at ``pos`` in ``text``."""
+
+    def __init__(self, text: str, pos: int, consts: dict):
+        self.text = text
+        self.pos = pos
+        self.consts = consts
+        self.last_end = pos
+        self.tok = self._next()
+
+    def _next(self) -> tuple:
+        while self.pos < len(self.text):
+            m = _TOKEN_RE.match(self.text, self.pos)
+            if m is None:
+                self.error(f"unexpected character {self.text[self.pos]!r}", self.pos)
+            start, self.pos = self.pos, m.end()
+            kind = m.lastgroup
+            if kind != "skip":
+                return kind, m.group(kind), start, self.pos
+        return "eof", None, self.pos, self.pos
+
+    def error(self, msg: str, pos: int = None):
+        pos = self.tok[2] if pos is None else pos
+        line = self.text.count("\n", 0, pos) + 1
+        col = pos - (self.text.rfind("\n", 0, pos) + 1) + 1
+        raise GDScriptParseError(msg, line, col)
+
+    def advance(self) -> tuple:
+        tok = self.tok
+        self.last_end = tok[3]
+        self.tok = self._next()
+        return tok
+
+    def at(self, punct: str) -> bool:
+        return self.tok[0] == "punct" and self.tok[1] == punct
+
+    def expect(self, punct: str):
+        if not self.at(punct):
+            self.error(f"expected {punct!r}, got {self.tok[1]!r}")
+        self.advance()
+
+    def _items(self, close: str, item) -> list:
+        out = []
+        while not self.at(close):
+            out.append(item())
+            if not self.at(close):
+                self.expect(",")
+        self.advance()
+        return out
+
+    def value(self):
+        kind, tok = self.tok[:2]
+        if kind == "string":
+            self.advance()
+            return _string_value(tok)
+        if kind == "number":
+            self.advance()
+            return _number_value(tok)
+        if kind == "punct" and tok in "-+":
+            self.advance()
+            v = self.value()
+            if isinstance(v, bool) or not isinstance(v, (int, float)):
+                self.error(f"unary {tok!r} on a non-number")
+            return -v if tok == "-" else v
+        if kind == "punct" and tok == "[":
+            self.advance()
+            return self._items("]", self.value)
+        if kind == "punct" and tok == "{":
+            self.advance()
+            return dict(self._items("}", self._pair))
+        if kind == "ident":
+            self.advance()
+            if self.at("("):
+                self.advance()
+                args = self._items(")", self.value)
+                return self._call(tok, args)
+            if tok in _KEYWORDS:
+                return _KEYWORDS[tok]
+            if tok in self.consts:
+                return self.consts[tok]
+            self.error(f"not a literal: {tok!r}")
+        self.error(f"unexpected {tok!r}")
+
+    def _call(self, name: str, args: list):
+        if name in ("preload", "load") and len(args) == 1 and isinstance(args[0], str):
+            return Preload(args[0])
+        cls = _CONSTRUCTORS.get(name)
+        if cls is not None:
+            try:
+                return cls(*args)
+            except TypeError:
+                self.error(f"bad arguments for {name}()")
+        return Constructor(name, tuple(args))
+
+    def _pair(self) -> tuple:
+        if self.tok[0] == "ident":
+            # Lua-style {key = value}: the key is a string
+            saved = self.pos, self.tok, self.last_end
+            key = self.advance()[1]
+            if self.at("="):
+                self.advance()
+                return key, self.value()
+            self.pos, self.tok, self.last_end = saved
+        k = self.value()
+        self.expect(":")
+        return k, self.value()
+
+    def parse(self):
+        """The value, which must be followed by a newline, ';' or end of file."""
+        v = self.value()
+        if not (self.tok[0] == "eof" or self.at(";") or "\n" in self.text[self.last_end:self.tok[2]]):
+            self.error(f"unexpected {self.tok[1]!r} after value")
+        return v
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def parse_consts(text: str, errors: list = None) -> dict:
+    """NAME -> value for every top-level const with a literal value.
+
+    Non-literal consts are skipped; if ``errors`` is given, one
+    ``(name, GDScriptParseError)`` per skipped const is appended to it.
+    """
+    consts = {}
+    for m in _CONST_RE.finditer(text):
+        try:
+            consts[m.group(1)] = _Expr(text, m.end(), consts).parse()
+        except GDScriptParseError as e:
+            if errors is not None:
+                errors.append((m.group(1), e))
+    return consts
+
+
+_MEMO: dict[str, dict] = {}
+
+
+def load_consts(path: Path) -> dict:
+    """``parse_consts`` for a file, memoized by content hash.
+
+    Callers get the memoized dict itself; treat it as read-only.
+    """
+    raw = Path(path).read_bytes()
+    digest = hashlib.sha1(raw).hexdigest()
+    consts = _MEMO.get(digest)
+    if consts is None:
+        consts = _MEMO[digest] = parse_consts(raw.decode("utf-8"))
+    return consts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the literal consts of GDScript files as JSON")
+    parser.add_argument("files", type=Path, nargs="+")
+    args = parser.parse_args()
+
+    out = {}
+    for path in args.files:
+        errors = []
+        out[str(path)] = parse_consts(path.read_text(encoding="utf-8"), errors)
+        for name, e in errors:
+            print(f"  skipped {path.name}: const {name}: {e}", file=sys.stderr)
+    print(json.dumps(out, indent=2, ensure_ascii=False, default=list))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+gen_quest_corpus.py -- Seeded synthetic quest corpus for scaling tests
+
+Writes a directory laid out like godot_port/ (data/quests/*.json plus
+levels/<level>/dialogs/<npc>/<moment>.tres) whose quests follow the same
+shapes as the real ones: giver NPCs with a dialog_selection chain, an
+accept/decline choice_panel, parallel_group target NPCs, an appears_when
+boss, rewards and cross-quest prerequisites.  Same seed -> same bytes.
+
+Usage:
+  python tools/gen_quest_corpus.py --out /tmp/corpus --quests 1000
+  python tools/gen_quest_corpus.py --out /tmp/corpus --quests 200 --npcs 6 \\
+      --parallel-groups 2 --choice-depth 3 --prereq-depth 8 --seed 7
+
+The output directory is wiped first -- but only if it is empty or was
+written by this script (it holds a .quest_corpus marker); anything else
+needs --force.  Point quest_tool at it with quest_bench.py, or by
+overriding quest_tool.GODOT_DIR / QUESTS_DIR.
+"""
+
+import argparse
+import json
+import random
+import shutil
+import sys
+from pathlib import Path
+
+LEVELS = ["level_town", "level_jungle", "level_mystical", "level_1", "level_arena",
+          "level_tutorial", "level_2", "level_desert", "level_snow", "level_castle"]
+ITEMS  = ["vibrator", "buttplug", "dildo", "rocket_boots", "golden_key", "mystic_orb",
+          "lucky_coin", "old_map", "jade_idol", "karim_badge"]
+WORDS  = ("maat neef karim kanker pc schuld oerwoud hydra toren sleutel munt goud "
+          "raket laarzen draak grot dorp kerk winkel lichaam drie koppen geheim "
+          "belonen snel terug helpen betalen vinden brengen zoeken").split()
+
+MARKER_FILE = ".quest_corpus"   # marks a directory write_corpus() may wipe
+
+SEQ_HEADER = (
+    '[gd_resource type="Resource" script_class="DialogSequence" format=3]\n\n'
+    '[ext_resource type="Script" uid="uid://kw02drnbl1h" path="res://data/DialogSequence.gd" id="1_seq"]\n'
+    '[ext_resource type="Script" uid="uid://bu846m0x63vmq" path="res://data/DialogLine.gd" id="2_line"]\n'
+)
+
+# ---------------------------------------------------------------------------
+# Text helpers
+# ---------------------------------------------------------------------------
+
+def _sentence(rng: random.Random, lo: int = 4, hi: int = 18) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(lo, hi))]
+    return words[0].capitalize() + " " + " ".join(words[1:]) + rng.choice([".", "...", "!", "?"])
+
+
+def _character_name(npc_id: str) -> str:
+    return npc_id.replace("_", " ").title()
+
+# ---------------------------------------------------------------------------
+# Quest generation
+# ---------------------------------------------------------------------------
+
+class CorpusSpec:
+    """Scale knobs for one generated corpus."""
+
+    def __init__(self, quests: int = 100, npcs: int = 4, parallel_groups: int = 1,
+                 choice_depth: int = 1, prereq_depth: int = 4, event_ratio: float = 0.2,
+                 lines_per_dialog: int = 4, seed: int = 1):
+        self.quests = quests
+        self.npcs = max(1, npcs)
+        self.parallel_groups = max(0, parallel_groups)
+        self.choice_depth = max(0, choice_depth)
+        self.prereq_depth = max(1, prereq_depth)
+        self.event_ratio = event_ratio
+        self.lines_per_dialog = max(1, lines_per_dialog)
+        self.seed = seed
+
+
+def _choice_panel(rng: random.Random, dlg, depth: int, accept_actions: list) -> dict:
+    """Accept/decline panel; nested ``depth`` times inside the accept branch."""
+    on_accept = list(accept_actions)
+    if depth > 1:
+        on_accept = [_choice_panel(rng, dlg, depth - 1, accept_actions)]
+    return {
+        "action": "choice_panel",
+        "prompt": _sentence(rng, 3, 7),
+        "choices": ["Ja, ik doe het", "Nee, geen tijd"],
+        "delay": 0.5,
+        "on_accept": on_accept + [{"action": "play_dialog", "dialog": dlg("accept")}],
+        "on_decline": [{"action": "play_dialog", "dialog": dlg("decline")}],
+    }
+
+
+def _make_event(rng: random.Random, qid: str, level: str) -> dict:
+    npc_id = qid.replace("event_", "e") + "_npc"
+    dialog = f"{level}/{npc_id}/moment"
+    key = f"{npc_id}_seen"
+    return {
+        "id": qid,
+        "type": "event",
+        "name": _sentence(rng, 2, 4).rstrip(".!?"),
+        "description": _sentence(rng),
+        "level": level,
+        "prerequisites": [],
+        "npcs": {
+            npc_id: {
+                "voice_pitch": round(rng.uniform(0.2, 1.4), 2),
+                "role": "event",
+                "dialog_selection": [{"dialog": dialog}],
+                "on_dialog_end": {dialog: [
+                    {"action": "set_key", "key": key},
+                    {"action": "fade_and_remove", "duration": 1.5, "slide_x": 200},
+                ]},
+            }
+        },
+        "state_keys": [{"key": key, "set_by": f"{npc_id} -- after {dialog}",
+                        "read_by": [f"{npc_id}._ready"], "meaning": _sentence(rng)}],
+    }
+
+
+def _make_quest(rng: random.Random, spec: CorpusSpec, qid: str, level: str, prereqs: list) -> dict:
+    base = qid.replace("quest_", "q")
+    giver = base + "_giver"
+    active, complete, returned = f"{qid}_active", f"{qid}_complete", f"{qid}_returned"
+    secondary = rng.sample([lv for lv in LEVELS if lv != level], k=rng.randint(0, 2))
+    target_level = secondary[0] if secondary else level
+
+    def dlg(moment: str, npc: str = giver, lvl: str = level) -> str:
+        return f"{lvl}/{npc}/{moment}"
+
+    state_keys = [{"key": active, "set_by": f"{giver} -- accept choice",
+                   "read_by": [giver], "meaning": _sentence(rng)}]
+    npcs = {}
+    gate_keys = []
+
+    # Targets: parallel groups first, then solo targets for the remaining NPC budget
+    budget = spec.npcs - 1
+    for g in range(spec.parallel_groups):
+        if budget < 2:
+            break
+        size = min(budget - (1 if budget > 2 else 0), rng.randint(2, 4))
+        group_name = f"{qid}_group_{g}"
+        members = []
+        for m in range(size):
+            npc_id = f"{base}_g{g}_{m}"
+            key = f"{npc_id}_done"
+            d = dlg("dialog", npc_id, target_level)
+            npcs[npc_id] = {
+                "voice_pitch": round(rng.uniform(0.2, 1.4), 2),
+                "role": "target",
+                "appears_when": {"all_true": [active]},
+                "dialog_selection": [{"dialog": d}],
+                "on_dialog_end": {d: [{"action": "set_key", "key": key},
+                                      {"action": "fade_and_remove", "duration": 1.2}]},
+            }
+            state_keys.append({"key": key, "set_by": f"{npc_id} -- after {d}",
+                               "read_by": [npc_id], "meaning": _sentence(rng),
+                               "parallel_group": group_name})
+            members.append(key)
+        budget -= size
+        # Boss spawns once the whole group is done
+        if budget >= 1:
+            boss = f"{base}_boss_{g}"
+            key = f"{boss}_beaten"
+            d = dlg("encounter", boss, target_level)
+            npcs[boss] = {
+                "voice_pitch": round(rng.uniform(0.1, 0.5), 2),
+                "role": "boss",
+                "appears_when": {"all_true": members, "all_false": [key]},
+                "dialog_selection": [{"dialog": d}],
+                "on_dialog_end": {d: [{"action": "set_key", "key": key},
+                                      {"action": "fade_and_remove", "duration": 1.5}]},
+            }
+            state_keys.append({"key": key, "set_by": f"{boss} -- after {d}",
+                               "read_by": [boss, giver], "meaning": _sentence(rng)})
+            gate_keys.append(key)
+            budget -= 1
+        else:
+            gate_keys.extend(members)
+
+    for t in range(budget):
+        npc_id = f"{base}_t{t}"
+        key = f"{npc_id}_talked"
+        d = dlg("dialog", npc_id, target_level)
+        npcs[npc_id] = {
+            "voice_pitch": round(rng.uniform(0.2, 1.4), 2),
+            "role": "target",
+            "dialog_selection": [{"requires": {active: True}, "dialog": d},
+                                 {"dialog": dlg("idle", npc_id, target_level)}],
+            "on_dialog_end": {d: [{"action": "set_key", "key": key}]},
+        }
+        state_keys.append({"key": key, "set_by": f"{npc_id} -- after {d}",
+                           "read_by": [npc_id], "meaning": _sentence(rng)})
+        gate_keys.append(key)
+
+    if not gate_keys:
+        gate_keys = [returned]
+        state_keys.append({"key": returned, "set_by": "code", "set_by_code": True,
+                           "read_by": [giver], "meaning": _sentence(rng)})
+    state_keys.append({"key": complete, "set_by": f"{giver} -- after complete",
+                       "read_by": [giver], "meaning": _sentence(rng)})
+
+    item = rng.choice(ITEMS)
+    selection = [{"requires": {complete: True}, "dialog": dlg("done")},
+                 {"requires": {k: True for k in gate_keys}, "dialog": dlg("complete")},
+                 {"requires": {active: True}, "dialog": dlg("waiting")}]
+    selection.append({"requires": {p: True for p in prereqs}, "dialog": dlg("intro")} if prereqs
+                     else {"dialog": dlg("intro")})
+    if prereqs:
+        selection.append({"dialog": dlg("not_ready")})
+
+    intro_actions = [{"action": "set_key", "key": active}]
+    if spec.choice_depth:
+        intro_actions = [_choice_panel(rng, dlg, spec.choice_depth, intro_actions)]
+    npcs = {giver: {
+        "voice_pitch": round(rng.uniform(0.5, 1.4), 2),
+        "role": "giver",
+        "dialog_selection": selection,
+        "on_dialog_end": {
+            dlg("intro"): intro_actions,
+            dlg("complete"): [{"action": "set_key", "key": complete},
+                              {"action": "item_popup", "item_id": item, "delay": 0.5}],
+        },
+    }, **npcs}
+
+    return {
+        "id": qid,
+        "type": "quest",
+        "name": _sentence(rng, 2, 5).rstrip(".!?"),
+        "description": _sentence(rng, 12, 40),
+        "level": level,
+        "secondary_levels": secondary,
+        "prerequisites": prereqs,
+        "active_key": active,
+        "complete_key": complete,
+        "reward": {"type": "item", "item_id": item},
+        "npcs": npcs,
+        "state_keys": state_keys,
+    }
+
+
+def generate_corpus(spec: CorpusSpec) -> dict:
+    """Return {quest_id: data} for ``spec``. Deterministic for a given seed."""
+    rng = random.Random(spec.seed)
+    corpus = {}
+    layers: list[list[str]] = [[] for _ in range(spec.prereq_depth)]
+    width = len(str(spec.quests))
+    for i in range(spec.quests):
+        level = rng.choice(LEVELS)
+        if rng.random() < spec.event_ratio:
+            qid = f"event_{i:0{width}d}"
+            corpus[qid] = _make_event(rng, qid, level)
+            continue
+        qid = f"quest_{i:0{width}d}"
+        layer = i * spec.prereq_depth // max(1, spec.quests)
+        prereqs = []
+        if layer and layers[layer - 1]:
+            for other in rng.sample(layers[layer - 1], k=min(len(layers[layer - 1]), rng.randint(1, 2))):
+                prereqs.append(corpus[other]["complete_key"])
+        corpus[qid] = _make_quest(rng, spec, qid, level, prereqs)
+        layers[layer].append(qid)
+    return corpus
+
+# ---------------------------------------------------------------------------
+# Dialog stubs
+# ---------------------------------------------------------------------------
+
+def _dialog_ids(corpus: dict) -> dict:
+    """dialog_id -> (npc_id, voice_pitch) for every dialog referenced anywhere."""
+    found = {}
+
+    def walk(actions, npc_id, pitch):
+        for a in actions:
+            if a.get("action") == "play_dialog":
+                found.setdefault(a["dialog"], (npc_id, pitch))
+            elif a.get("action") == "choice_panel":
+                walk(a.get("on_accept", []) + a.get("on_decline", []), npc_id, pitch)
+
+    for q in corpus.values():
+        for npc_id, npc in q["npcs"].items():
+            pitch = npc.get("voice_pitch", 1.0)
+            for entry in npc.get("dialog_selection", []):
+                found.setdefault(entry["dialog"], (npc_id, pitch))
+            for did, actions in npc.get("on_dialog_end", {}).items():
+                found.setdefault(did, (npc_id, pitch))
+                walk(actions, npc_id, pitch)
+    return found
+
+
+def dialog_tres(rng: random.Random, npc_id: str, pitch: float, lines: int) -> str:
+    """A DialogSequence .tres in the exact layout the editor writes."""
+    parts = [SEQ_HEADER]
+    for n in range(1, lines + 1):
+        speaker, line_pitch = (_character_name(npc_id), pitch) if n % 3 else ("Player", 1.2)
+        parts.append(
+            f'\n[sub_resource type="Resource" id="line_{n}"]\n'
+            f'script = ExtResource("2_line")\n'
+            f'character_name = "{speaker}"\n'
+            f'text = "{_sentence(rng)}"\n'
+            f'voice_pitch = {line_pitch}\n'
+        )
+    refs = ", ".join(f'SubResource("line_{n}")' for n in range(1, lines + 1))
+    parts.append(
+        f'\n[resource]\n'
+        f'script = ExtResource("1_seq")\n'
+        f'description = "{_sentence(rng, 3, 8)}"\n'
+        f'one_shot = {"true" if rng.random() < 0.5 else "false"}\n'
+        f'lines = Array[ExtResource("2_line")]([{refs}])\n'
+    )
+    return "".join(parts)
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+def write_corpus(out_dir: Path, spec: CorpusSpec, force: bool = False) -> dict:
+    """Wipe ``out_dir`` and write quests + dialog stubs. Returns file counts.
+
+    Raises FileExistsError rather than wiping a non-empty directory that has
+    no marker file, unless ``force``.
+    """
+    if out_dir.exists():
+        if not out_dir.is_dir():
+            raise FileExistsError(f"{out_dir} exists and is not a directory")
+        if not force and any(out_dir.iterdir()) and not (out_dir / MARKER_FILE).is_file():
+            raise FileExistsError(f"{out_dir} is not empty and was not written by gen_quest_corpus.py "
+                                  f"(no {MARKER_FILE}); pass --force to wipe it anyway")
+        shutil.rmtree(out_dir)
+    quests_dir = out_dir / "data" / "quests"
+    quests_dir.mkdir(parents=True)
+    (out_dir / MARKER_FILE).write_text(f"seed {spec.seed}\n", encoding="utf-8")
+
+    corpus = generate_corpus(spec)
+    for qid, q in corpus.items():
+        (quests_dir / f"{qid}.json").write_text(json.dumps(q, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    rng = random.Random(spec.seed + 1)
+    dialogs = _dialog_ids(corpus)
+    for did, (npc_id, pitch) in sorted(dialogs.items()):
+        level, npc_dir, moment = did.split("/")
+        path = out_dir / "levels" / level / "dialogs" / npc_dir / f"{moment}.tres"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lines = rng.randint(1, spec.lines_per_dialog * 2 - 1)
+        path.write_text(dialog_tres(rng, npc_id, pitch, lines), encoding="utf-8")
+
+    return {"quests": len(corpus), "dialogs": len(dialogs)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic quest corpus")
+    parser.add_argument("--out",             required=True, type=Path, help="Output directory (wiped first, see --force)")
+    parser.add_argument("--quests",          type=int, default=100, help="Number of quest/event files")
+    parser.add_argument("--npcs",            type=int, default=4, help="NPCs per quest (including the giver)")
+    parser.add_argument("--parallel-groups", type=int, default=1, help="parallel_group blocks per quest")
+    parser.add_argument("--choice-depth",    type=int, default=1, help="choice_panel nesting depth (0 = none)")
+    parser.add_argument("--prereq-depth",    type=int, default=4, help="Length of the prerequisite chain")
+    parser.add_argument("--event-ratio",     type=float, default=0.2, help="Fraction of files that are events")
+    parser.add_argument("--lines",           type=int, default=4, help="Average dialog lines per .tres")
+    parser.add_argument("--seed",            type=int, default=1)
+    parser.add_argument("--force",           action="store_true",
+                        help="Wipe --out even if it was not written by this script")
+    args = parser.parse_args()
+
+    spec = CorpusSpec(quests=args.quests, npcs=args.npcs, parallel_groups=args.parallel_groups,
+                      choice_depth=args.choice_depth, prereq_depth=args.prereq_depth,
+                      event_ratio=args.event_ratio, lines_per_dialog=args.lines, seed=args.seed)
+    try:
+        counts = write_corpus(args.out, spec, force=args.force)
+    except FileExistsError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(2)
+    print(f"Wrote {counts['quests']} quest file(s) and {counts['dialogs']} dialog stub(s) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
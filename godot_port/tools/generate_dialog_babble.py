@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+generate_dialog_babble.py -- Pre-render the dialog "babble" for every DialogSequence
+
+CinematicDialog plays the dialog_talk blip once per newly typed character,
+re-pitching one AudioStreamPlayer each time.  This tool renders the same
+thing ahead of time: for every line of every levels/*/dialogs/**/*.tres it
+lays out one blip per voiced character at the moment the typewriter reveals
+it, at the line's voice_pitch, and writes one WAV per sequence with the lines
+back to back plus a JSON offset table, so a line can be played as a single
+stream (``play(from_position)`` .. ``start + duration``).
+
+It follows the runtime rules:
+  - character i appears at i / DIALOG_TEXT_SPEED seconds; the last one
+    completes the line without a blip
+  - spaces and punctuation are silent (same set as _play_talk_blip)
+  - pitch_scale = max(voice_pitch + jitter, 0.05), jitter uniform within
+    +/- (DIALOG_TALK_PITCH_MAX - DIALOG_TALK_PITCH_MIN) / 2; the jitter is
+    seeded from the line, so a line always renders the same
+  - a new blip cuts off the previous one (a single player restarts)
+volume_db / bus stay on the player and are not baked in.
+
+The blip is the dialog_talk patch from sfx_patches.json, rendered by
+generate_ui_sounds.render_patch.  Each line's PCM is cached in
+tools/.cache/dialog_babble/ under a hash of its text, pitch, the typing
+constants and the patch, so editing one line re-renders only that line;
+sequence WAVs are only rewritten when their bytes change.
+
+Usage:
+  python tools/generate_dialog_babble.py
+      Render every sequence to assets/audio/dialog_babble/<level>/<moment>.wav
+      (+ .json offset table).
+
+  python tools/generate_dialog_babble.py level_1/spawn level_town/purple_karim/intro
+      Only these dialog ids.
+
+  python tools/generate_dialog_babble.py --force --out /tmp/babble
+      Ignore the line cache and write somewhere else.
+
+Offset table (<moment>.json):
+  {"dialog": id, "wav": "<moment>.wav", "sample_rate": 44100,
+   "lines": [{"character", "voice_pitch", "start", "length",
+              "start_s", "duration_s", "blips"}]}
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import sys
+import wave
+from pathlib import Path
+
+import numpy as np
+
+import atomic_write
+import gdscript_consts
+import generate_ui_sounds
+import sfx_engine as sfx
+import tres_parser
+
+TOOLS_DIR   = Path(__file__).parent
+GODOT_DIR   = TOOLS_DIR.parent
+LEVELS_DIR  = GODOT_DIR / "levels"
+DEFAULT_OUT = GODOT_DIR / "assets" / "audio" / "dialog_babble"
+CACHE_DIR   = TOOLS_DIR / ".cache" / "dialog_babble"
+DIALOG_CACHE = TOOLS_DIR / ".cache" / "dialogs.json"
+
+BLIP_PATCH = "dialog_talk"
+SILENT     = set(" \t\n.,!?;:-\"'()[]{}")   # CinematicDialog._play_talk_blip
+MIN_PITCH  = 0.05
+
+
+def _typing_settings() -> dict:
+    consts = gdscript_consts.load_consts(GODOT_DIR / "core" / "Constants.gd")
+    lo = float(consts.get("DIALOG_TALK_PITCH_MIN", 0.8))
+    hi = float(consts.get("DIALOG_TALK_PITCH_MAX", 1.4))
+    return {
+        "text_speed": float(consts.get("DIALOG_TEXT_SPEED", 30.0)),
+        "spread": (hi - lo) * 0.5,
+    }
+
+# ---------------------------------------------------------------------------
+# Line rendering
+# ---------------------------------------------------------------------------
+
+def blip_chars(text: str) -> list:
+    """Indices (1-based visible-character counts) that trigger a blip."""
+    return [i for i in range(1, len(text)) if text[i - 1] not in SILENT]
+
+
+def line_key(text: str, voice_pitch: float, settings: dict, blip_digest: str) -> str:
+    blob = json.dumps({"text": text, "voice_pitch": voice_pitch, "settings": settings, "blip": blip_digest},
+                      sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def render_line(text: str, voice_pitch: float, blip: np.ndarray, settings: dict,
+                sample_rate: int, seed: int) -> tuple:
+    """(float samples, blip count) for one line.
+
+    Every output sample belongs to the most recent blip started at or before
+    it; its position inside that blip is the elapsed time times the blip's
+    pitch_scale, read from the blip by linear interpolation (silence past the
+    blip's end).
+    """
+    speed = settings["text_speed"]
+    n = int(round(len(text) / speed * sample_rate))
+    chars = blip_chars(text)
+    if not chars:
+        return np.zeros(n), 0
+
+    starts = np.rint(np.array(chars) / speed * sample_rate).astype(np.int64)
+    rng = np.random.default_rng(seed)
+    pitches = np.maximum(voice_pitch + rng.uniform(-settings["spread"], settings["spread"], len(chars)), MIN_PITCH)
+    tail = int(np.ceil((len(blip) - 1) / pitches[-1])) + 1
+    n = max(n, int(starts[-1]) + tail)
+
+    idx = np.arange(n)
+    owner = np.searchsorted(starts, idx, side="right") - 1
+    voiced = owner >= 0
+    owner = np.maximum(owner, 0)
+    pos = (idx - starts[owner]) * pitches[owner]
+    out = np.interp(pos, np.arange(len(blip)), blip, right=0.0)
+    return np.where(voiced, out, 0.0), len(chars)
+
+
+def _line_seed(text: str, voice_pitch: float) -> int:
+    return int.from_bytes(hashlib.sha1(f"{voice_pitch!r}\x00{text}".encode("utf-8")).digest()[:8], "little")
+
+# ---------------------------------------------------------------------------
+# Sequences
+# ---------------------------------------------------------------------------
+
+def _wav_bytes(pcm: bytes, sample_rate: int) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "w") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(pcm)
+    return buf.getvalue()
+
+
+class BabbleRenderer:
+    """Renders lines through the per-line PCM cache."""
+
+    def __init__(self, patches_file: Path = generate_ui_sounds.PATCHES_FILE, cache_dir: Path = CACHE_DIR,
+                 force: bool = False):
+        patchset = generate_ui_sounds.load_patches(patches_file)
+        self.sample_rate = patchset["sample_rate"]
+        patch = patchset["patches"][BLIP_PATCH]
+        self.blip = generate_ui_sounds.render_patch(patch, self.sample_rate)
+        engine = generate_ui_sounds._engine_digest() + hashlib.sha1(Path(__file__).read_bytes()).hexdigest()
+        self.blip_digest = generate_ui_sounds.patch_hash(patch, self.sample_rate, engine)
+        self.settings = _typing_settings()
+        self.cache_dir = cache_dir
+        self.force = force
+        self.used = set()
+        self.stats = {"rendered": 0, "cached": 0}
+
+    def line_pcm(self, text: str, voice_pitch: float) -> tuple:
+        """(16-bit PCM bytes, blip count) for one line, from the cache when possible."""
+        key = line_key(text, voice_pitch, self.settings, self.blip_digest)
+        self.used.add(key)
+        path = self.cache_dir / f"{key}.pcm"
+        blips = len(blip_chars(text))
+        if not self.force:
+            try:
+                pcm = path.read_bytes()
+                self.stats["cached"] += 1
+                return pcm, blips
+            except OSError:
+                pass
+        samples, blips = render_line(text, voice_pitch, self.blip, self.settings, self.sample_rate,
+                                     _line_seed(text, voice_pitch))
+        pcm = sfx.pcm16(samples)
+        atomic_write.write_if_changed(path, pcm)
+        self.stats["rendered"] += 1
+        return pcm, blips
+
+    def sequence(self, dialog_id: str, dialog: dict, out_dir: Path) -> bool:
+        """Write <out_dir>/<dialog_id>.wav and .json; True if either changed."""
+        chunks, table, start = [], [], 0
+        for line in dialog["lines"]:
+            pcm, blips = self.line_pcm(line["text"], line["voice_pitch"])
+            length = len(pcm) // 2
+            chunks.append(pcm)
+            table.append({
+                "character": line["character"],
+                "voice_pitch": line["voice_pitch"],
+                "start": start,
+                "length": length,
+                "start_s": round(start / self.sample_rate, 6),
+                "duration_s": round(length / self.sample_rate, 6),
+                "blips": blips,
+            })
+            start += length
+        wav_path = out_dir / f"{dialog_id}.wav"
+        meta = {"dialog": dialog_id, "wav": wav_path.name, "sample_rate": self.sample_rate, "lines": table}
+        changed = atomic_write.write_if_changed(wav_path, _wav_bytes(b"".join(chunks), self.sample_rate))
+        meta_bytes = (json.dumps(meta, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+        return atomic_write.write_if_changed(wav_path.with_suffix(".json"), meta_bytes) or changed
+
+    def prune(self) -> int:
+        """Delete cached lines no longer used by any sequence."""
+        removed = 0
+        for path in self.cache_dir.glob("*.pcm"):
+            if path.stem not in self.used:
+                path.unlink()
+                removed += 1
+        return removed
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pre-render dialog babble tracks from DialogSequence .tres files",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("dialogs",   nargs="*", help="Dialog ids to render (default: all)")
+    parser.add_argument("--out",     type=Path, default=DEFAULT_OUT, help="Output directory")
+    parser.add_argument("--patches", type=Path, default=generate_ui_sounds.PATCHES_FILE)
+    parser.add_argument("--force",   action="store_true", help="Re-render every line, ignoring the cache")
+    args = parser.parse_args()
+
+    dialogs = tres_parser.load_dialogs(LEVELS_DIR, DIALOG_CACHE)
+    unknown = [d for d in args.dialogs if d not in dialogs]
+    if unknown:
+        print(f"ERROR: no such dialog: {', '.join(unknown)}", file=sys.stderr)
+        sys.exit(2)
+
+    renderer = BabbleRenderer(args.patches, force=args.force)
+    print("Generating dialog babble...")
+    written = 0
+    for dialog_id in args.dialogs or sorted(dialogs):
+        if renderer.sequence(dialog_id, dialogs[dialog_id], args.out):
+            print(f"  Written: {args.out / dialog_id}.wav")
+            written += 1
+    if not args.dialogs:
+        pruned = renderer.prune()
+        if pruned:
+            print(f"  Pruned {pruned} unused cached line(s)")
+    s = renderer.stats
+    print(f"  {s['rendered']} line(s) rendered, {s['cached']} from cache, "
+          f"{written} sequence(s) changed")
+    print("Done.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,294 +1,330 @@
 #!/usr/bin/env python3
-"""Generate simple UI sound effects as WAV files for the menu system."""
-
-import wave
-import struct
-import math
+"""
+generate_ui_sounds.py -- Render the procedural sound effects from sfx_patches.json
+
+Every sound is a patch in tools/sfx_patches.json: oscillator / noise layers
+with their own filters, envelope, gain and start/end times, then patch-wide
+filters, envelope, amplitude and LFO (see render_patch for the order).
+Synthesis is done by sfx_engine.py.
+
+Each render is recorded in tools/.cache/sfx_render.json as the patch's
+content hash (patch JSON + sample rate + engine source) and the SHA-1 of the
+WAV it wrote.  A patch is skipped while both still match, so a run only
+re-renders edited patches.  Renders run on a process pool and replace their
+WAV atomically.
+
+Patches marked ``"protected": true`` belong to user-provided files (e.g.
+rocket_thrust.wav) and are only rendered with --all.
+
+Usage:
+  python tools/generate_ui_sounds.py
+      Render every changed, unprotected patch.
+
+  python tools/generate_ui_sounds.py dialog_talk ui_tick --force
+      Re-render just these patches, ignoring the cache.
+
+  python tools/generate_ui_sounds.py --all
+      Also render protected patches (overwrites the user-provided WAVs!).
+
+  python tools/generate_ui_sounds.py --list
+      List patches and whether each is up to date.
+
+Patch schema (durations in seconds):
+  duration     number, or a list of segment lengths that are added
+  loop         true: round the length down to whole periods of the first
+               oscillator layer, so the file loops seamlessly
+  amplitude    output gain (default 1)
+  seed         default seed for noise layers without their own
+  lfo          {"freq", "center", "depth"}: multiply by center + depth * sine
+  layers       [{"osc": "sine" | "saw" | "square" | "pulse", "freq", "duty",
+                 "high", "low", "phase": "accumulate" | "time"}
+                 or {"noise": "lcg", "seed"},
+                 plus optional "filters", "envelope", "gain", "start", "end"]
+  filters      [{"type": "one_pole", "alpha"}
+                | {"type": "bandpass", "center", "bw" | "bw_ratio",
+                   "sweep_to", "sweep_curve"}
+                | {"type": "parallel", "branches": [{"gain", "filters"}]}]
+  envelope     {"type": "exp", "rate"} | {"type": "attack_exp", "attack", "rate"}
+               | {"type": "decay", "length", "level"}
+               | {"type": "ahr", "attack", "release", "release_len", "curve"}
+                 (attack ramp, hold, then a curved close; fractions of the duration)
+"""
+
+import argparse
+import hashlib
+import json
 import os
-
-SAMPLE_RATE = 44100
-OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "assets", "audio", "sfx")
-
-
-def generate_wav(filename: str, samples: list[float], sample_rate: int = SAMPLE_RATE):
-    """Write mono 16-bit WAV file from float samples [-1.0, 1.0]."""
-    filepath = os.path.join(OUTPUT_DIR, filename)
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    with wave.open(filepath, "w") as f:
-        f.setnchannels(1)
-        f.setsampwidth(2)
-        f.setframerate(sample_rate)
-        for s in samples:
-            clamped = max(-1.0, min(1.0, s))
-            f.writeframes(struct.pack("<h", int(clamped * 32767)))
-    print(f"  Written: {filepath}")
-
-
-def generate_tick():
-    """Short bright tick — sine burst at 1000 Hz, 50ms, fast exponential decay."""
-    freq = 1000.0
-    duration = 0.05
-    amplitude = 0.4
-    n_samples = int(duration * SAMPLE_RATE)
-    samples = []
-    for i in range(n_samples):
-        t = i / SAMPLE_RATE
-        envelope = math.exp(-t * 50.0)
-        sample = math.sin(2.0 * math.pi * freq * t) * envelope * amplitude
-        samples.append(sample)
-    generate_wav("ui_tick.wav", samples)
-
-
-def generate_confirm():
-    """Two-note ascending chime — C5 then E5, 150ms total, slight overlap."""
-    c5 = 523.25
-    e5 = 659.25
-    note_dur = 0.08
-    gap = 0.01
-    amplitude = 0.35
-    total_dur = note_dur + gap + note_dur
-    n_samples = int(total_dur * SAMPLE_RATE)
-    samples = []
-    for i in range(n_samples):
-        t = i / SAMPLE_RATE
-        sample = 0.0
-        # First note (C5)
-        if t < note_dur:
-            env1 = math.exp(-t * 25.0)
-            sample += math.sin(2.0 * math.pi * c5 * t) * env1 * amplitude
-        # Second note (E5), starts after gap
-        t2_start = note_dur + gap
-        if t >= t2_start:
-            t2 = t - t2_start
-            env2 = math.exp(-t2 * 20.0)
-            sample += math.sin(2.0 * math.pi * e5 * t2) * env2 * amplitude
-        samples.append(sample)
-    generate_wav("ui_confirm.wav", samples)
-
-
-def generate_rocket_thrust():
-    """Loopable retro rocket thruster — deep rumble with layered harmonics and noise.
-
-    Multi-layer approach for a convincing pixel-art rocket:
-    1. Deep sawtooth fundamental (55 Hz) for engine rumble
-    2. Square sub-harmonic (27.5 Hz) for bass body
-    3. Pulse wave (110 Hz, 25% duty) for mid-range buzz
-    4. Heavy filtered noise (50%) for combustion roar
-    5. Slow LFO modulation for organic flutter
-    Duration: 1.0s loop, sample-aligned for seamless repeat.
-    """
-    fund_freq = 55.0       # A1 — deep rumble
-    sub_freq = 27.5        # A0 — sub-bass
-    mid_freq = 110.0       # A2 — mid buzz
-    amplitude = 0.45
-    duration = 1.0
-
-    # Round to exact fundamental period for seamless loop
-    period_samples = int(SAMPLE_RATE / fund_freq)
-    n_samples = period_samples * max(1, int(duration * SAMPLE_RATE) // period_samples)
-
-    samples = []
-    phase_fund = 0.0
-    phase_sub = 0.0
-    phase_mid = 0.0
-    phase_lfo = 0.0
-    noise_state = 42
-    prev_noise_filtered = 0.0
-
-    for i in range(n_samples):
-        t = i / SAMPLE_RATE
-        phase_fund += fund_freq / SAMPLE_RATE
-        phase_sub += sub_freq / SAMPLE_RATE
-        phase_mid += mid_freq / SAMPLE_RATE
-        phase_lfo += 3.5 / SAMPLE_RATE  # 3.5 Hz flutter
-
-        # LFO: slow amplitude wobble for organic feel
-        lfo = 0.85 + 0.15 * math.sin(2.0 * math.pi * phase_lfo)
-
-        # Sawtooth fundamental (ramp wave)
-        saw = 2.0 * (phase_fund % 1.0) - 1.0
-
-        # Square sub-harmonic (50% duty)
-        sub = 1.0 if (phase_sub % 1.0) < 0.5 else -1.0
-
-        # Pulse wave mid (25% duty — narrower = buzzier)
-        pulse = 1.0 if (phase_mid % 1.0) < 0.25 else -1.0
-
-        # Deterministic noise via LCG
-        noise_state = (noise_state * 1103515245 + 12345) & 0x7FFFFFFF
-        raw_noise = (noise_state / 0x7FFFFFFF) * 2.0 - 1.0
-
-        # Simple low-pass filter on noise (smooths harsh hiss into roar)
-        alpha = 0.15  # lower = smoother
-        prev_noise_filtered = alpha * raw_noise + (1.0 - alpha) * prev_noise_filtered
-
-        # Mix layers: saw 30%, sub 15%, pulse 15%, noise 40%
-        mix = (
-            saw * 0.30
-            + sub * 0.15
-            + pulse * 0.15
-            + prev_noise_filtered * 0.40
-        )
-
-        sample = mix * amplitude * lfo
-        samples.append(sample)
-
-    generate_wav("rocket_thrust.wav", samples)
-
-
-def generate_dash_swoosh():
-    """Short airy swoosh — filtered noise sweep with rising pitch, ~120ms.
-
-    Layers:
-    1. Band-passed noise that sweeps from 800 Hz to 3000 Hz (air rush)
-    2. Quick attack (5ms), fast exponential decay
-    3. Slight pitch-down tail for the trailing air
-    """
-    duration = 0.12
-    amplitude = 0.35
-    n_samples = int(duration * SAMPLE_RATE)
-    noise_state = 7
-
-    # Two-pole bandpass state
-    bp_y1 = 0.0
-    bp_y2 = 0.0
-    bp_x1 = 0.0
-    bp_x2 = 0.0
-
-    samples = []
-    for i in range(n_samples):
-        t = i / SAMPLE_RATE
-        progress = t / duration  # 0..1
-
-        # Envelope: fast attack (5ms), exponential decay
-        if t < 0.005:
-            env = t / 0.005
-        else:
-            env = math.exp(-(t - 0.005) * 25.0)
-
-        # Sweep center frequency 800 → 3000 Hz (fast rise, slow tail)
-        sweep = 800.0 + 2200.0 * (1.0 - (1.0 - progress) ** 3)
-
-        # Bandpass filter coefficients (resonant)
-        bw = sweep * 0.6  # bandwidth
-        omega = 2.0 * math.pi * sweep / SAMPLE_RATE
-        sin_w = math.sin(omega)
-        cos_w = math.cos(omega)
-        alpha = sin_w * math.sinh(math.log(2.0) / 2.0 * (bw / sweep) * omega / sin_w) if sin_w != 0 else 0.1
-
-        b0 = alpha
-        b1 = 0.0
-        b2 = -alpha
-        a0 = 1.0 + alpha
-        a1 = -2.0 * cos_w
-        a2 = 1.0 - alpha
-
-        # Deterministic noise
-        noise_state = (noise_state * 1103515245 + 12345) & 0x7FFFFFFF
-        raw_noise = (noise_state / 0x7FFFFFFF) * 2.0 - 1.0
-
-        # Apply bandpass
-        y = (b0 / a0) * raw_noise + (b1 / a0) * bp_x1 + (b2 / a0) * bp_x2 - (a1 / a0) * bp_y1 - (a2 / a0) * bp_y2
-        bp_x2 = bp_x1
-        bp_x1 = raw_noise
-        bp_y2 = bp_y1
-        bp_y1 = y
-
-        sample = y * env * amplitude
-        samples.append(sample)
-
-    generate_wav("dash_swoosh.wav", samples)
-
-
-def generate_dialog_talk():
-    """Animal Crossing-style speech blip — ~60ms voiced syllable.
-
-    Mimics a tiny vocal utterance:
-    1. Pulse wave glottal source (rich harmonics, like vocal cords)
-    2. Two-formant vowel shaping (F1=600 Hz, F2=1200 Hz) for "ah" quality
-    3. Tiny noise burst at attack (consonant-like pop)
-    4. Quick open/close envelope (mouth shape)
-    Pitch randomization at runtime via pitch_scale (0.8-1.4).
-    """
-    freq = 220.0          # fundamental — low voice range
-    duration = 0.06
-    amplitude = 0.45
-    n_samples = int(duration * SAMPLE_RATE)
-    noise_state = 31
-
-    # Formant filter state (two resonant bandpass filters in series)
-    f1_freq, f1_bw = 600.0, 120.0   # first formant (open vowel)
-    f2_freq, f2_bw = 1200.0, 150.0  # second formant
-
-    # Biquad bandpass coefficients
-    def biquad_bp(center, bw):
-        omega = 2.0 * math.pi * center / SAMPLE_RATE
-        sin_w = math.sin(omega)
-        cos_w = math.cos(omega)
-        alpha = sin_w * math.sinh(math.log(2.0) / 2.0 * (bw / center) * omega / sin_w) if sin_w != 0 else 0.1
-        a0 = 1.0 + alpha
-        return {
-            "b0": alpha / a0, "b1": 0.0, "b2": -alpha / a0,
-            "a1": -2.0 * cos_w / a0, "a2": (1.0 - alpha) / a0,
-        }
-
-    c1 = biquad_bp(f1_freq, f1_bw)
-    c2 = biquad_bp(f2_freq, f2_bw)
-    # Filter states
-    f1_x1 = f1_x2 = f1_y1 = f1_y2 = 0.0
-    f2_x1 = f2_x2 = f2_y1 = f2_y2 = 0.0
-
-    samples = []
-    phase = 0.0
-    for i in range(n_samples):
-        t = i / SAMPLE_RATE
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+import atomic_write
+import sfx_engine as sfx
+
+TOOLS_DIR    = Path(__file__).parent
+PATCHES_FILE = TOOLS_DIR / "sfx_patches.json"
+CACHE_FILE   = TOOLS_DIR / ".cache" / "sfx_render.json"
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+def _duration(patch: dict) -> float:
+    d = patch["duration"]
+    if isinstance(d, list):
+        total = 0.0
+        for seg in d:
+            total += seg
+        return total
+    return d
+
+
+def patch_length(patch: dict, sample_rate: int) -> int:
+    n = int(_duration(patch) * sample_rate)
+    if patch.get("loop"):
+        f0 = next(layer["freq"] for layer in patch["layers"] if "osc" in layer)
+        period = int(sample_rate / f0)
+        n = period * max(1, n // period)
+    return n
+
+
+def _oscillator(layer: dict, t: np.ndarray, n: int, sample_rate: int) -> np.ndarray:
+    kind = layer["osc"]
+    freq = layer["freq"]
+    if layer.get("phase", "accumulate") == "time":
+        if kind == "sine":
+            return np.sin(2.0 * np.pi * freq * t)
+        ph = freq * t
+    else:
+        ph = sfx.phase(freq, n, sample_rate)
+    if kind == "sine":
+        return sfx.sine(ph)
+    if kind == "saw":
+        return sfx.saw(ph)
+    if kind == "square":
+        return sfx.pulse(ph, 0.5, layer.get("high", 1.0), layer.get("low", -1.0))
+    if kind == "pulse":
+        return sfx.pulse(ph, layer.get("duty", 0.5), layer.get("high", 1.0), layer.get("low", -1.0))
+    raise ValueError(f"unknown oscillator {kind!r}")
+
+
+def _envelope(env: dict, t: np.ndarray, duration: float) -> np.ndarray:
+    kind = env["type"]
+    if kind == "exp":
+        return np.exp(-t * env["rate"])
+    if kind == "attack_exp":
+        attack = env["attack"]
+        return np.where(t < attack, t / attack, np.exp(-(t - attack) * env["rate"]))
+    if kind == "decay":
+        length = env["length"]
+        return np.where(t < length, np.maximum(0.0, 1.0 - t / length) * env.get("level", 1.0), 0.0)
+    if kind == "ahr":
         progress = t / duration
-
-        # Envelope: mouth opens fast, sustains briefly, closes
-        if progress < 0.08:
-            env = progress / 0.08                       # 5ms attack
-        elif progress < 0.55:
-            env = 1.0                                    # sustain
+        attack, release = env["attack"], env["release"]
+        length = env.get("release_len", 1.0 - release)
+        close = 1.0 - (np.maximum(progress - release, 0.0) / length) ** env.get("curve", 1.0)
+        return np.where(progress < attack, progress / attack, np.where(progress < release, 1.0, close))
+    raise ValueError(f"unknown envelope {kind!r}")
+
+
+def _filter(spec: dict, x: np.ndarray, t: np.ndarray, duration: float, sample_rate: int) -> np.ndarray:
+    kind = spec["type"]
+    if kind == "one_pole":
+        return sfx.one_pole(x, spec["alpha"])
+    if kind == "bandpass":
+        center = spec["center"]
+        if "sweep_to" in spec:
+            progress = t / duration
+            center = center + (spec["sweep_to"] - center) * (1.0 - (1.0 - progress) ** spec.get("sweep_curve", 1))
+        bw = center * spec["bw_ratio"] if "bw_ratio" in spec else spec["bw"]
+        coeffs = sfx.bandpass(center, bw, sample_rate)
+        return sfx.biquad_varying(x, coeffs) if np.ndim(center) else sfx.biquad(x, coeffs)
+    if kind == "parallel":
+        out = None
+        for branch in spec["branches"]:
+            y = _filters(branch.get("filters", []), x, t, duration, sample_rate) * branch.get("gain", 1.0)
+            out = y if out is None else out + y
+        return out
+    raise ValueError(f"unknown filter {kind!r}")
+
+
+def _filters(specs: list, x: np.ndarray, t: np.ndarray, duration: float, sample_rate: int) -> np.ndarray:
+    for spec in specs:
+        x = _filter(spec, x, t, duration, sample_rate)
+    return x
+
+
+def render_patch(patch: dict, sample_rate: int = sfx.SAMPLE_RATE) -> np.ndarray:
+    """Float samples for one patch.
+
+    Each layer: source -> filters -> envelope (on time since its start) ->
+    gain, silent outside [start, end).  The layers are summed, then: patch
+    filters -> patch envelope -> amplitude -> LFO.
+    """
+    duration = _duration(patch)
+    n = patch_length(patch, sample_rate)
+    t = sfx.times(n, sample_rate)
+    mix = None
+    for layer in patch["layers"]:
+        start = layer.get("start", 0.0)
+        local = t - start
+        if "osc" in layer:
+            sig = _oscillator(layer, local, n, sample_rate)
+        elif layer.get("noise") == "lcg":
+            sig = sfx.lcg_noise(layer.get("seed", patch.get("seed", 1)), n)
         else:
-            env = 1.0 - ((progress - 0.55) / 0.45) ** 1.5  # smooth close
-
-        # Glottal pulse source (narrow pulse wave, ~20% duty = buzzy/nasal)
-        phase += freq / SAMPLE_RATE
-        pulse = 1.0 if (phase % 1.0) < 0.20 else -0.3
-
-        # Tiny noise burst in first 8ms (consonant attack)
-        noise_state = (noise_state * 1103515245 + 12345) & 0x7FFFFFFF
-        noise = (noise_state / 0x7FFFFFFF) * 2.0 - 1.0
-        noise_env = max(0.0, 1.0 - t / 0.008) * 0.4 if t < 0.008 else 0.0
+            raise ValueError(f"layer needs 'osc' or 'noise': {layer}")
+        sig = _filters(layer.get("filters", []), sig, local, duration, sample_rate)
+        if "envelope" in layer:
+            sig = sig * _envelope(layer["envelope"], local, duration)
+        sig = sig * layer.get("gain", 1.0)
+        if start > 0.0 or "end" in layer:
+            sig = np.where((t >= start) & (t < layer.get("end", np.inf)), sig, 0.0)
+        mix = sig if mix is None else mix + sig
+
+    mix = _filters(patch.get("filters", []), mix, t, duration, sample_rate)
+    if "envelope" in patch:
+        mix = mix * _envelope(patch["envelope"], t, duration)
+    mix = mix * patch.get("amplitude", 1.0)
+    if "lfo" in patch:
+        lfo = patch["lfo"]
+        mix = mix * (lfo["center"] + lfo["depth"] * sfx.sine(sfx.phase(lfo["freq"], n, sample_rate)))
+    return mix
+
+# ---------------------------------------------------------------------------
+# Patch set / cache
+# ---------------------------------------------------------------------------
+
+def load_patches(path: Path = PATCHES_FILE) -> dict:
+    """The patch set, with ``output_dir`` resolved against the file's directory."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    data["output_dir"] = (Path(path).parent / data.get("output_dir", ".")).resolve()
+    data.setdefault("sample_rate", sfx.SAMPLE_RATE)
+    return data
+
+
+def _engine_digest() -> str:
+    h = hashlib.sha1()
+    for mod in (sfx.__file__, __file__):
+        h.update(Path(mod).read_bytes())
+    return h.hexdigest()
+
+
+def patch_hash(patch: dict, sample_rate: int, engine: str) -> str:
+    blob = json.dumps({"patch": patch, "sample_rate": sample_rate, "engine": engine}, sort_keys=True)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def _file_sha1(path: Path) -> str:
+    try:
+        return hashlib.sha1(path.read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+def _load_cache() -> dict:
+    try:
+        return json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _render_to_file(job: tuple) -> tuple:
+    """Worker: render one patch and atomically replace its WAV; returns (name, sha1)."""
+    name, patch, sample_rate, path = job
+    samples = render_patch(patch, sample_rate)
+    with atomic_write.AtomicWriter(path) as tmp:
+        sfx.write_wav(tmp.name, samples, sample_rate)
+    return name, _file_sha1(path)
+
+
+def render_set(patchset: dict, names: list = None, include_protected: bool = False,
+               force: bool = False, jobs: int = None) -> dict:
+    """Render the selected patches; returns {name: "rendered" | "unchanged" | "protected"}."""
+    patches = patchset["patches"]
+    sample_rate = patchset["sample_rate"]
+    out_dir = patchset["output_dir"]
+    out_dir.mkdir(parents=True, exist_ok=True)
+    engine = _engine_digest()
+    cache = _load_cache()
+
+    status, todo = {}, []
+    for name in names or patches:
+        patch = patches[name]
+        path = out_dir / patch.get("file", f"{name}.wav")
+        if patch.get("protected") and not include_protected:
+            status[name] = "protected"
+            continue
+        digest = patch_hash(patch, sample_rate, engine)
+        entry = cache.get(path.name, {})
+        if not force and entry.get("patch") == digest and entry.get("wav") == _file_sha1(path):
+            status[name] = "unchanged"
+            continue
+        todo.append(((name, patch, sample_rate, path), path.name, digest))
+
+    if len(todo) > 1 and jobs != 1:
+        with ProcessPoolExecutor(max_workers=min(jobs or os.cpu_count() or 1, len(todo))) as pool:
+            results = list(pool.map(_render_to_file, [job for job, _, _ in todo]))
+    else:
+        results = [_render_to_file(job) for job, _, _ in todo]
+    for (_, fname, digest), (name, wav_sha1) in zip(todo, results):
+        cache[fname] = {"patch": digest, "wav": wav_sha1}
+        status[name] = "rendered"
+
+    if todo:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        CACHE_FILE.write_text(json.dumps(cache, indent=2, sort_keys=True), encoding="utf-8")
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Render procedural sound effects from a patch set",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("names",     nargs="*", help="Patches to render (default: all)")
+    parser.add_argument("--patches", type=Path, default=PATCHES_FILE)
+    parser.add_argument("--all",     action="store_true", help="Also render protected patches")
+    parser.add_argument("--force",   action="store_true", help="Re-render even if unchanged")
+    parser.add_argument("--jobs",    type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--list",    action="store_true", help="List patches and exit")
+    args = parser.parse_args()
+
+    patchset = load_patches(args.patches)
+    unknown = [n for n in args.names if n not in patchset["patches"]]
+    if unknown:
+        print(f"ERROR: no such patch: {', '.join(unknown)} (have: {', '.join(patchset['patches'])})", file=sys.stderr)
+        sys.exit(2)
+
+    if args.list:
+        engine, cache = _engine_digest(), _load_cache()
+        for name, patch in patchset["patches"].items():
+            path = patchset["output_dir"] / patch.get("file", f"{name}.wav")
+            entry = cache.get(path.name, {})
+            fresh = (entry.get("patch") == patch_hash(patch, patchset["sample_rate"], engine)
+                     and entry.get("wav") == _file_sha1(path))
+            flags = ("protected, " if patch.get("protected") else "") + ("up to date" if fresh else "stale")
+            print(f"  {name:<16} {path.name:<20} ({flags})  {patch.get('description', '')}")
+        return
 
-        # Mix source
-        src = pulse + noise * noise_env
-
-        # Formant 1 (bandpass)
-        y1 = c1["b0"] * src + c1["b1"] * f1_x1 + c1["b2"] * f1_x2 - c1["a1"] * f1_y1 - c1["a2"] * f1_y2
-        f1_x2 = f1_x1; f1_x1 = src; f1_y2 = f1_y1; f1_y1 = y1
-
-        # Formant 2 (bandpass, parallel mix)
-        y2 = c2["b0"] * src + c2["b1"] * f2_x1 + c2["b2"] * f2_x2 - c2["a1"] * f2_y1 - c2["a2"] * f2_y2
-        f2_x2 = f2_x1; f2_x1 = src; f2_y2 = f2_y1; f2_y1 = y2
-
-        # Combine formants (F1 dominant, F2 adds brightness)
-        voiced = y1 * 0.7 + y2 * 0.3
-
-        samples.append(voiced * env * amplitude)
-
-    generate_wav("dialog_talk.wav", samples)
+    print("Generating UI sound effects...")
+    status = render_set(patchset, args.names or None, args.all, args.force, args.jobs)
+    for name, state in status.items():
+        path = patchset["output_dir"] / patchset["patches"][name].get("file", f"{name}.wav")
+        if state == "rendered":
+            print(f"  Written: {path}")
+            if patchset["patches"][name].get("protected"):
+                print(f"  ({path.name} regenerated — user-provided WAV overwritten!)")
+        elif state == "protected" and args.names:
+            print(f"  WARN: {name} is protected (user-provided {path.name}); pass --all to overwrite it",
+                  file=sys.stderr)
+    skipped = sum(1 for s in status.values() if s == "unchanged")
+    if skipped:
+        print(f"  {skipped} unchanged patch(es) skipped")
+    print("Done.")
 
 
 if __name__ == "__main__":
-    import sys
-    print("Generating UI sound effects...")
-    generate_tick()
-    generate_confirm()
-    generate_dash_swoosh()
-    generate_dialog_talk()
-    # rocket_thrust.wav is user-provided — only regenerate with --all flag
-    if "--all" in sys.argv:
-        generate_rocket_thrust()
-        print("  (rocket_thrust.wav regenerated — user-provided WAV overwritten!)")
-    print("Done.")
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+quest_bench.py -- Scaling benchmarks for quest_tool.py
+
+Generates synthetic corpora with gen_quest_corpus.py at several sizes, points
+quest_tool at each one and times / memory-profiles its main entry points:
+load_all, validate, generate_mermaid, generate_story, generate_html and
+generate_dashboard.
+
+Usage:
+  python tools/quest_bench.py
+      Run at 10/100/1000/10000 quests and print a table.
+
+  python tools/quest_bench.py --scales 10 100 1000 --save
+      Run and store the results as the baseline
+      (tools/.cache/quest_bench_baseline.json unless --baseline is given).
+
+  python tools/quest_bench.py --check
+      Run and compare against the baseline. Exits 1 if any benchmark got
+      slower than --tolerance (default 25%) or its peak memory grew by more
+      than --mem-tolerance (default 25%).
+
+Timings are best-of --repeat wall-clock runs; memory is the tracemalloc peak
+of one extra run.  Baselines are machine-specific: save one per machine.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from pathlib import Path
+
+import gen_quest_corpus
+import quest_tool
+
+DEFAULT_SCALES   = [10, 100, 1000, 10000]
+BASELINE_FILE    = quest_tool.CACHE_DIR / "quest_bench_baseline.json"
+NOISE_FLOOR_S    = 0.005   # ignore regressions smaller than this (timer jitter)
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+def _point_quest_tool_at(root: Path):
+    """Redirect quest_tool's module-level paths to a generated corpus."""
+    quest_tool.GODOT_DIR = root
+    quest_tool.QUESTS_DIR = root / "data" / "quests"
+    quest_tool.CACHE_DIR = root / ".cache"
+    quest_tool.VALIDATE_CACHE_FILE = quest_tool.CACHE_DIR / "validate.json"
+    quest_tool.DIALOG_CACHE_FILE = quest_tool.CACHE_DIR / "dialogs.json"
+
+
+def _benchmarks(quests: dict) -> dict:
+    """name -> zero-arg callable. Each call does the full work from scratch."""
+    return {
+        "load_all":           quest_tool.load_all,
+        "validate":           lambda: quest_tool.validate(quests),
+        "generate_mermaid":   lambda: quest_tool.generate_mermaid(quests),
+        "generate_story":     lambda: quest_tool.generate_story(quests),
+        "generate_html":      lambda: quest_tool.generate_html(quests),
+        "generate_dashboard": lambda: quest_tool.generate_dashboard(quests),
+    }
+
+
+def _measure(fn, repeat: int) -> dict:
+    sink = io.StringIO()
+    best = float("inf")
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(sink):
+            t0 = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - t0)
+        sink.seek(0)
+        sink.truncate()
+    tracemalloc.start()
+    with contextlib.redirect_stdout(sink):
+        fn()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(best, 6), "peak_kb": round(peak / 1024, 1)}
+
+
+def run(scales: list, repeat: int, seed: int, only: list = None) -> dict:
+    results = {}
+    for n in scales:
+        with tempfile.TemporaryDirectory(prefix=f"quest_bench_{n}_") as tmp:
+            root = Path(tmp)
+            counts = gen_quest_corpus.write_corpus(root, gen_quest_corpus.CorpusSpec(quests=n, seed=seed))
+            _point_quest_tool_at(root)
+            quests = quest_tool.load_all()
+            row = {"dialogs": counts["dialogs"]}
+            for name, fn in _benchmarks(quests).items():
+                if only and name not in only:
+                    continue
+                # 10k-quest runs are slow enough that one timing pass is plenty
+                row[name] = _measure(fn, repeat if n < 10000 else 1)
+                print(f"  {n:>6} quests  {name:<20} {row[name]['seconds'] * 1000:10.1f} ms"
+                      f"  {row[name]['peak_kb'] / 1024:8.1f} MB", file=sys.stderr)
+            results[str(n)] = row
+    return {
+        "meta": {
+            "date": date.today().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "json_backend": quest_tool.JSON_BACKEND,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+# ---------------------------------------------------------------------------
+# Baseline comparison
+# ---------------------------------------------------------------------------
+
+def compare(current: dict, baseline: dict, tolerance: float, mem_tolerance: float) -> list:
+    """Return human-readable regression messages (empty list = pass)."""
+    failures = []
+    for scale, row in current["results"].items():
+        base_row = baseline.get("results", {}).get(scale)
+        if not base_row:
+            continue
+        for name, cur in row.items():
+            base = base_row.get(name)
+            if not isinstance(cur, dict) or not isinstance(base, dict):
+                continue
+            slow_limit = base["seconds"] * (1 + tolerance)
+            if cur["seconds"] > slow_limit and cur["seconds"] - base["seconds"] > NOISE_FLOOR_S:
+                failures.append(
+                    f"{name} @ {scale}: {cur['seconds'] * 1000:.1f} ms vs baseline "
+                    f"{base['seconds'] * 1000:.1f} ms (+{(cur['seconds'] / base['seconds'] - 1) * 100:.0f}%)")
+            if cur["peak_kb"] > base["peak_kb"] * (1 + mem_tolerance):
+                failures.append(
+                    f"{name} @ {scale}: peak {cur['peak_kb'] / 1024:.1f} MB vs baseline "
+                    f"{base['peak_kb'] / 1024:.1f} MB")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark quest_tool.py on synthetic corpora",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--scales",        type=int, nargs="+", default=DEFAULT_SCALES, metavar="N")
+    parser.add_argument("--only",          nargs="+", metavar="NAME", help="Run only these benchmarks")
+    parser.add_argument("--repeat",        type=int, default=3, help="Timing runs per benchmark (best is kept)")
+    parser.add_argument("--seed",          type=int, default=1)
+    parser.add_argument("--baseline",      type=Path, default=BASELINE_FILE)
+    parser.add_argument("--save",          action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--check",         action="store_true", help="Fail if slower than the baseline")
+    parser.add_argument("--tolerance",     type=float, default=0.25)
+    parser.add_argument("--mem-tolerance", type=float, default=0.25)
+    parser.add_argument("--json",          type=Path, metavar="PATH", help="Also write results to PATH")
+    args = parser.parse_args()
+
+    current = run(args.scales, args.repeat, args.seed, args.only)
+
+    if args.json:
+        args.json.write_text(json.dumps(current, indent=2), encoding="utf-8")
+
+    if args.save:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(current, indent=2), encoding="utf-8")
+        print(f"Baseline written to {args.baseline}")
+
+    if args.check:
+        if not args.baseline.exists():
+            print(f"ERROR: no baseline at {args.baseline} (run with --save first)", file=sys.stderr)
+            sys.exit(2)
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        failures = compare(current, baseline, args.tolerance, args.mem_tolerance)
+        if failures:
+            print(f"\n  REGRESSION: {len(failures)} benchmark(s) slower than baseline:", file=sys.stderr)
+            for f in failures:
+                print(f"    FAIL {f}", file=sys.stderr)
+            sys.exit(1)
+        print("  No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,36 @@ quest_tool.py -- Quest graph validation and visualization
 
 Usage:
   python tools/quest_tool.py --validate
-      Check all quest JSON files for structural errors.
+      Check all quest JSON files for structural errors. Results are cached
+      per file (tools/.cache/validate.json); only changed files and the files
+      whose cross-references they touch are re-checked.
+
+  python tools/quest_tool.py --validate --no-cache
+      Full cold validation, ignoring and not updating the cache.
+
+  python tools/quest_tool.py --explore
+      Search every reachable combination of quest state keys (dialog
+      selection, on_dialog_end actions, both choice_panel branches and
+      set_by_code keys) and report unreachable dialogs, dead-end states,
+      keys that can never be set and NPCs whose appears_when never holds.
+      on_dialog_end dialogs no selection rule reaches are picked by NPC
+      scripts; they are explored as entry points and listed as NOTEs, not
+      issues. Exits 1 only on issues, so it can gate CI.
+
+  python tools/quest_tool.py --compile --write
+      Compile every NPC's dialog_selection into integer (mask, value) rules
+      in data/quest_tables.json, which QuestManager uses instead of walking
+      the quest JSON. The tables are checked against the JSON rules in every
+      state --explore can reach before anything is written. They record a
+      hash of data/quests/*.json; QuestManager falls back to the JSON (with
+      a warning) when a quest file changed since the last compile.
+
+  Dialog .tres files are parsed with tres_parser.py and cached in
+  tools/.cache/dialogs.json by mtime + size; unchanged files are not re-read.
+
+  Add --timings to any command to print per-file load times to stderr.
+  Quest files are read and parsed on a thread pool, with orjson when it is
+  installed; unreadable files are reported with file:line:column and skipped.
 
   python tools/quest_tool.py --graph
       Print auto-generated Mermaid flowchart (all quests) to stdout.
@@ -18,6 +47,13 @@ Usage:
   python tools/quest_tool.py --graph --quest <quest_id> --write
       Write single-quest chart to docs/quest-flowchart-<id>.md.
 
+  python tools/quest_tool.py --graph --partition level --write
+      Split the flowchart into docs/quest-flowchart/<level>.md files plus an
+      index.md chart of levels joined by prerequisite edges. Use
+      "--partition component" to split by connected prerequisite component.
+      Node IDs are the same as in the full chart; quests in other partitions
+      appear as linked stub nodes.
+
   python tools/quest_tool.py --story
       Print a narrative storyline Markdown document to stdout.
 
@@ -30,6 +66,21 @@ Usage:
   python tools/quest_tool.py --html --write
       Write HTML report to docs/quest-report.html.
 
+  python tools/quest_tool.py --dashboard --sharded --write
+      Write the Game Bible as docs/game-bible/: index.html with a small
+      manifest, plus content-hashed JSON shards the page fetches per view and
+      per quest card. Needs to be served over HTTP (GitHub Pages, or --serve,
+      which serves it at /game-bible/). Without --write, report what would
+      change.
+
+  python tools/quest_tool.py --all --write
+      Build the flowchart, storyline, HTML report, dashboard and compiled
+      dialog tables from one load, rendering them in parallel worker
+      processes. Outputs whose
+      content is unchanged (generation dates aside) are not rewritten, so
+      docs/ -- and the Pages deploy -- is only touched when something changed.
+      Without --write, report which outputs are out of date.
+
   python tools/quest_tool.py --npc <npc_id>
       Print the dialog selection logic and post-dialog actions for one NPC.
 
@@ -41,14 +92,27 @@ Usage:
 """
 
 import json
+import os
 import re
 import sys
+import time
 import argparse
 import hashlib
 import html as _html
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import date
 
+import atomic_write
+import gdscript_consts
+import tres_parser
+
+try:
+    import orjson as _fastjson   # optional: several times faster than stdlib json
+except ImportError:
+    _fastjson = None
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
@@ -58,6 +122,10 @@ QUESTS_DIR     = GODOT_DIR / "data" / "quests"
 FLOWCHART_FILE = GODOT_DIR.parent / "docs" / "quest-flowchart.md"
 STORYLINE_FILE = GODOT_DIR.parent / "docs" / "storyline.md"
 HTML_FILE      = GODOT_DIR.parent / "docs" / "quest-report.html"
+CACHE_DIR      = TOOLS_DIR / ".cache"
+VALIDATE_CACHE_FILE = CACHE_DIR / "validate.json"
+DIALOG_CACHE_FILE = CACHE_DIR / "dialogs.json"
+TABLES_FILE    = GODOT_DIR / "data" / "quest_tables.json"
 
 DIALOG_ID_RE = re.compile(r'^level_\w+/\w+/\w+$')
 
@@ -65,147 +133,278 @@ DIALOG_ID_RE = re.compile(r'^level_\w+/\w+/\w+$')
 # Loading
 # ---------------------------------------------------------------------------
 
+JSON_BACKEND = "orjson" if _fastjson else "json"
+
+
+def parse_json_bytes(raw: bytes):
+    """Parse JSON with the fastest available backend.
+
+    orjson is stricter than stdlib json (no NaN, 64-bit ints only), so any
+    orjson failure is retried with stdlib json: that either succeeds or
+    raises the canonical ``json.JSONDecodeError`` with line/column info.
+    """
+    if _fastjson is not None:
+        try:
+            return _fastjson.loads(raw)
+        except _fastjson.JSONDecodeError:
+            pass
+    return json.loads(raw.decode("utf-8"))
+
+
+def pool_map(fn, items: list) -> list:
+    """``map`` over a thread pool, preserving order. Serial for tiny inputs."""
+    if len(items) < 8:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4)) as pool:
+        return list(pool.map(fn, items))
+
+
+class LoadReport:
+    """Result of ``load_corpus()``: parsed quests plus errors and timings.
+
+    errors  -- [{"file", "line", "column", "message"}] for unloadable files
+    timings -- {file name: (read seconds, parse seconds)}
+    """
+
+    def __init__(self):
+        self.quests: dict = {}
+        self.errors: list = []
+        self.timings: dict = {}
+        self.backend = JSON_BACKEND
+
+    def print_errors(self, file=sys.stderr):
+        for err in self.errors:
+            print(format_load_error(err), file=file)
+
+    def print_timings(self, top: int = 10, file=sys.stderr):
+        total_read = sum(r for r, _ in self.timings.values())
+        total_parse = sum(p for _, p in self.timings.values())
+        print(f"  Load timings ({len(self.timings)} file(s), backend: {self.backend}):", file=file)
+        print(f"    read  total {total_read * 1000:8.2f} ms", file=file)
+        print(f"    parse total {total_parse * 1000:8.2f} ms", file=file)
+        slowest = sorted(self.timings.items(), key=lambda kv: -kv[1][1])[:top]
+        if slowest:
+            print("    slowest parses:", file=file)
+            for name, (read_s, parse_s) in slowest:
+                print(f"      {parse_s * 1000:8.3f} ms  {name}", file=file)
+
+
+def format_load_error(err: dict) -> str:
+    loc = f"{err['file']}:{err['line']}:{err['column']}" if err.get("line") else err["file"]
+    return f"  ERROR: {loc}: {err['message']}"
+
+
+def _load_error(name: str, exc: Exception) -> dict:
+    if isinstance(exc, json.JSONDecodeError):
+        return {"file": name, "line": exc.lineno, "column": exc.colno,
+                "message": f"invalid JSON -- {exc.msg}"}
+    return {"file": name, "line": 0, "column": 0, "message": str(exc)}
+
+
+def _read_and_parse(path: Path) -> tuple:
+    """Worker: returns (path, data or None, error or None, read_s, parse_s)."""
+    t0 = time.perf_counter()
+    try:
+        raw = path.read_bytes()
+    except OSError as e:
+        return path, None, _load_error(path.name, e), time.perf_counter() - t0, 0.0
+    t1 = time.perf_counter()
+    try:
+        data = parse_json_bytes(raw)
+        if not isinstance(data, dict):
+            raise ValueError(f"top-level JSON value must be an object, got {type(data).__name__}")
+        err = None
+    except (ValueError, UnicodeDecodeError) as e:
+        data, err = None, _load_error(path.name, e)
+    return path, data, err, t1 - t0, time.perf_counter() - t1
+
+
+def load_corpus(quests_dir: Path = None) -> LoadReport:
+    """Read and parse every *.json in data/quests/ on a worker pool.
+
+    Never raises or prints for a bad file: unloadable files are recorded in
+    ``report.errors`` and skipped.  Quests keep sorted-filename order; a
+    duplicate id keeps its first slot and the last file's data.
+    """
+    report = LoadReport()
+    paths = sorted((quests_dir or QUESTS_DIR).glob("*.json"))
+    for path, data, err, read_s, parse_s in pool_map(_read_and_parse, paths):
+        report.timings[path.name] = (read_s, parse_s)
+        if err:
+            report.errors.append(err)
+            continue
+        report.quests[data.get("id", path.stem)] = data
+    return report
+
+
 def load_all() -> dict:
-    """Load every *.json file from data/quests/ and return as {id: data}."""
-    quests = {}
-    for path in sorted(QUESTS_DIR.glob("*.json")):
-        with open(path, encoding="utf-8") as fh:
-            try:
-                data = json.load(fh)
-            except json.JSONDecodeError as e:
-                print(f"  ERROR: {path.name}: invalid JSON -- {e}", file=sys.stderr)
-                continue
-        qid = data.get("id", path.stem)
-        quests[qid] = data
-    return quests
+    """Load every *.json file from data/quests/ and return as {id: data}.
+
+    Unloadable files are reported on stderr and skipped.
+    """
+    report = load_corpus()
+    report.print_errors()
+    return report.quests
 
 # ---------------------------------------------------------------------------
 # Helpers for extracting quest data
 # ---------------------------------------------------------------------------
 
-def all_state_keys(quests: dict) -> set:
-    keys = set()
-    for q in quests.values():
-        for sk in q.get("state_keys", []):
-            keys.add(sk["key"])
-    return keys
-
-def all_complete_keys(quests: dict) -> set:
-    return {q["complete_key"] for q in quests.values() if q.get("complete_key")}
-
 def iter_actions(actions: list):
-    """Recursively yield every action dict in an action list (handles choice_panel)."""
+    """Recursively yield every action dict in an action list (handles nested choice_panel)."""
     for a in actions:
         yield a
         if a.get("action") == "choice_panel":
-            for sub in a.get("on_accept", []) + a.get("on_decline", []):
-                yield sub
+            yield from iter_actions(a.get("on_accept", []) + a.get("on_decline", []))
 
-def get_set_keys(quest: dict) -> set:
-    keys = set()
-    for npc_data in quest.get("npcs", {}).values():
-        for actions in npc_data.get("on_dialog_end", {}).values():
-            for a in iter_actions(actions):
-                if a.get("action") == "set_key":
-                    keys.add(a["key"])
-    return keys
-
-def get_required_keys(quest: dict) -> set:
-    keys = set()
-    for npc_data in quest.get("npcs", {}).values():
-        for entry in npc_data.get("dialog_selection", []):
-            keys.update(entry.get("requires", {}).keys())
-        aw = npc_data.get("appears_when", {})
-        keys.update(aw.get("all_true", []))
-        keys.update(aw.get("all_false", []))
-    return keys
-
-def get_all_dialog_refs(quest: dict) -> set:
-    dialogs = set()
-    for npc_data in quest.get("npcs", {}).values():
-        for entry in npc_data.get("dialog_selection", []):
-            if "dialog" in entry:
-                dialogs.add(entry["dialog"])
-        for dialog_id, actions in npc_data.get("on_dialog_end", {}).items():
-            dialogs.add(dialog_id)
-            for a in iter_actions(actions):
-                if a.get("action") == "play_dialog":
-                    dialogs.add(a["dialog"])
-    return dialogs
-
-def find_setter(quest: dict, key: str):
-    """Return (npc_id, dialog_id) that sets a given state key, or None."""
-    for npc_id, npc_data in quest.get("npcs", {}).items():
-        for dialog_id, actions in npc_data.get("on_dialog_end", {}).items():
-            for a in iter_actions(actions):
-                if a.get("action") == "set_key" and a.get("key") == key:
-                    return (npc_id, dialog_id)
-    return None
-
-def has_choice_for_key(quest: dict, key: str) -> bool:
-    """Return True if the key is set inside a choice_panel on_accept branch."""
-    for npc_data in quest.get("npcs", {}).values():
-        for actions in npc_data.get("on_dialog_end", {}).values():
-            for a in actions:
-                if a.get("action") == "choice_panel":
-                    for sub in a.get("on_accept", []):
-                        if sub.get("action") == "set_key" and sub.get("key") == key:
-                            return True
-    return False
+# ---------------------------------------------------------------------------
+# Quest index (cross-references built once per run)
+# ---------------------------------------------------------------------------
+
+class QuestIndex:
+    """Cross-reference tables over the whole quest corpus, built in one pass.
+
+    Generators query this instead of rescanning every quest/NPC/action for
+    each lookup.  Lists preserve corpus order (quest -> NPC -> dialog ->
+    action), so "first match" lookups behave exactly like the old scans.
+    """
+
+    def __init__(self, quests: dict):
+        self.quests = quests
+        self.setters: dict[str, list] = {}              # key -> [(qid, npc_id, dialog_id)]
+        self.readers: dict[str, list] = {}              # key -> [(qid, npc_id)]
+        self.complete_key_quests: dict[str, list] = {}  # complete_key -> [qid]
+        self.npc_quests: dict[str, list] = {}           # npc_id -> [qid]
+        self.dialog_owner: dict[str, tuple] = {}        # dialog_id -> (qid, npc_id)
+        self.declared_keys: set = set()
+        self.set_keys: dict[str, list] = {}             # qid -> keys its actions set
+        self.required_keys: dict[str, list] = {}        # qid -> keys its conditions read
+        self.dialog_refs: dict[str, list] = {}          # qid -> dialog IDs it references
+        self._first_setter: dict[tuple, tuple] = {}     # (qid, key) -> (npc_id, dialog_id)
+        self._choice_keys: set = set()                  # (qid, key) set by a choice on_accept
+
+        for qid, q in quests.items():
+            self._add_quest(qid, q)
+
+    def _add_quest(self, qid: str, q: dict):
+        for sk in q.get("state_keys", []):
+            self.declared_keys.add(sk["key"])
+        if q.get("complete_key"):
+            self.complete_key_quests.setdefault(q["complete_key"], []).append(qid)
+
+        set_keys = {}
+        required = {}
+        dialogs = {}
+        for npc_id, npc_data in q.get("npcs", {}).items():
+            self.npc_quests.setdefault(npc_id, []).append(qid)
+
+            reads = {}
+            for entry in npc_data.get("dialog_selection", []):
+                reads.update(dict.fromkeys(entry.get("requires", {})))
+                if "dialog" in entry:
+                    dialogs[entry["dialog"]] = None
+                    self.dialog_owner.setdefault(entry["dialog"], (qid, npc_id))
+            aw = npc_data.get("appears_when", {})
+            reads.update(dict.fromkeys(aw.get("all_true", []) + aw.get("all_false", [])))
+            for key in reads:
+                self.readers.setdefault(key, []).append((qid, npc_id))
+            required.update(reads)
+
+            for dialog_id, actions in npc_data.get("on_dialog_end", {}).items():
+                dialogs[dialog_id] = None
+                self.dialog_owner.setdefault(dialog_id, (qid, npc_id))
+                for a in actions:
+                    if a.get("action") == "choice_panel":
+                        for sub in a.get("on_accept", []):
+                            if sub.get("action") == "set_key":
+                                self._choice_keys.add((qid, sub.get("key")))
+                for a in iter_actions(actions):
+                    act = a.get("action")
+                    if act == "set_key":
+                        key = a["key"]
+                        set_keys[key] = None
+                        self.setters.setdefault(key, []).append((qid, npc_id, dialog_id))
+                        self._first_setter.setdefault((qid, key), (npc_id, dialog_id))
+                    elif act == "play_dialog":
+                        dialogs[a["dialog"]] = None
+                        self.dialog_owner.setdefault(a["dialog"], (qid, npc_id))
+
+        self.set_keys[qid] = list(set_keys)
+        self.required_keys[qid] = list(required)
+        self.dialog_refs[qid] = list(dialogs)
+
+    def find_setter(self, qid: str, key: str):
+        """Return (npc_id, dialog_id) in quest ``qid`` that sets ``key``, or None."""
+        return self._first_setter.get((qid, key))
+
+    def has_choice_for_key(self, qid: str, key: str) -> bool:
+        """Return True if ``key`` is set inside a choice_panel on_accept branch of ``qid``."""
+        return (qid, key) in self._choice_keys
+
+    def quest_for_complete_key(self, key: str):
+        """Return the first quest whose complete_key is ``key``, or None."""
+        qids = self.complete_key_quests.get(key)
+        return self.quests[qids[0]] if qids else None
+
+    def read_by(self, qid: str, key: str) -> list:
+        """NPC IDs in quest ``qid`` whose conditions read ``key``."""
+        return [nid for rq, nid in self.readers.get(key, []) if rq == qid]
 
 # ---------------------------------------------------------------------------
 # Validation
 # ---------------------------------------------------------------------------
 
-def validate(quests: dict) -> int:
-    """Run all checks. Returns number of errors found."""
-    errors = 0
-    declared_keys = all_state_keys(quests)
-    valid_complete_keys = all_complete_keys(quests)
+def _quest_errors(qid: str, q: dict, index: QuestIndex, declared_keys, complete_keys) -> list:
+    """Return the list of error messages for one quest file."""
+    errs = []
 
-    for qid, q in quests.items():
-        prefix = f"  [{q.get('type','?')}] {qid}"
-        errs = []
+    for field in ("id", "type", "name"):
+        if not q.get(field):
+            errs.append(f"missing required field '{field}'")
 
-        for field in ("id", "type", "name"):
+    qtype = q.get("type", "")
+    if qtype == "quest":
+        for field in ("active_key", "complete_key"):
             if not q.get(field):
-                errs.append(f"missing required field '{field}'")
+                errs.append(f"type=quest requires '{field}'")
 
-        qtype = q.get("type", "")
-        if qtype == "quest":
-            for field in ("active_key", "complete_key"):
-                if not q.get(field):
-                    errs.append(f"type=quest requires '{field}'")
+    for prereq in q.get("prerequisites", []):
+        if prereq not in complete_keys:
+            errs.append(f"prerequisite '{prereq}' does not match any quest's complete_key")
 
-        for prereq in q.get("prerequisites", []):
-            if prereq not in valid_complete_keys:
-                errs.append(f"prerequisite '{prereq}' does not match any quest's complete_key")
+    for dialog_id in index.dialog_refs[qid]:
+        if not DIALOG_ID_RE.match(dialog_id):
+            errs.append(f"dialog ID '{dialog_id}' does not match pattern level_X/npc/moment")
 
-        for dialog_id in get_all_dialog_refs(q):
-            if not DIALOG_ID_RE.match(dialog_id):
-                errs.append(f"dialog ID '{dialog_id}' does not match pattern level_X/npc/moment")
+    for key in index.required_keys[qid]:
+        if key not in declared_keys:
+            errs.append(f"condition key '{key}' not declared in any quest's state_keys")
 
-        for key in get_required_keys(q):
-            if key not in declared_keys:
-                errs.append(f"condition key '{key}' not declared in any quest's state_keys")
+    for key in index.set_keys[qid]:
+        if key not in declared_keys:
+            errs.append(f"set_key '{key}' not declared in any quest's state_keys")
 
-        for key in get_set_keys(q):
-            if key not in declared_keys:
-                errs.append(f"set_key '{key}' not declared in any quest's state_keys")
+    seen = set()
+    for sk in q.get("state_keys", []):
+        k = sk.get("key", "")
+        if k in seen:
+            errs.append(f"duplicate state_key '{k}'")
+        seen.add(k)
 
-        seen = set()
-        for sk in q.get("state_keys", []):
-            k = sk.get("key", "")
-            if k in seen:
-                errs.append(f"duplicate state_key '{k}'")
-            seen.add(k)
+    actually_set = set(index.set_keys[qid])
+    for sk in q.get("state_keys", []):
+        k = sk["key"]
+        if k not in actually_set and not sk.get("set_by_code", False):
+            errs.append(f"state_key '{k}' is declared but no action sets it in this quest")
+
+    return errs
 
-        actually_set = get_set_keys(q)
-        for sk in q.get("state_keys", []):
-            k = sk["key"]
-            if k not in actually_set and not sk.get("set_by_code", False):
-                errs.append(f"state_key '{k}' is declared but no action sets it in this quest")
 
+def _report_validation(results: list) -> int:
+    """Print (type, qid, errors) results in the standard format. Returns error count."""
+    errors = 0
+    for qtype, qid, errs in results:
+        prefix = f"  [{qtype}] {qid}"
         if errs:
             print(f"{prefix} -- {len(errs)} error(s):")
             for e in errs:
@@ -216,12 +415,745 @@ def validate(quests: dict) -> int:
 
     print()
     if errors == 0:
-        print(f"  {len(quests)} file(s) validated, 0 errors")
+        print(f"  {len(results)} file(s) validated, 0 errors")
     else:
-        print(f"  {len(quests)} file(s) validated, {errors} error(s) found")
+        print(f"  {len(results)} file(s) validated, {errors} error(s) found")
 
     return errors
 
+
+def validate(quests: dict, index: QuestIndex = None) -> int:
+    """Run all checks. Returns number of errors found."""
+    index = index or QuestIndex(quests)
+    results = [
+        (q.get("type", "?"), qid,
+         _quest_errors(qid, q, index, index.declared_keys, index.complete_key_quests))
+        for qid, q in quests.items()
+    ]
+    return _report_validation(results)
+
+# ---------------------------------------------------------------------------
+# Incremental validation (content-hash cache)
+# ---------------------------------------------------------------------------
+
+def _cache_fingerprint() -> str:
+    """Hash of this script; any change to the checks invalidates cached results."""
+    return hashlib.sha1(Path(__file__).read_bytes()).hexdigest()
+
+
+def _validation_entry(qid: str, q: dict, digest: str) -> dict:
+    """Everything a later run needs to decide whether this file must be re-checked."""
+    index = QuestIndex({qid: q})
+    return {
+        "sha1": digest,
+        "qid": qid,
+        "type": q.get("type", "?"),
+        "declares": [sk["key"] for sk in q.get("state_keys", [])],
+        "complete_key": q.get("complete_key") or "",
+        "prerequisites": list(q.get("prerequisites", [])),
+        "reads": index.required_keys[qid] + index.set_keys[qid],
+        "_quest": q,
+        "_index": index,
+    }
+
+
+def validate_cached(cache_path: Path = VALIDATE_CACHE_FILE, timings: bool = False) -> int:
+    """Like ``load_all()`` + ``validate()``, but only re-checks what changed.
+
+    Each file's content hash, the keys it declares / sets / requires and its
+    error list are kept in ``cache_path``.  A file is re-checked when its hash
+    changed, or when one of the keys it references (prerequisites, condition
+    keys, set_key targets) was added to or removed from the corpus-wide
+    declared / complete key sets.  Output is identical to a cold run.
+    With ``timings``, per-file read/parse times are printed to stderr; only
+    changed files are parsed.  Returns number of errors found.
+    """
+    cache = {}
+    if cache_path.exists():
+        try:
+            cache = json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            cache = {}
+    if cache.get("fingerprint") != _cache_fingerprint():
+        cache = {}
+    cached_files = cache.get("files", {})
+
+    def hash_file(path: Path) -> tuple:
+        t0 = time.perf_counter()
+        try:
+            raw = path.read_bytes()
+        except OSError as e:
+            return path, None, _load_error(path.name, e), time.perf_counter() - t0
+        return path, raw, hashlib.sha1(raw).hexdigest(), time.perf_counter() - t0
+
+    # Hash every file; parse only the ones whose content changed
+    report = LoadReport()
+    files = {}
+    raws = {}
+    for path, raw, digest, read_s in pool_map(hash_file, sorted(QUESTS_DIR.glob("*.json"))):
+        parse_s = 0.0
+        if raw is None:
+            # Unreadable: report it, keep no cache entry so it is re-read next run
+            report.errors.append(digest)
+            report.timings[path.name] = (read_s, parse_s)
+            continue
+        entry = cached_files.get(path.name)
+        if entry is None or entry["sha1"] != digest:
+            t0 = time.perf_counter()
+            try:
+                data = parse_json_bytes(raw)
+                if not isinstance(data, dict):
+                    raise ValueError(f"top-level JSON value must be an object, got {type(data).__name__}")
+            except (ValueError, UnicodeDecodeError) as e:
+                entry = {"sha1": digest, "invalid": _load_error(path.name, e)}
+            else:
+                entry = _validation_entry(data.get("id", path.stem), data, digest)
+            parse_s = time.perf_counter() - t0
+        if "invalid" in entry:
+            report.errors.append(entry["invalid"])
+        report.timings[path.name] = (read_s, parse_s)
+        files[path.name] = entry
+        raws[path.name] = raw
+
+    report.print_errors()
+    if timings:
+        report.print_timings()
+
+    # Mirror load_all(): a duplicate id keeps the first slot, last file wins
+    by_qid = {}
+    for name, entry in files.items():
+        if "invalid" not in entry:
+            by_qid[entry["qid"]] = name
+    if not by_qid:
+        print("No quest files found.", file=sys.stderr)
+        sys.exit(1)
+    print(f"Loaded {len(by_qid)} quest file(s) from {QUESTS_DIR.relative_to(GODOT_DIR.parent)}\n")
+
+    declared_keys = set()
+    complete_keys = set()
+    for name in by_qid.values():
+        declared_keys.update(files[name]["declares"])
+        if files[name]["complete_key"]:
+            complete_keys.add(files[name]["complete_key"])
+    changed_declared = declared_keys ^ set(cache.get("declared_keys", []))
+    changed_complete = complete_keys ^ set(cache.get("complete_keys", []))
+
+    results = []
+    for qid, name in by_qid.items():
+        entry = files[name]
+        stale = (
+            "errors" not in entry
+            or not changed_declared.isdisjoint(entry["reads"])
+            or not changed_complete.isdisjoint(entry["prerequisites"])
+        )
+        if stale:
+            if "_quest" not in entry:
+                entry = _validation_entry(qid, parse_json_bytes(raws[name]), entry["sha1"])
+                files[name] = entry
+            entry["errors"] = _quest_errors(qid, entry["_quest"], entry["_index"],
+                                            declared_keys, complete_keys)
+        results.append((entry["type"], qid, entry["errors"]))
+
+    # Shadowed duplicates are not validated; drop them so they get re-checked
+    # from scratch if they ever become the surviving file again.
+    surviving = set(by_qid.values())
+    cache = {
+        "fingerprint": _cache_fingerprint(),
+        "declared_keys": sorted(declared_keys),
+        "complete_keys": sorted(complete_keys),
+        "files": {
+            name: {k: v for k, v in entry.items() if not k.startswith("_")}
+            for name, entry in files.items()
+            if name in surviving or "invalid" in entry
+        },
+    }
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(cache), encoding="utf-8")
+    tmp.replace(cache_path)
+
+    return _report_validation(results)
+
+# ---------------------------------------------------------------------------
+# State-space exploration (--explore)
+# ---------------------------------------------------------------------------
+
+MAX_COMPONENT_STATES = 1 << 20   # BFS budget per component before giving up
+MAX_DEAD_END_EXAMPLES = 5        # dead-end states printed per component
+
+
+class StateModel:
+    """Bit-level model of the quest corpus, as QuestManager executes it.
+
+    Every state key gets a stable bit (sorted key order) and a quest_states
+    snapshot is a packed int.  NPCs are merged across quests the way the
+    runtime does: dialog_selection rules are concatenated in quest order and
+    on_dialog_end uses the first quest that handles the dialog.  set_key is
+    the only write and never clears a key, so states only ever gain bits.
+
+    Keys marked set_by_code become "code" transitions that may fire once the
+    owning quest's prerequisites are all set.  Likewise, on_dialog_end
+    dialogs that no dialog_selection rule or play_dialog reaches are picked
+    by NPC scripts (e.g. OrangeKarimNPC's item check); they are external
+    entry points that may play whenever their NPC is visible.
+    """
+
+    def __init__(self, quests: dict, index: QuestIndex = None):
+        index = index or QuestIndex(quests)
+        self.index = index
+        self.keys = sorted(index.declared_keys | set(index.setters) | set(index.readers))
+        self.bit = {k: 1 << i for i, k in enumerate(self.keys)}
+
+        self.rules: dict[str, list] = {}      # npc_id -> [(mask, value, dialog_id)]
+        self.on_end: dict[str, dict] = {}     # npc_id -> {dialog_id: actions}
+        self.show: dict[str, tuple] = {}      # npc_id -> (mask, value) from appears_when
+        self.remove_bit: dict[str, int] = {}  # npc_id -> removal flag (fade_and_remove)
+        for q in quests.values():
+            for npc_id, npc_data in q.get("npcs", {}).items():
+                rules = self.rules.setdefault(npc_id, [])
+                for entry in npc_data.get("dialog_selection", []):
+                    mask, value = self.encode(entry.get("requires", {}))
+                    rules.append((mask, value, entry.get("dialog", "")))
+                on_end = self.on_end.setdefault(npc_id, {})
+                for dialog_id, actions in npc_data.get("on_dialog_end", {}).items():
+                    on_end.setdefault(dialog_id, actions)
+                aw = npc_data.get("appears_when", {})
+                mask, value = self.show.get(npc_id, (0, 0))
+                for k in aw.get("all_true", []):
+                    mask, value = mask | self.bit[k], value | self.bit[k]
+                for k in aw.get("all_false", []):
+                    mask |= self.bit[k]
+                self.show[npc_id] = (mask, value)
+                if npc_id not in self.remove_bit:
+                    self.remove_bit[npc_id] = self._removal_flag(npc_data)
+
+        # (prereq mask, key bit, quest id) per set_by_code key
+        self.code_keys: list = []
+        for qid, q in quests.items():
+            need, _ = self.encode({k: True for k in q.get("prerequisites", []) if k in self.bit})
+            for sk in q.get("state_keys", []):
+                if sk.get("set_by_code") and sk.get("key") in self.bit:
+                    self.code_keys.append((need, self.bit[sk["key"]], qid))
+
+        self._effects: dict[tuple, tuple] = {}
+
+        # npc_id -> [dialog_id] only reachable from NPC code
+        self.external: dict[str, list] = {}
+        for npc_id, on_end in self.on_end.items():
+            reached = {d for _, _, d in self.rules[npc_id]}
+            for d in on_end:
+                reached |= self.effects(npc_id, d)[1]
+            self.external[npc_id] = [d for d in on_end if d not in reached]
+
+    def encode(self, requires: dict) -> tuple:
+        """{key: bool} -> (mask, value); a state s matches when s & mask == value."""
+        mask = value = 0
+        for k, v in requires.items():
+            b = self.bit.get(k)
+            if b is None:
+                continue
+            mask |= b
+            if v:
+                value |= b
+        return mask, value
+
+    def decode(self, state: int) -> list:
+        return [self.keys[p] for p in _bit_positions(state)]
+
+    def _removal_flag(self, npc_data: dict) -> int:
+        """Mirror of QuestManager.should_remove_npc: the set_key next to fade_and_remove."""
+        for actions in npc_data.get("on_dialog_end", {}).values():
+            if any(a.get("action") == "fade_and_remove" for a in actions):
+                for a in actions:
+                    if a.get("action") == "set_key":
+                        return self.bit.get(a["key"], 0)
+                return 0
+        return 0
+
+    def visible(self, npc_id: str, state: int) -> bool:
+        mask, value = self.show[npc_id]
+        return state & mask == value and not state & self.remove_bit[npc_id]
+
+    def select(self, npc_id: str, state: int) -> str:
+        """First matching dialog_selection rule, like get_npc_dialog. "" = none."""
+        for mask, value, dialog_id in self.rules[npc_id]:
+            if state & mask == value:
+                return dialog_id
+        return ""
+
+    def effects(self, npc_id: str, dialog_id: str) -> tuple:
+        """(OR-masks, dialogs played) for one dialog ending.
+
+        One mask per choice_panel path; play_dialog chains into the played
+        dialog's own on_dialog_end, since it ends on the same NPC.
+        """
+        cached = self._effects.get((npc_id, dialog_id))
+        if cached is None:
+            masks, plays = self._action_effects(npc_id, self.on_end[npc_id].get(dialog_id, []), {dialog_id})
+            cached = self._effects[(npc_id, dialog_id)] = (masks, plays)
+        return cached
+
+    def _action_effects(self, npc_id: str, actions: list, seen: set) -> tuple:
+        masks, plays = [0], set()
+        for a in actions:
+            act = a.get("action")
+            if act == "set_key":
+                b = self.bit.get(a.get("key"), 0)
+                masks = [m | b for m in masks]
+            elif act == "play_dialog":
+                played = a.get("dialog", "")
+                plays.add(played)
+                if played not in seen:
+                    sub, sub_plays = self._action_effects(
+                        npc_id, self.on_end[npc_id].get(played, []), seen | {played})
+                    masks = [m | s for m in masks for s in sub]
+                    plays |= sub_plays
+            elif act == "choice_panel":
+                accept, p1 = self._action_effects(npc_id, a.get("on_accept", []), seen)
+                decline, p2 = self._action_effects(npc_id, a.get("on_decline", []), seen)
+                masks = [m | s for m in masks for s in accept + decline]
+                plays |= p1 | p2
+        return sorted(set(masks)), plays
+
+    def npc_reads(self, npc_id: str) -> int:
+        mask = self.show[npc_id][0] | self.remove_bit[npc_id]
+        for m, _, _ in self.rules[npc_id]:
+            mask |= m
+        return mask
+
+    def npc_writes(self, npc_id: str) -> int:
+        mask = 0
+        dialogs = [d for _, _, d in self.rules[npc_id] if d] + self.external[npc_id]
+        for dialog_id in dialogs:
+            for m in self.effects(npc_id, dialog_id)[0]:
+                mask |= m
+        return mask
+
+
+def _bit_positions(mask: int) -> list:
+    """Indices of the set bits of ``mask``, lowest first."""
+    out = []
+    while mask:
+        low = mask & -mask
+        out.append(low.bit_length() - 1)
+        mask ^= low
+    return out
+
+
+def _sccs(succ: list) -> list:
+    """Strongly connected components of a graph given as adjacency lists.
+
+    Iterative Tarjan; returned in topological order (sources first).
+    """
+    n = len(succ)
+    order = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack, out, counter = [], [], 0
+    for root in range(n):
+        if order[root] != -1:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, 0)]
+        while work:
+            v, i = work[-1]
+            if i < len(succ[v]):
+                work[-1] = (v, i + 1)
+                w = succ[v][i]
+                if order[w] == -1:
+                    order[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, 0))
+                elif on_stack[w]:
+                    low[v] = min(low[v], order[w])
+                continue
+            work.pop()
+            if work:
+                u = work[-1][0]
+                low[u] = min(low[u], low[v])
+            if low[v] == order[v]:
+                comp = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    comp.append(w)
+                    if w == v:
+                        break
+                out.append(comp)
+    out.reverse()
+    return out
+
+
+class ExploreResult:
+    """Everything ``explore()`` learned about the corpus."""
+
+    def __init__(self):
+        self.played: set = set()          # dialog IDs some reachable state plays
+        self.ever_set: int = 0            # OR of all reachable states
+        self.ever_visible: set = set()    # NPC IDs visible in some reachable state
+        self.dead_ends: list = []         # (state, [incomplete quest ids])
+        self.dead_end_count: int = 0
+        self.truncated: list = []         # component labels that hit the state budget
+        self.components: int = 0
+        self.states: int = 0
+        self.reachable: dict[str, list] = {}  # npc_id -> reachable states (keep_states=True)
+
+
+def explore(quests: dict, index: QuestIndex = None, model: StateModel = None,
+            keep_states: bool = False) -> ExploreResult:
+    """Breadth-first search over every reachable quest_states combination.
+
+    Transitions are NPCs (talk: first matching dialog, then its
+    on_dialog_end with both choice_panel branches; or any of the NPC's
+    code-picked dialogs, see StateModel.external) and set_by_code keys.
+    Nodes are split into strongly connected components of the "writes a key
+    the other reads" graph and each component is searched on its own, in
+    dependency order, over a compact bit numbering of just the keys it
+    touches.  Keys owned by an upstream component are inputs that may turn
+    on at any point, but only after every input that was always set
+    alongside them upstream; this keeps unrelated quests from multiplying
+    each other's state counts.
+    """
+    model = model or StateModel(quests, index)
+    res = ExploreResult()
+
+    # Transition nodes: ("npc", npc_id) or ("code", (need, bit, qid))
+    nodes = [("npc", npc_id) for npc_id in model.rules]
+    nodes += [("code", ck) for ck in model.code_keys]
+    reads, writes = [], []
+    for kind, item in nodes:
+        if kind == "npc":
+            reads.append(model.npc_reads(item))
+            writes.append(model.npc_writes(item))
+        else:
+            reads.append(item[0])
+            writes.append(item[1])
+
+    writers: dict[int, list] = {}
+    for i, w in enumerate(writes):
+        for p in _bit_positions(w):
+            writers.setdefault(p, []).append(i)
+    succ = [[] for _ in nodes]
+    for j, r in enumerate(reads):
+        for p in _bit_positions(r):
+            for i in writers.get(p, []):
+                succ[i].append(j)
+
+    complete_pos: dict[int, list] = {}   # complete_key bit position -> [quest ids]
+    for qid, q in quests.items():
+        if q.get("type") == "quest" and q.get("complete_key") in model.bit:
+            complete_pos.setdefault(model.bit[q["complete_key"]].bit_length() - 1, []).append(qid)
+    ever_set: set = set()                # global bit positions
+    implied: dict[int, list] = {}        # position -> positions always set alongside it
+
+    for comp in _sccs(succ):
+        res.components += 1
+        local_mask = comp_reads = 0
+        for i in comp:
+            local_mask |= writes[i]
+            comp_reads |= reads[i]
+        positions = _bit_positions(comp_reads | local_mask)
+        slot = {p: j for j, p in enumerate(positions)}
+
+        def pack(mask: int) -> int:
+            out = 0
+            for p in _bit_positions(mask):
+                out |= 1 << slot[p]
+            return out
+
+        def unpack(state: int) -> int:
+            return sum(1 << positions[j] for j in _bit_positions(state))
+
+        npcs = []
+        for i in comp:
+            kind, item = nodes[i]
+            if kind != "npc":
+                continue
+            show_mask, show_value = model.show[item]
+            rules = []
+            for mask, value, dialog_id in model.rules[item]:
+                effects = model.effects(item, dialog_id) if dialog_id else ([0], set())
+                rules.append((pack(mask), pack(value), dialog_id,
+                              [pack(m) for m in effects[0]], effects[1]))
+            external = []
+            for dialog_id in model.external[item]:
+                masks, plays = model.effects(item, dialog_id)
+                external.append((dialog_id, [pack(m) for m in masks], plays))
+            npcs.append((item, pack(show_mask), pack(show_value),
+                         pack(model.remove_bit[item]), rules, external))
+        env = [(pack(nodes[i][1][0]), pack(nodes[i][1][1])) for i in comp if nodes[i][0] == "code"]
+        for p in _bit_positions(comp_reads & ~local_mask):
+            if p in ever_set:
+                need = sum(1 << slot[x] for x in implied.get(p, ()) if x in slot and x != p)
+                env.append((need, 1 << slot[p]))
+        owned = [(1 << slot[p], qid) for p in _bit_positions(local_mask)
+                 for qid in complete_pos.get(p, [])]
+
+        visited = {0}
+        frontier = [0]
+        examples = 0
+        seen_or = 0
+        local_implied: dict[int, int] = {}
+        while frontier:
+            next_frontier = []
+            for s in frontier:
+                succs = []
+                for npc_id, show_mask, show_value, remove, rules, external in npcs:
+                    if s & show_mask != show_value or s & remove:
+                        continue
+                    res.ever_visible.add(npc_id)
+                    for mask, value, dialog_id, masks, plays in rules:
+                        if s & mask == value:
+                            if dialog_id:
+                                res.played.add(dialog_id)
+                                res.played |= plays
+                                succs += [s | m for m in masks]
+                            break
+                    for dialog_id, masks, plays in external:
+                        res.played.add(dialog_id)
+                        res.played |= plays
+                        succs += [s | m for m in masks]
+                for need, b in env:
+                    if s & need == need:
+                        succs.append(s | b)
+
+                terminal = True
+                for t in succs:
+                    if t == s:
+                        continue
+                    terminal = False
+                    if t not in visited:
+                        visited.add(t)
+                        next_frontier.append(t)
+                if terminal and owned:
+                    missing = [qid for b, qid in owned if not s & b]
+                    if missing:
+                        res.dead_end_count += 1
+                        if examples < MAX_DEAD_END_EXAMPLES:
+                            examples += 1
+                            res.dead_ends.append((unpack(s), missing))
+
+                seen_or |= s
+                for j in _bit_positions(s):
+                    local_implied[j] = local_implied.get(j, s) & s
+            if len(visited) > MAX_COMPONENT_STATES:
+                res.truncated.append(", ".join(n[0] for n in npcs) or "code keys")
+                break
+            frontier = next_frontier
+
+        ever_set.update(positions[j] for j in _bit_positions(seen_or))
+        for j, together in local_implied.items():
+            if local_mask >> positions[j] & 1:
+                implied[positions[j]] = [positions[x] for x in _bit_positions(together)]
+        res.states += len(visited)
+        if keep_states:
+            states = [unpack(s) for s in visited]
+            for npc in npcs:
+                res.reachable[npc[0]] = states
+
+    res.ever_set = sum(1 << p for p in ever_set)
+    return res
+
+
+def report_explore(quests: dict, index: QuestIndex = None) -> int:
+    """Run ``explore()`` and print its findings. Returns the number of issues."""
+    index = index or QuestIndex(quests)
+    model = StateModel(quests, index)
+    t0 = time.perf_counter()
+    res = explore(quests, index, model)
+    elapsed = time.perf_counter() - t0
+
+    print(f"  Explored {res.states} state(s) over {len(model.keys)} key(s) "
+          f"in {res.components} component(s) ({elapsed * 1000:.0f} ms)\n")
+    issues = 0
+
+    external = [(npc_id, d) for npc_id, dialogs in model.external.items() for d in dialogs]
+    if external:
+        # Not an issue: the NPC's script picks these, outside dialog_selection
+        print(f"  Dialogs entered from NPC code ({len(external)}) -- assumed playable whenever the NPC is:")
+        for npc_id, d in external:
+            print(f"    NOTE {d}  [{npc_id}]")
+        print()
+
+    all_dialogs = {}
+    for qid in quests:
+        all_dialogs.update(dict.fromkeys(index.dialog_refs[qid]))
+    unreachable = [d for d in all_dialogs if d not in res.played]
+    if unreachable:
+        print(f"  Unreachable dialogs ({len(unreachable)}):")
+        for d in unreachable:
+            qid, npc_id = index.dialog_owner.get(d, ("?", "?"))
+            print(f"    FAIL {d}  [{qid} / {npc_id}]")
+        print()
+        issues += len(unreachable)
+
+    if res.dead_end_count:
+        print(f"  Dead-end states ({res.dead_end_count}) -- nothing left to do, quest unfinished:")
+        for state, missing in res.dead_ends:
+            keys = ", ".join(model.decode(state)) or "(no keys set)"
+            print(f"    FAIL {' + '.join(missing)} stuck at: {keys}")
+        if res.dead_end_count > len(res.dead_ends):
+            print(f"    ... {res.dead_end_count - len(res.dead_ends)} more")
+        print()
+        issues += res.dead_end_count
+
+    never_set = [k for k in model.keys if not res.ever_set & model.bit[k]]
+    if never_set:
+        print(f"  Keys that can never be set ({len(never_set)}):")
+        for k in never_set:
+            readers = sorted({nid for _, nid in index.readers.get(k, [])})
+            suffix = f"  (read by {', '.join(readers)})" if readers else ""
+            print(f"    FAIL {k}{suffix}")
+        print()
+        issues += len(never_set)
+
+    hidden = [npc_id for npc_id in model.rules if model.show[npc_id][0] and npc_id not in res.ever_visible]
+    if hidden:
+        print(f"  NPCs whose appears_when is never satisfied ({len(hidden)}):")
+        for npc_id in hidden:
+            print(f"    FAIL {npc_id}  [{', '.join(index.npc_quests[npc_id])}]")
+        print()
+        issues += len(hidden)
+
+    for label in res.truncated:
+        print(f"  WARNING: state budget ({MAX_COMPONENT_STATES}) exhausted in component: {label}")
+        print("           results for it are partial\n")
+
+    if issues == 0:
+        print("  No unreachable dialogs, dead ends, unset keys or hidden NPCs")
+    else:
+        print(f"  {issues} issue(s) found")
+    return issues
+
+# ---------------------------------------------------------------------------
+# Compiled dialog tables (--compile)
+# ---------------------------------------------------------------------------
+
+TABLES_VERSION = 2
+MAX_NPC_KEYS = 53   # Godot's JSON parser returns floats; masks must stay exact
+
+
+def quest_sources_hash(quests_dir: Path = None) -> str:
+    """SHA-256 over every data/quests/*.json, as QuestManager._sources_hash() computes it.
+
+    Hex SHA-256 of the lines "<file name>:<hex SHA-256 of the file>\n" in
+    sorted file-name order, so the tables go stale on any edit, rename,
+    addition or removal of a quest file. File contents are hashed with
+    CRLF normalized to LF so a Windows (autocrlf) checkout agrees with
+    the committed hash.
+    """
+    lines = []
+    for path in sorted((quests_dir or QUESTS_DIR).glob("*.json"), key=lambda p: p.name):
+        raw = path.read_bytes().replace(b"\r\n", b"\n")
+        lines.append(f"{path.name}:{hashlib.sha256(raw).hexdigest()}\n")
+    return hashlib.sha256("".join(lines).encode("utf-8")).hexdigest()
+
+
+def compile_dialog_tables(quests: dict, model: StateModel = None) -> dict:
+    """Compile every NPC's dialog_selection into (mask, value) rules.
+
+    ``keys`` is the stable state-key numbering (sorted, same as StateModel).
+    Each NPC lists the key indices its rules read; rule masks use bit i for
+    the NPC's i-th key, so QuestManager packs at most a handful of flags and
+    then does one integer compare per rule.  Rule order is the runtime
+    order: quests in load order, then dialog_selection order.  ``sources``
+    is quest_sources_hash(); QuestManager ignores tables whose hash no
+    longer matches the quest files.
+    """
+    model = model or StateModel(quests)
+    npcs = {}
+    for npc_id, rules in model.rules.items():
+        read = 0
+        for mask, _, _ in rules:
+            read |= mask
+        positions = _bit_positions(read)
+        if len(positions) > MAX_NPC_KEYS:
+            raise ValueError(f"NPC '{npc_id}' reads {len(positions)} keys; "
+                             f"compiled tables support at most {MAX_NPC_KEYS}")
+        slot = {p: i for i, p in enumerate(positions)}
+
+        def pack(mask: int) -> int:
+            return sum(1 << slot[p] for p in _bit_positions(mask))
+
+        npcs[npc_id] = {
+            "keys": positions,
+            "rules": [[pack(mask), pack(value), dialog_id] for mask, value, dialog_id in rules],
+        }
+    return {"version": TABLES_VERSION, "sources": quest_sources_hash(), "keys": model.keys, "npcs": npcs}
+
+
+def tables_json(tables: dict) -> str:
+    """Serialize compiled tables with one rule per line (readable diffs)."""
+    dump = lambda v: json.dumps(v, ensure_ascii=False)
+    lines = ["{", f'  "version": {tables["version"]},', f'  "sources": {dump(tables["sources"])},', '  "keys": [']
+    lines += [f"    {dump(k)}," for k in tables["keys"]]
+    if tables["keys"]:
+        lines[-1] = lines[-1].rstrip(",")
+    lines += ["  ],", '  "npcs": {']
+    npc_blocks = []
+    for npc_id, table in tables["npcs"].items():
+        rules = ",\n".join(f"        {dump(r)}" for r in table["rules"])
+        npc_blocks.append(
+            f"    {dump(npc_id)}: {{\n"
+            f'      "keys": {dump(table["keys"])},\n'
+            f'      "rules": [\n{rules}\n      ]\n'
+            f"    }}")
+    lines.append(",\n".join(npc_blocks))
+    lines += ["  }", "}"]
+    return "\n".join(lines) + "\n"
+
+
+def lookup_compiled(tables: dict, npc_id: str, quest_states: dict) -> str:
+    """Python twin of QuestManager._lookup_compiled()."""
+    table = tables["npcs"].get(npc_id)
+    if table is None:
+        return ""
+    state = 0
+    for i, k in enumerate(table["keys"]):
+        if quest_states.get(tables["keys"][k], False):
+            state |= 1 << i
+    for mask, value, dialog_id in table["rules"]:
+        if state & mask == value:
+            return dialog_id
+    return ""
+
+
+def lookup_interpreted(quests: dict, npc_id: str, quest_states: dict) -> str:
+    """Python twin of the JSON-walking QuestManager.get_npc_dialog()."""
+    for q in quests.values():
+        npc_data = q.get("npcs", {}).get(npc_id)
+        if npc_data is None:
+            continue
+        for entry in npc_data.get("dialog_selection", []):
+            if all(quest_states.get(k, False) == v for k, v in entry.get("requires", {}).items()):
+                return entry.get("dialog", "")
+    return ""
+
+
+def verify_dialog_tables(quests: dict, tables: dict, model: StateModel = None) -> list:
+    """Compare compiled vs interpreted selection in every explored state.
+
+    Returns mismatch messages (empty list = tables are exact).
+    """
+    model = model or StateModel(quests)
+    res = explore(quests, model.index, model, keep_states=True)
+    mismatches = []
+    for npc_id, states in res.reachable.items():
+        owners = {qid: quests[qid] for qid in model.index.npc_quests[npc_id]}
+        for state in states:
+            quest_states = dict.fromkeys(model.decode(state), True)
+            want = lookup_interpreted(owners, npc_id, quest_states)
+            got = lookup_compiled(tables, npc_id, quest_states)
+            if want != got:
+                mismatches.append(f"{npc_id}: compiled '{got}' != interpreted '{want}' "
+                                  f"at {', '.join(quest_states) or '(no keys set)'}")
+    return mismatches
+
 # ---------------------------------------------------------------------------
 # Mermaid helpers (shared between full and single-quest generation)
 # ---------------------------------------------------------------------------
@@ -230,10 +1162,12 @@ def _mid(text: str) -> str:
     """Sanitize text to a valid Mermaid node ID."""
     return re.sub(r'[^a-zA-Z0-9]', '_', text)
 
-def _quest_mermaid_nodes(q: dict, pfx: str, indent: str = "  ") -> list:
+def _quest_mermaid_nodes(qid: str, q: dict, pfx: str, index: QuestIndex, indent: str = "  ") -> list:
     """
     Return a list of Mermaid lines for a single quest's state key chain.
+    qid      -- quest ID (key into the index)
     pfx      -- sanitized prefix for node IDs (unique per quest)
+    index    -- QuestIndex used for setter / choice lookups
     indent   -- leading whitespace for each line
     """
     lines = []
@@ -263,8 +1197,8 @@ def _quest_mermaid_nodes(q: dict, pfx: str, indent: str = "  ") -> list:
             key = sk["key"]
             k_id = f"{pfx}_{_mid(key).upper()}"
 
-            setter = find_setter(q, key)
-            is_choice = has_choice_for_key(q, key)
+            setter = index.find_setter(qid, key)
+            is_choice = index.has_choice_for_key(qid, key)
             label = ""
             if setter:
                 moment = setter[1].rsplit("/", 1)[-1]
@@ -282,7 +1216,7 @@ def _quest_mermaid_nodes(q: dict, pfx: str, indent: str = "  ") -> list:
                 key = sk["key"]
                 k_id = f"{pfx}_{_mid(key).upper()}"
 
-                setter = find_setter(q, key)
+                setter = index.find_setter(qid, key)
                 label = ""
                 if setter:
                     moment = setter[1].rsplit("/", 1)[-1]
@@ -307,49 +1241,66 @@ def _quest_mermaid_nodes(q: dict, pfx: str, indent: str = "  ") -> list:
 # Mermaid — full (all quests)
 # ---------------------------------------------------------------------------
 
-def generate_mermaid(quests: dict) -> str:
-    lines = [
+def _quest_pfx(qid: str) -> str:
+    """Node-ID prefix of a quest; the same in the full chart and every partition."""
+    return _mid(qid).upper()[:16]
+
+
+def _prereq_edges(quests: dict, index: QuestIndex) -> list:
+    """[(from_qid, to_qid, prereq_key)]: from_qid's complete_key gates to_qid."""
+    edges = []
+    for qid, q in quests.items():
+        for prereq_key in q.get("prerequisites", []):
+            for other_id in index.complete_key_quests.get(prereq_key, []):
+                edges.append((other_id, qid, prereq_key))
+    return edges
+
+
+def _prereq_edge_line(edge: tuple) -> str:
+    src, dst, key = edge
+    return f'  {_quest_pfx(src)}_REWARD -.->|"{key}"| {_quest_pfx(dst)}_S'
+
+
+def _quest_subgraph(qid: str, q: dict, index: QuestIndex):
+    yield ""
+    yield f'  subgraph {_quest_pfx(qid)}["{q.get("name", qid)}"]'
+    yield "    direction LR"
+    yield from _quest_mermaid_nodes(qid, q, _quest_pfx(qid), index, indent="    ")
+    yield "  end"
+
+
+def iter_mermaid(quests: dict, index: QuestIndex = None):
+    """Yield the full flowchart line by line (see ``generate_mermaid``)."""
+    index = index or QuestIndex(quests)
+    yield from (
         "<!-- AUTO-GENERATED by tools/quest_tool.py -- do not edit by hand -->",
         "<!-- Run: python tools/quest_tool.py --graph --write -->",
         "",
         "```mermaid",
         "flowchart TD",
-    ]
+    )
 
     for qid, q in quests.items():
-        qname = q.get("name", qid)
-        pfx   = _mid(qid).upper()[:16]
-
-        lines.append("")
-        lines.append(f'  subgraph {pfx}["{qname}"]')
-        lines.append(f"    direction LR")
-        lines.extend(_quest_mermaid_nodes(q, pfx, indent="    "))
-        lines.append("  end")
+        yield from _quest_subgraph(qid, q, index)
 
     # Cross-quest prerequisite edges
-    prereq_lines = []
-    for qid, q in quests.items():
-        pfx = _mid(qid).upper()[:16]
-        for prereq_key in q.get("prerequisites", []):
-            for other_id, other_q in quests.items():
-                if other_q.get("complete_key") == prereq_key:
-                    other_pfx = _mid(other_id).upper()[:16]
-                    prereq_lines.append(
-                        f'  {other_pfx}_REWARD -.->|"{prereq_key}"| {pfx}_S'
-                    )
-    if prereq_lines:
-        lines.append("")
-        lines.append("  %% Cross-quest prerequisites")
-        lines.extend(prereq_lines)
+    edges = _prereq_edges(quests, index)
+    if edges:
+        yield ""
+        yield "  %% Cross-quest prerequisites"
+        yield from map(_prereq_edge_line, edges)
+
+    yield "```"
 
-    lines.append("```")
-    return "\n".join(lines)
+
+def generate_mermaid(quests: dict, index: QuestIndex = None) -> str:
+    return "\n".join(iter_mermaid(quests, index))
 
 # ---------------------------------------------------------------------------
 # Mermaid — single quest
 # ---------------------------------------------------------------------------
 
-def generate_mermaid_single(quests: dict, quest_id: str) -> str:
+def generate_mermaid_single(quests: dict, quest_id: str, index: QuestIndex = None) -> str:
     q = quests.get(quest_id)
     if not q:
         return f"<!-- Quest '{quest_id}' not found -->"
@@ -366,10 +1317,170 @@ def generate_mermaid_single(quests: dict, quest_id: str) -> str:
         "flowchart LR",
         "",
     ]
-    lines.extend(_quest_mermaid_nodes(q, pfx, indent="  "))
+    lines.extend(_quest_mermaid_nodes(quest_id, q, pfx, index or QuestIndex(quests), indent="  "))
     lines.append("```")
     return "\n".join(lines)
 
+# ---------------------------------------------------------------------------
+# Mermaid — partitioned (--graph --partition level|component)
+# ---------------------------------------------------------------------------
+
+FLOWCHART_DIR = GODOT_DIR.parent / "docs" / "quest-flowchart"
+PARTITION_MODES = ("level", "component")
+
+
+def _partition_file(name: str) -> str:
+    return re.sub(r"[^\w.-]", "_", name) + ".md"
+
+
+def partition_quests(quests: dict, index: QuestIndex, by: str) -> tuple:
+    """Split quests into chart partitions.
+
+    by="level": one partition per level; a quest is drawn in its ``level``
+    and in each of its ``secondary_levels``.  by="component": one partition
+    per connected component of the prerequisite graph, named after its
+    alphabetically first quest.  Returns ``(parts, home)``: partition name
+    -> [qid] in corpus order, and qid -> the one partition that owns it
+    (used for index edges and cross-partition links).
+    """
+    parts, home = {}, {}
+    if by == "level":
+        for qid, q in quests.items():
+            home[qid] = q.get("level") or "unassigned"
+            for level in dict.fromkeys([home[qid]] + list(q.get("secondary_levels", []))):
+                parts.setdefault(level, []).append(qid)
+    elif by == "component":
+        parent = {qid: qid for qid in quests}
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for src, dst, _key in _prereq_edges(quests, index):
+            a, b = find(src), find(dst)
+            if a != b:
+                parent[max(a, b)] = min(a, b)
+        for qid in quests:
+            home[qid] = find(qid)
+            parts.setdefault(home[qid], []).append(qid)
+    else:
+        raise ValueError(f"unknown partition mode {by!r} (expected one of {PARTITION_MODES})")
+    return dict(sorted(parts.items())), home
+
+
+def iter_mermaid_partition(quests: dict, index: QuestIndex, name: str, members: list,
+                           home: dict, linked: list):
+    """Yield one partition's chart.
+
+    ``linked`` are the prerequisite edges touching a member.  Quests outside
+    the partition at their other end are drawn as small stub nodes with the
+    node IDs they have in their own partition, plus a click link to that
+    partition's file.
+    """
+    inside = set(members)
+    yield "<!-- AUTO-GENERATED by tools/quest_tool.py -- do not edit by hand -->"
+    yield f"<!-- Partition: {name} -->"
+    yield ""
+    yield "```mermaid"
+    yield "flowchart TD"
+    for qid in members:
+        yield from _quest_subgraph(qid, quests[qid], index)
+
+    stubs = {}
+    for src, dst, _key in linked:
+        if src not in inside:
+            stubs.setdefault(f"{_quest_pfx(src)}_REWARD", src)
+        if dst not in inside:
+            stubs.setdefault(f"{_quest_pfx(dst)}_S", dst)
+    if stubs:
+        yield ""
+        yield "  %% Quests in other partitions"
+        for node, qid in stubs.items():
+            yield f'  {node}[/"{quests[qid].get("name", qid)} ({home[qid]})"/]'
+            yield f'  click {node} "{_partition_file(home[qid])}"'
+    if linked:
+        yield ""
+        yield "  %% Cross-quest prerequisites"
+        yield from map(_prereq_edge_line, linked)
+    yield "```"
+
+
+def iter_mermaid_index(quests: dict, parts: dict, home: dict, edges: list, by: str):
+    """Yield the index chart: one node per partition, prerequisite edges between them."""
+    yield "<!-- AUTO-GENERATED by tools/quest_tool.py -- do not edit by hand -->"
+    yield f"<!-- Run: python tools/quest_tool.py --graph --partition {by} --write -->"
+    yield ""
+    yield "```mermaid"
+    yield "flowchart LR"
+    for name, members in parts.items():
+        node = "P_" + _mid(name)
+        owned = sum(1 for qid in members if home[qid] == name)
+        label = f"{name}<br/>{owned} quest(s)"
+        if owned != len(members):
+            label += f" + {len(members) - owned} shared"
+        yield f'  {node}["{label}"]'
+        yield f'  click {node} "{_partition_file(name)}"'
+
+    between = {}
+    for src, dst, key in edges:
+        a, b = home[src], home[dst]
+        if a != b:
+            between.setdefault((a, b), {})[key] = None
+    if between:
+        yield ""
+    for (a, b), keys in between.items():
+        label = ", ".join(keys) if len(keys) <= 2 else f"{len(keys)} keys"
+        yield f'  P_{_mid(a)} -.->|"{label}"| P_{_mid(b)}'
+    yield "```"
+
+
+def build_flowchart_partitions(quests: dict, by: str, index: QuestIndex = None) -> dict:
+    """filename -> chunk iterator for index.md and every partition file."""
+    index = index or QuestIndex(quests)
+    parts, home = partition_quests(quests, index, by)
+    edges = _prereq_edges(quests, index)
+    # Bucket edges per partition in one pass (a quest may sit in several)
+    where = {}
+    for name, members in parts.items():
+        for qid in members:
+            where.setdefault(qid, []).append(name)
+    linked = {name: [] for name in parts}
+    for edge in edges:
+        for name in dict.fromkeys(where[edge[0]] + where[edge[1]]):
+            linked[name].append(edge)
+    title = "level" if by == "level" else "prerequisite component"
+    files = {"index.md": itertools.chain(
+        [f"# Quest Flowchart by {title}\n\n"
+         f"**Auto-generated** by `tools/quest_tool.py --graph --partition {by} --write`.\n"
+         "Click a partition to open its chart.\n\n"],
+        join_lines(iter_mermaid_index(quests, parts, home, edges, by)))}
+    for name, members in parts.items():
+        files[_partition_file(name)] = itertools.chain(
+            [f"# Quest Flowchart: {name}\n\n[All partitions](index.md)\n\n"],
+            join_lines(iter_mermaid_partition(quests, index, name, members, home, linked[name])))
+    return files
+
+
+def write_flowchart_partitions(files: dict, out_dir: Path = None) -> tuple:
+    """Write partition files, skipping unchanged ones and deleting stale ones.
+
+    Returns (written, unchanged, removed) counts.
+    """
+    out_dir = out_dir or FLOWCHART_DIR
+    written = unchanged = removed = 0
+    for name, chunks in files.items():
+        if write_atomic(out_dir / name, chunks, skip_unchanged=True):
+            written += 1
+        else:
+            unchanged += 1
+    for old in out_dir.glob("*.md"):
+        if old.name not in files:
+            old.unlink()
+            removed += 1
+    return written, unchanged, removed
+
 # ---------------------------------------------------------------------------
 # HTML report
 # ---------------------------------------------------------------------------
@@ -636,7 +1747,8 @@ function toggleCard(header) {
 }
 """
 
-def generate_html(quests: dict) -> str:
+def iter_html(quests: dict):
+    """Yield the HTML report in chunks, one quest card at a time."""
     today = date.today().isoformat()
     count = len(quests)
 
@@ -644,9 +1756,8 @@ def generate_html(quests: dict) -> str:
         quests.values(),
         key=lambda q: (0 if q.get("type") == "quest" else 1, q.get("name", ""))
     )
-    cards = "\n".join(_quest_card_html(q) for q in sorted_quests)
 
-    return (
+    yield (
         "<!DOCTYPE html>\n"
         '<html lang="en">\n'
         "<head>\n"
@@ -668,7 +1779,11 @@ def generate_html(quests: dict) -> str:
         '  <span class="stats" id="stats">' + str(count) + " loaded</span>\n"
         "</div>\n"
         '<div id="quest-list">\n'
-        + cards + "\n"
+    )
+    for i, q in enumerate(sorted_quests):
+        yield ("\n" if i else "") + _quest_card_html(q)
+    yield (
+        "\n"
         "</div>\n"
         '<div class="no-results" id="no-results">No results match your filter.</div>\n'
         "<script>" + _HTML_JS + "</script>\n"
@@ -676,6 +1791,10 @@ def generate_html(quests: dict) -> str:
         "</html>"
     )
 
+
+def generate_html(quests: dict) -> str:
+    return "".join(iter_html(quests))
+
 # ---------------------------------------------------------------------------
 # --npc display
 # ---------------------------------------------------------------------------
@@ -809,7 +1928,7 @@ def show_list(quests: dict):
 # Storyline — narrative Markdown doc (auto-generated from JSON)
 # ---------------------------------------------------------------------------
 
-def _topo_sort_quests(quests: dict) -> list:
+def _topo_sort_quests(quests: dict, index: QuestIndex) -> list:
     """Sort quests so that prerequisites come before dependents. Events last."""
     quest_list = [q for q in quests.values() if q.get("type") == "quest"]
     event_list = [q for q in quests.values() if q.get("type") != "quest"]
@@ -822,9 +1941,8 @@ def _topo_sort_quests(quests: dict) -> list:
             return depth[qid]
         d = 0
         for prereq_key in q.get("prerequisites", []):
-            for other in quests.values():
-                if other.get("complete_key") == prereq_key:
-                    d = max(d, get_depth(other) + 1)
+            for other_id in index.complete_key_quests.get(prereq_key, []):
+                d = max(d, get_depth(quests[other_id]) + 1)
         depth[qid] = d
         return d
 
@@ -856,7 +1974,7 @@ def _action_desc(a: dict) -> str:
     return act
 
 
-def _story_quest_steps(q: dict) -> list:
+def _story_quest_steps(qid: str, q: dict, index: QuestIndex) -> list:
     """Generate numbered step list from state_keys + on_dialog_end actions."""
     lines = []
     state_keys = q.get("state_keys", [])
@@ -879,8 +1997,8 @@ def _story_quest_steps(q: dict) -> list:
     for group in groups:
         if len(group) == 1:
             sk = group[0]
-            setter = find_setter(q, sk["key"])
-            is_choice = has_choice_for_key(q, sk["key"])
+            setter = index.find_setter(qid, sk["key"])
+            is_choice = index.has_choice_for_key(qid, sk["key"])
             npc_id = setter[0] if setter else "?"
             dialog_id = setter[1] if setter else "?"
 
@@ -919,7 +2037,7 @@ def _story_quest_steps(q: dict) -> list:
             pg_name = group[0].get("parallel_group", "parallel")
             lines.append(f'{step}. **{pg_name}** (any order):')
             for sk in group:
-                setter = find_setter(q, sk["key"])
+                setter = index.find_setter(qid, sk["key"])
                 npc_id = setter[0] if setter else "?"
                 dialog_id = setter[1] if setter else "?"
                 npc_data = q.get("npcs", {}).get(npc_id, {})
@@ -967,29 +2085,31 @@ def _story_dialog_table(q: dict) -> list:
     return lines
 
 
-def generate_story(quests: dict) -> str:
-    """Generate a narrative Markdown storyline document from quest JSONs."""
+def iter_story(quests: dict, index: QuestIndex = None):
+    """Yield the narrative Markdown storyline line by line, one quest at a time."""
+    index = index or QuestIndex(quests)
     today = date.today().isoformat()
-    sorted_qs = _topo_sort_quests(quests)
+    sorted_qs = _topo_sort_quests(quests, index)
 
     quest_list = [q for q in sorted_qs if q.get("type") == "quest"]
     event_list = [q for q in sorted_qs if q.get("type") != "quest"]
 
-    lines = [
+    yield from (
         "# Storyline Guide",
         "",
         f"**Auto-generated** on {today} by `tools/quest_tool.py --story --write`.",
         "Source of truth: `godot_port/data/quests/*.json`.",
         "Do not edit by hand.",
         "",
-    ]
+    )
 
     # Quests
     if quest_list:
-        lines.append("---")
-        lines.append("")
+        yield "---"
+        yield ""
 
         for q in quest_list:
+            lines = []
             name = q.get("name", q["id"])
             level = q.get("level", "?")
             secondary = q.get("secondary_levels", [])
@@ -1013,10 +2133,9 @@ def generate_story(quests: dict) -> str:
             if prereqs:
                 prereq_names = []
                 for pk in prereqs:
-                    for oq in quests.values():
-                        if oq.get("complete_key") == pk:
-                            prereq_names.append(oq.get("name", pk))
-                            break
+                    oq = index.quest_for_complete_key(pk)
+                    if oq is not None:
+                        prereq_names.append(oq.get("name", pk))
                     else:
                         prereq_names.append(f"`{pk}`")
                 lines.append(f"**Requires**: {', '.join(prereq_names)}")
@@ -1032,7 +2151,7 @@ def generate_story(quests: dict) -> str:
             # Steps
             lines.append("### Steps")
             lines.append("")
-            lines.extend(_story_quest_steps(q))
+            lines.extend(_story_quest_steps(q["id"], q, index))
             lines.append("")
 
             # Dialog reference table
@@ -1055,13 +2174,15 @@ def generate_story(quests: dict) -> str:
 
             lines.append("---")
             lines.append("")
+            yield from lines
 
     # Events
     if event_list:
-        lines.append("## Events")
-        lines.append("")
+        yield "## Events"
+        yield ""
 
         for q in event_list:
+            lines = []
             name = q.get("name", q["id"])
             level = q.get("level", "?")
             npcs = q.get("npcs", {})
@@ -1082,7 +2203,7 @@ def generate_story(quests: dict) -> str:
             # Steps (events usually have just one key)
             lines.append("#### Flow")
             lines.append("")
-            lines.extend(_story_quest_steps(q))
+            lines.extend(_story_quest_steps(q["id"], q, index))
             lines.append("")
 
             # State keys
@@ -1098,168 +2219,60 @@ def generate_story(quests: dict) -> str:
 
             lines.append("---")
             lines.append("")
+            yield from lines
 
-    return "\n".join(lines)
+
+
+def generate_story(quests: dict, index: QuestIndex = None) -> str:
+    """Generate a narrative Markdown storyline document from quest JSONs."""
+    return "\n".join(iter_story(quests, index))
 
 
 # ---------------------------------------------------------------------------
 # GDScript / .tres parsers (for dashboard)
 # ---------------------------------------------------------------------------
 
-def _parse_level_defs() -> list:
-    """Parse LevelDefs.gd const ALL array using regex."""
-    path = GODOT_DIR / "data" / "LevelDefs.gd"
+def _defs_consts(name: str) -> dict:
+    """Literal consts of data/<name>.gd ({} if missing or unreadable)."""
+    path = GODOT_DIR / "data" / f"{name}.gd"
     if not path.exists():
-        return []
+        return {}
     try:
-        text = path.read_text(encoding="utf-8")
-        levels = []
-        all_pos = text.find("const ALL")
-        if all_pos < 0:
-            return []
-        text_after = text[all_pos:]
-        for block_match in re.finditer(r'\{([^}]+)\}', text_after):
-            block = block_match.group(1)
-            level = {}
-            for kv in re.finditer(r'"(\w+)":\s*"([^"]*)"', block):
-                level[kv.group(1)] = kv.group(2)
-            vec = re.search(r'Vector2\(\s*([\d.]+)\s*,\s*([\d.]+)\s*\)', block)
-            if vec:
-                level["star_pos"] = [float(vec.group(1)), float(vec.group(2))]
-            conn = re.search(r'"connections":\s*\[([^\]]*)\]', block)
-            if conn:
-                level["connections"] = re.findall(r'"([^"]+)"', conn.group(1))
-            else:
-                level["connections"] = []
-            if "id" in level:
-                levels.append(level)
-        return levels
-    except Exception as e:
-        print(f"  WARN: failed to parse LevelDefs.gd: {e}", file=sys.stderr)
-        return []
+        return gdscript_consts.load_consts(path)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"  WARN: failed to parse {path.name}: {e}", file=sys.stderr)
+        return {}
+
+
+def _parse_level_defs() -> list:
+    """LevelDefs.ALL (star_pos is a Vector2, i.e. [x, y] in JSON)."""
+    levels = _defs_consts("LevelDefs").get("ALL", [])
+    return [lv for lv in levels if isinstance(lv, dict) and "id" in lv]
 
 
 def _parse_item_defs() -> dict:
-    """Parse ItemDefs.gd const ALL and SHOP using regex."""
-    path = GODOT_DIR / "data" / "ItemDefs.gd"
-    if not path.exists():
-        return {"all": {}, "shop": []}
-    try:
-        text = path.read_text(encoding="utf-8")
-        result = {"all": {}, "shop": []}
-        # Parse ALL dict: find top-level item keys
-        all_pos = text.find("const ALL")
-        shop_pos = text.find("const SHOP")
-        if all_pos >= 0:
-            all_text = text[all_pos:shop_pos] if shop_pos > all_pos else text[all_pos:]
-            for m in re.finditer(r'"(\w+)":\s*\{', all_text):
-                item_id = m.group(1)
-                start = m.end()
-                depth = 1
-                pos = start
-                while pos < len(all_text) and depth > 0:
-                    if all_text[pos] == '{':
-                        depth += 1
-                    elif all_text[pos] == '}':
-                        depth -= 1
-                    pos += 1
-                block = all_text[start:pos - 1]
-                item = {"id": item_id}
-                name_m = re.search(r'"name":\s*"([^"]*)"', block)
-                if name_m:
-                    item["name"] = name_m.group(1)
-                result["all"][item_id] = item
-        # Parse SHOP array
-        if shop_pos >= 0:
-            shop_text = text[shop_pos:]
-            for block_match in re.finditer(r'\{([^}]+)\}', shop_text):
-                block = block_match.group(1)
-                item = {}
-                for kv in re.finditer(r'"(\w+)":\s*"([^"]*)"', block):
-                    item[kv.group(1)] = kv.group(2)
-                cost_m = re.search(r'"cost":\s*(\d+)', block)
-                if cost_m:
-                    item["cost"] = int(cost_m.group(1))
-                if "id" in item:
-                    result["shop"].append(item)
-        return result
-    except Exception as e:
-        print(f"  WARN: failed to parse ItemDefs.gd: {e}", file=sys.stderr)
-        return {"all": {}, "shop": []}
+    """ItemDefs.ALL and ItemDefs.SHOP as {"all": {id: item}, "shop": [item]}."""
+    consts = _defs_consts("ItemDefs")
+    all_items = consts.get("ALL", {})
+    shop = consts.get("SHOP", [])
+    return {
+        "all": all_items if isinstance(all_items, dict) else {},
+        "shop": [item for item in shop if isinstance(item, dict) and "id" in item],
+    }
 
 
 def _parse_achievement_defs() -> list:
-    """Parse AchievementDefs.gd const ALL array using regex."""
-    path = GODOT_DIR / "data" / "AchievementDefs.gd"
-    if not path.exists():
-        return []
-    try:
-        text = path.read_text(encoding="utf-8")
-        achievements = []
-        all_pos = text.find("const ALL")
-        if all_pos < 0:
-            return []
-        text_after = text[all_pos:]
-        for block_match in re.finditer(r'\{([^}]+)\}', text_after):
-            block = block_match.group(1)
-            ach = {}
-            for kv in re.finditer(r'"(\w+)":\s*"([^"]*)"', block):
-                ach[kv.group(1)] = kv.group(2)
-            hidden_m = re.search(r'"hidden":\s*(true|false)', block)
-            if hidden_m:
-                ach["hidden"] = hidden_m.group(1) == "true"
-            if "id" in ach:
-                achievements.append(ach)
-        return achievements
-    except Exception as e:
-        print(f"  WARN: failed to parse AchievementDefs.gd: {e}", file=sys.stderr)
-        return []
-
-
-def _parse_dialog_tres_files() -> dict:
-    """Walk levels/*/dialogs/**/*.tres and extract dialog metadata + lines."""
-    dialogs = {}
-    levels_dir = GODOT_DIR / "levels"
-    if not levels_dir.exists():
-        return {}
-    for tres_path in sorted(levels_dir.rglob("dialogs/**/*.tres")):
-        try:
-            rel = tres_path.relative_to(levels_dir)
-            parts = rel.parts
-            if len(parts) < 3:
-                continue
-            level_id = parts[0]
-            dialog_parts = list(parts[2:])
-            dialog_parts[-1] = dialog_parts[-1].replace(".tres", "")
-            dialog_id = level_id + "/" + "/".join(dialog_parts)
-            text = tres_path.read_text(encoding="utf-8")
-            lines = []
-            for block in re.finditer(
-                r'\[sub_resource[^\]]*\](.*?)(?=\[(?:sub_resource|resource)\]|\Z)',
-                text, re.DOTALL
-            ):
-                block_text = block.group(1)
-                char_m = re.search(r'character_name\s*=\s*"([^"]*)"', block_text)
-                text_m = re.search(r'text\s*=\s*"([^"]*)"', block_text)
-                pitch_m = re.search(r'voice_pitch\s*=\s*([\d.]+)', block_text)
-                if char_m and text_m:
-                    lines.append({
-                        "character": char_m.group(1),
-                        "text": text_m.group(1),
-                        "voice_pitch": float(pitch_m.group(1)) if pitch_m else 1.0,
-                    })
-            desc_m = re.search(r'description\s*=\s*"([^"]*)"', text)
-            one_shot_m = re.search(r'one_shot\s*=\s*(true|false)', text)
-            dialogs[dialog_id] = {
-                "description": desc_m.group(1) if desc_m else "",
-                "one_shot": one_shot_m.group(1) == "true" if one_shot_m else True,
-                "line_count": len(lines),
-                "lines": lines,
-                "file": str(rel).replace("\\", "/"),
-            }
-        except Exception as e:
-            print(f"  WARN: failed to parse {tres_path.name}: {e}", file=sys.stderr)
-    return dialogs
+    """AchievementDefs.ALL."""
+    achievements = _defs_consts("AchievementDefs").get("ALL", [])
+    return [ach for ach in achievements if isinstance(ach, dict) and "id" in ach]
+
+
+def _parse_dialog_tres_files(use_cache: bool = True) -> dict:
+    """Parse levels/*/dialogs/**/*.tres into dialog metadata + lines.
+
+    Unchanged files (same mtime and size) come from DIALOG_CACHE_FILE.
+    """
+    return tres_parser.load_dialogs(GODOT_DIR / "levels", DIALOG_CACHE_FILE if use_cache else None)
 
 
 # ---------------------------------------------------------------------------
@@ -1306,14 +2319,14 @@ def _aggregate_npc_profiles(quests: dict) -> dict:
     return profiles
 
 
-def _build_graph_data(quests: dict) -> dict:
+def _build_graph_data(quests: dict, index: QuestIndex) -> dict:
     """Pre-compute Cytoscape.js nodes and edges for the quest dependency graph.
 
     Ranking strategy: walk each quest's ``state_keys`` array (already in
     chronological order) and assign explicit ``rank`` values to every node.
     For each key (or parallel group): the NPC that sets it gets ``rank_counter``,
-    the key itself gets ``rank_counter + 1``.  The JS layout reads these ranks
-    directly — no edge-based topological sort needed.
+    the key itself gets ``rank_counter + 1``.  ``layout_graph`` turns these
+    ranks into node positions — no edge-based topological sort needed.
     """
     nodes = []
     edges = []
@@ -1323,11 +2336,6 @@ def _build_graph_data(quests: dict) -> dict:
         """'level_jungle' → 'Jungle', 'level_town' → 'Town'"""
         return lvl.replace("level_", "").replace("_", " ").title()
 
-    npc_quests: dict[str, list[str]] = {}
-    for qid, q in quests.items():
-        for npc_id in q.get("npcs", {}):
-            npc_quests.setdefault(npc_id, []).append(qid)
-
     for qid, q in quests.items():
         # Quest container
         nodes.append({
@@ -1338,13 +2346,12 @@ def _build_graph_data(quests: dict) -> dict:
         all_keys = q.get("state_keys", [])
         npcs_data = q.get("npcs", {})
 
-        # ---- Pre-compute: which NPC sets which key ----
+        # ---- Pre-compute: which NPC sets which key (last setter wins) ----
         npc_sets_key: dict[str, str] = {}   # key -> npc_id
-        for npc_id, npc_data in npcs_data.items():
-            for _dialog_id, actions in npc_data.get("on_dialog_end", {}).items():
-                for a in iter_actions(actions):
-                    if a.get("action") == "set_key":
-                        npc_sets_key[a["key"]] = npc_id
+        for sk in all_keys:
+            for sq, npc_id, _dialog_id in index.setters.get(sk["key"], []):
+                if sq == qid:
+                    npc_sets_key[sk["key"]] = npc_id
 
         # ---- Assign explicit ranks from state_keys order ----
         # Walk state_keys: for each key (or parallel group), the NPC that
@@ -1452,16 +2459,15 @@ def _build_graph_data(quests: dict) -> dict:
                     if a.get("action") == "set_key":
                         keys_set[a["key"]] = dialog_id
 
-            appears_keys = set()
-            for rk in npc_data.get("appears_when", {}).get("all_true", []):
-                appears_keys.add(rk)
+            # Ordered dicts rather than sets so edge order (and the shard
+            # content hash) is the same on every run
+            appears_keys = dict.fromkeys(npc_data.get("appears_when", {}).get("all_true", []))
 
-            dialog_reads = set()
+            dialog_reads = {}
             for entry in npc_data.get("dialog_selection", []):
-                for req_key in entry.get("requires", {}):
-                    dialog_reads.add(req_key)
+                dialog_reads.update(dict.fromkeys(entry.get("requires", {})))
 
-            dialog_reads_external = dialog_reads - set(keys_set.keys())
+            dialog_reads_external = [k for k in dialog_reads if k not in keys_set]
 
             # Determine which level this NPC lives in from first dialog ID
             npc_level = quest_level
@@ -1544,7 +2550,7 @@ def _build_graph_data(quests: dict) -> dict:
 
                 for key in keys_set:
                     edges.append({"data": {"source": npc_node_id, "target": "key:" + key, "label": "sets", "etype": "sets"}})
-                for rk in (dialog_reads - set(keys_set.keys())):
+                for rk in dialog_reads_external:
                     edges.append({"data": {"source": "key:" + rk, "target": npc_node_id, "label": "requires", "etype": "condition"}})
                 for rk in appears_keys:
                     edges.append({"data": {"source": "key:" + rk, "target": npc_node_id, "label": "spawns", "etype": "appears"}})
@@ -1595,12 +2601,11 @@ def _build_graph_data(quests: dict) -> dict:
     # Cross-quest prerequisites
     for qid, q in quests.items():
         for prereq_key in q.get("prerequisites", []):
-            for other_id, other_q in quests.items():
-                if other_q.get("complete_key") == prereq_key:
-                    edges.append({"data": {"source": "key:" + prereq_key, "target": qid, "label": "prerequisite", "etype": "prerequisite"}})
+            for _other_id in index.complete_key_quests.get(prereq_key, []):
+                edges.append({"data": {"source": "key:" + prereq_key, "target": qid, "label": "prerequisite", "etype": "prerequisite"}})
 
     # Cross-quest NPC links
-    for npc_id, quest_ids in npc_quests.items():
+    for npc_id, quest_ids in index.npc_quests.items():
         if len(quest_ids) > 1:
             for i in range(len(quest_ids) - 1):
                 src_candidates = [quest_ids[i] + ":npc:" + npc_id + ":start", quest_ids[i] + ":npc:" + npc_id]
@@ -1613,33 +2618,158 @@ def _build_graph_data(quests: dict) -> dict:
     return {"nodes": nodes, "edges": edges}
 
 
-def _collect_game_data(quests: dict) -> dict:
+# ---------------------------------------------------------------------------
+# Dashboard — graph layout (baked into node positions)
+# ---------------------------------------------------------------------------
+
+GRAPH_NODE_SPACING = 170
+GRAPH_ROW_HEIGHT   = 70
+GRAPH_QUEST_GAP    = 120
+GRAPH_PADDING      = 80
+GRAPH_SWEEPS       = 8
+
+
+def _count_crossings(layers: list, down: dict) -> int:
+    """Edge crossings between every pair of adjacent layers."""
+    total = 0
+    for upper, lower in zip(layers, layers[1:]):
+        pos = {v: i for i, v in enumerate(lower)}
+        pairs = sorted((i, pos[w]) for i, v in enumerate(upper) for w in down.get(v, ()) if w in pos)
+        for a in range(len(pairs)):
+            pa = pairs[a]
+            for b in range(a + 1, len(pairs)):
+                if pairs[b][1] < pa[1] and pairs[b][0] > pa[0]:
+                    total += 1
+    return total
+
+
+def _barycenter_order(layers: list, up: dict, down: dict) -> list:
+    """Reorder nodes within each layer to reduce edge crossings.
+
+    Alternating down / up barycenter sweeps; the best ordering seen (fewest
+    crossings, earliest on ties) is returned, so the result never has more
+    crossings than the input.
+    """
+    best = [list(layer) for layer in layers]
+    best_crossings = _count_crossings(best, down)
+    current = [list(layer) for layer in layers]
+    for sweep in range(GRAPH_SWEEPS):
+        if best_crossings == 0:
+            break
+        downward = sweep % 2 == 0
+        indices = range(1, len(current)) if downward else range(len(current) - 2, -1, -1)
+        for li in indices:
+            fixed = current[li - 1] if downward else current[li + 1]
+            pos = {v: i for i, v in enumerate(fixed)}
+            neighbours = up if downward else down
+
+            def bary(item):
+                i, v = item
+                ps = [pos[u] for u in neighbours.get(v, ()) if u in pos]
+                return sum(ps) / len(ps) if ps else i
+            current[li] = [v for _i, v in sorted(enumerate(current[li]), key=bary)]
+        crossings = _count_crossings(current, down)
+        if crossings < best_crossings:
+            best, best_crossings = [list(layer) for layer in current], crossings
+    return best
+
+
+def layout_graph(graph: dict, columns: list):
+    """Assign ``position`` {x, y} to every graph node (Sugiyama-style).
+
+    Each quest is laid out in its own column, in ``columns`` order.  Layers
+    are the ``rank`` values ``_build_graph_data`` already assigned (y =
+    rank * row height, so travel nodes at half ranks sit between rows).
+    Edges between the quest's own nodes that skip layers get virtual nodes
+    in the layers they cross, then barycenter sweeps order every layer and
+    each layer is centred in a column as wide as the quest's widest layer.
+    Quest compound nodes get no position of their own unless they are
+    empty; Cytoscape sizes them around their children.
+    """
+    children: dict[str, list] = {}
+    for node in graph["nodes"]:
+        parent = node["data"].get("parent")
+        if parent:
+            children.setdefault(parent, []).append(node)
+    quest_nodes = {n["data"]["id"]: n for n in graph["nodes"] if not n["data"].get("parent")}
+    endpoints: dict[str, list] = {}
+    for edge in graph["edges"]:
+        endpoints.setdefault(edge["data"]["source"], []).append(edge["data"]["target"])
+
+    x0 = GRAPH_PADDING
+    for qid in columns:
+        members = children.get(qid, [])
+        if not members:
+            if qid in quest_nodes:
+                quest_nodes[qid]["position"] = {"x": x0, "y": GRAPH_PADDING}
+                x0 += GRAPH_NODE_SPACING + GRAPH_QUEST_GAP
+            continue
+        rank = {n["data"]["id"]: n["data"].get("rank", 0) or 0 for n in members}
+        levels = sorted(set(rank.values()))
+        level_index = {r: i for i, r in enumerate(levels)}
+        layer_of = {nid: level_index[r] for nid, r in rank.items()}
+        layers = [[] for _ in levels]
+        for nid in sorted(rank):                    # id order: same tie-break as before
+            layers[layer_of[nid]].append(nid)
+
+        # Edges inside the quest, top to bottom, long ones split by virtual nodes
+        up: dict[str, list] = {}
+        down: dict[str, list] = {}
+        virtual = 0
+        for src in sorted(rank):
+            for dst in endpoints.get(src, ()):
+                if dst not in layer_of or layer_of[dst] == layer_of[src]:
+                    continue
+                a, b = (src, dst) if layer_of[src] < layer_of[dst] else (dst, src)
+                prev = a
+                for li in range(layer_of[a] + 1, layer_of[b]):
+                    virtual += 1
+                    v = f"\0{virtual}"
+                    layers[li].append(v)
+                    down.setdefault(prev, []).append(v)
+                    up.setdefault(v, []).append(prev)
+                    prev = v
+                down.setdefault(prev, []).append(b)
+                up.setdefault(b, []).append(prev)
+
+        layers = _barycenter_order(layers, up, down)
+        real = [[v for v in layer if not v.startswith("\0")] for layer in layers]
+        width = max(len(layer) for layer in real) * GRAPH_NODE_SPACING
+        centre = x0 + (width - GRAPH_NODE_SPACING) / 2
+        by_id = {n["data"]["id"]: n for n in members}
+        for layer in real:
+            for i, nid in enumerate(layer):
+                x = centre + (i - (len(layer) - 1) / 2) * GRAPH_NODE_SPACING
+                by_id[nid]["position"] = {"x": round(x, 1),
+                                          "y": round(rank[nid] * GRAPH_ROW_HEIGHT + GRAPH_PADDING, 1)}
+        x0 += width + GRAPH_QUEST_GAP
+
+
+def _graph_columns(quests: dict, index: QuestIndex) -> list:
+    """Quest column order for the graph: prerequisites to the left, events last."""
+    qid_of = {id(q): qid for qid, q in quests.items()}
+    return [qid_of[id(q)] for q in _topo_sort_quests(quests, index)]
+
+
+def _collect_game_data(quests: dict, index: QuestIndex = None) -> dict:
     """Aggregate all game data sources into a single JSON-serializable dict."""
+    index = index or QuestIndex(quests)
     levels = _parse_level_defs()
     items = _parse_item_defs()
     achievements = _parse_achievement_defs()
     dialogs = _parse_dialog_tres_files()
     npc_profiles = _aggregate_npc_profiles(quests)
-    graph = _build_graph_data(quests)
+    graph = _build_graph_data(quests, index)
+    layout_graph(graph, _graph_columns(quests, index))
 
     state_keys = {}
     for qid, q in quests.items():
         for sk in q.get("state_keys", []):
             key = sk["key"]
-            read_by = []
-            for nid, nd in q.get("npcs", {}).items():
-                for entry in nd.get("dialog_selection", []):
-                    if key in entry.get("requires", {}):
-                        if nid not in read_by:
-                            read_by.append(nid)
-                aw = nd.get("appears_when", {})
-                if key in aw.get("all_true", []) + aw.get("all_false", []):
-                    if nid not in read_by:
-                        read_by.append(nid)
             state_keys[key] = {
                 "meaning": sk.get("meaning", ""),
                 "set_by": sk.get("set_by", ""),
-                "read_by": read_by,
+                "read_by": index.read_by(qid, key),
                 "quest_id": qid,
                 "quest_name": q.get("name", qid),
                 "parallel_group": sk.get("parallel_group", ""),
@@ -1835,8 +2965,6 @@ body{background:var(--bg-0);color:var(--text-2);font-family:-apple-system,BlinkM
 .funnel-bar-bg{flex:1;height:20px;background:var(--bg-2);border-radius:4px;overflow:hidden}
 .funnel-bar{height:100%;background:linear-gradient(90deg,var(--blue),var(--purple));border-radius:4px;transition:width 0.3s}
 .funnel-value{width:200px;color:var(--text-3);font-size:11px}
-.analytics-input{width:80px;background:var(--bg-2);color:var(--text-1);border:1px solid var(--border);padding:2px 6px;border-radius:4px}
-.analytics-select{background:var(--bg-2);color:var(--text-1);border:1px solid var(--border);padding:2px 6px;border-radius:4px}
 .analytics-btn{background:var(--blue);color:#fff;border:none;padding:4px 12px;border-radius:4px;cursor:pointer}
 .analytics-btn:hover{opacity:0.85}
 """
@@ -1846,11 +2974,48 @@ body{background:var(--bg-0);color:var(--text-2);font-family:-apple-system,BlinkM
 # ---------------------------------------------------------------------------
 
 _DASHBOARD_JS = r"""
-const D = window.GAME_DATA;
+/* Inline mode: window.GAME_DATA holds everything.
+   Sharded mode (docs/game-bible/): window.GAME_MANIFEST names content-hashed
+   JSON shards that are fetched the first time a view or quest card needs them. */
+const SHARDED = !window.GAME_DATA;
+const D = window.GAME_DATA || {meta: window.GAME_MANIFEST.meta};
 const VIEWS = {overview:renderOverview,graph:renderGraph,quests:renderQuests,npcs:renderNPCs,keys:renderKeys,world:renderWorld,analytics:renderAnalytics};
-let searchIndex = [];
+const VIEW_SHARDS = {overview:['quest_index','world'],graph:['graph','quest_index','keys','npcs'],quests:['quest_index','keys'],npcs:['npcs','keys'],keys:['keys'],world:['world'],analytics:[]};
 let currentView = 'overview';
 
+/* ---- Shard loading ---- */
+const _shardPromises = {};
+function mergeShard(data){
+  /* Objects merge one level deep so e.g. a quest summary is upgraded in place
+     by the full quest, and dialog metadata by the dialog's lines. */
+  for(const[k,v]of Object.entries(data)){
+    const cur=D[k];
+    if(cur&&typeof cur==='object'&&!Array.isArray(cur)&&v&&typeof v==='object'&&!Array.isArray(v)){
+      for(const[sk,sv]of Object.entries(v)){
+        if(cur[sk]&&typeof cur[sk]==='object'&&sv&&typeof sv==='object'&&!Array.isArray(sv))Object.assign(cur[sk],sv);
+        else cur[sk]=sv;
+      }
+    }else D[k]=v;
+  }
+}
+function loadShard(path){
+  if(!_shardPromises[path]){
+    _shardPromises[path]=fetch(path).then(function(r){
+      if(!r.ok)throw new Error(path+': HTTP '+r.status);
+      return r.json();
+    }).then(mergeShard);
+  }
+  return _shardPromises[path];
+}
+function need(names){
+  if(!SHARDED)return Promise.resolve();
+  return Promise.all(names.map(function(n){return loadShard(window.GAME_MANIFEST.shards[n])}));
+}
+function needQuest(qid){
+  if(!SHARDED)return Promise.resolve();
+  return need(['quest_index']).then(function(){return D.quests[qid]?loadShard(D.quests[qid].shard):null});
+}
+
 function esc(s){const d=document.createElement('div');d.textContent=String(s);return d.innerHTML}
 function keyChip(k,extra){
   extra=extra||'';
@@ -1866,37 +3031,88 @@ function navigate(view,sub){
   currentView=view;
   document.querySelectorAll('.nav-tab').forEach(function(t){t.classList.toggle('active',t.dataset.view===view)});
   const app=document.getElementById('app');
-  app.innerHTML='';
-  if(VIEWS[view])VIEWS[view](app,sub);
-}
-function toggleCard(el){el.closest('.card').classList.toggle('open')}
-
-/* ---- Search ---- */
-function buildSearchIndex(){
-  searchIndex=[];
-  for(const[qid,q]of Object.entries(D.quests)){
-    const parts=[q.name||'',qid,q.level||'',q.description||'',q.active_key||'',q.complete_key||''];
-    (q.state_keys||[]).forEach(function(sk){parts.push(sk.key,sk.meaning||'')});
-    for(const nid of Object.keys(q.npcs||{}))parts.push(nid);
-    const r=q.reward||{};if(r.item_id)parts.push(r.item_id);
-    searchIndex.push({type:'quest',id:qid,text:parts.join(' ').toLowerCase(),hash:'#quests/'+qid,title:q.name||qid,sub:q.type+' — '+(q.level||'')});
+  function render(){
+    if(currentView!==view)return;
+    app.innerHTML='';
+    if(VIEWS[view])VIEWS[view](app,sub);
   }
-  for(const[nid,np]of Object.entries(D.npc_profiles)){
-    searchIndex.push({type:'npc',id:nid,text:[nid,np.role,...np.quest_ids,...np.dialog_ids].join(' ').toLowerCase(),hash:'#npcs/'+nid,title:nid,sub:np.role});
+  if(!SHARDED){render();return}
+  app.innerHTML='<div class="muted" style="padding:40px;text-align:center">Loading&hellip;</div>';
+  need(VIEW_SHARDS[view]||[]).then(render).catch(function(e){
+    app.innerHTML='<div class="muted" style="padding:40px;text-align:center">Could not load data: '+esc(e.message)+'</div>';
+  });
+}
+function toggleCard(el){
+  const card=el.closest('.card');
+  card.classList.toggle('open');
+  if(card.classList.contains('open'))fillQuestBody(card);
+}
+function fillQuestBody(card){
+  const qid=card.dataset.qid;
+  if(!qid||card.dataset.filled)return;
+  card.dataset.filled='1';
+  const body=card.querySelector('.card-body');
+  needQuest(qid).then(function(){body.innerHTML=questBodyHtml(D.quests[qid])}).catch(function(e){
+    delete card.dataset.filled;
+    body.innerHTML='<div class="muted">Could not load quest: '+esc(e.message)+'</div>';
+  });
+}
+
+/* ---- Search ----
+   D.search_index is built by quest_tool.py: docs[id]=[type,id,hash,title,sub,text],
+   grams maps a trigram to delta-encoded doc IDs. Trigram postings narrow the
+   candidates; a doc matches when its text contains every query word. */
+const _postings = {};
+function postings(gram){
+  if(_postings[gram])return _postings[gram];
+  const gaps=D.search_index.grams[gram]||[];
+  const ids=new Array(gaps.length);
+  let acc=0;
+  for(let i=0;i<gaps.length;i++){acc+=gaps[i];ids[i]=acc}
+  return(_postings[gram]=ids);
+}
+function intersect(a,b){
+  const out=[];
+  let i=0,j=0;
+  while(i<a.length&&j<b.length){
+    if(a[i]===b[j]){out.push(a[i]);i++;j++}
+    else if(a[i]<b[j])i++;
+    else j++;
   }
-  for(const[k,info]of Object.entries(D.state_keys)){
-    searchIndex.push({type:'key',id:k,text:[k,info.meaning,info.set_by,...info.read_by].join(' ').toLowerCase(),hash:'#keys/'+k,title:k,sub:info.meaning});
+  return out;
+}
+function searchDocs(q,limit){
+  const words=q.match(/[\p{L}\p{N}_]+/gu)||[];
+  if(!words.length)return [];
+  const docs=D.search_index.docs;
+  const lists=[];
+  words.forEach(function(w){
+    for(let i=0;i+3<=w.length;i++)lists.push(postings(w.slice(i,i+3)));
+  });
+  let ids=null;  // null = no trigrams (only 1-2 char words): scan every doc
+  if(lists.length){
+    lists.sort(function(a,b){return a.length-b.length});
+    ids=lists[0];
+    for(let i=1;i<lists.length&&ids.length;i++)ids=intersect(ids,lists[i]);
   }
-  for(const[did,dl]of Object.entries(D.dialogs)){
-    const lt=(dl.lines||[]).map(function(l){return l.text}).join(' ');
-    searchIndex.push({type:'dialog',id:did,text:[did,dl.description||'',lt].join(' ').toLowerCase(),hash:'#quests',title:did,sub:dl.description||''});
+  const n=ids?ids.length:docs.length;
+  const out=[];
+  for(let k=0;k<n&&out.length<limit;k++){
+    const d=docs[ids?ids[k]:k];
+    if(words.every(function(w){return d[5].indexOf(w)!==-1}))
+      out.push({type:d[0],id:d[1],hash:d[2],title:d[3],sub:d[4]});
   }
+  return out;
 }
 function onSearch(e){
+  if(SHARDED&&!D.search_index){
+    need(['search']).then(function(){onSearch(e)});
+    return;
+  }
   const q=e.target.value.toLowerCase().trim();
   const box=document.getElementById('search-results');
   if(!q){box.classList.remove('open');return}
-  const matches=searchIndex.filter(function(r){return r.text.indexOf(q)!==-1}).slice(0,15);
+  const matches=searchDocs(q,15);
   if(!matches.length){box.classList.remove('open');return}
   const groups={};
   matches.forEach(function(m){if(!groups[m.type])groups[m.type]=[];groups[m.type].push(m)});
@@ -1993,6 +3209,8 @@ function renderGraph(app,sub){
     return;
   }
   const allElements=D.graph.nodes.concat(D.graph.edges);
+  const PRESET={};
+  D.graph.nodes.forEach(function(n){if(n.position)PRESET[n.data.id]=n.position});
   const cy=cytoscape({
     container:document.getElementById('cy'),
     elements:allElements,
@@ -2018,7 +3236,7 @@ function renderGraph(app,sub){
       {selector:'.dimmed',style:{'opacity':0.15}},
       {selector:':selected',style:{'border-width':3,'border-color':'#3b82f6'}},
     ],
-    layout:{name:'preset'},
+    layout:{name:'preset',padding:40},
     wheelSensitivity:0.3,
   });
   function runDagre(eles){
@@ -2032,60 +3250,11 @@ function renderGraph(app,sub){
     target.layout({name:'cose',animate:true,animationDuration:300,nodeRepulsion:function(){return 10000},idealEdgeLength:function(){return 90}}).run();
   }
   function runTopo(){
-    /* Chronological layout: reads pre-computed 'rank' from node data
-       (assigned by Python from the state_keys array order).
-       Positions: Y = rank * rowHeight, X = per-quest column. */
-    var childNodes=cy.nodes().filter(function(n){return !!n.data('parent')});
-    /* Group by parent quest */
-    var questChildren={};
-    childNodes.forEach(function(n){
-      var p=n.data('parent');
-      if(!questChildren[p])questChildren[p]=[];
-      questChildren[p].push(n);
-    });
-    var qkeys=Object.keys(questChildren);
-    /* Sort children by rank, then id for stability */
-    for(var qi=0;qi<qkeys.length;qi++){
-      questChildren[qkeys[qi]].sort(function(a,b){
-        var ra=a.data('rank')||0,rb=b.data('rank')||0;
-        return ra!==rb?ra-rb:(a.id()<b.id()?-1:1);
-      });
-    }
-    /* Compute quest column widths */
-    var nodeSpacing=170;var rowHeight=70;var questGap=120;var padding=80;
-    var questWidths=[];
-    for(var qi=0;qi<qkeys.length;qi++){
-      var children=questChildren[qkeys[qi]];
-      var rankCount={};
-      for(var k=0;k<children.length;k++){
-        var r=children[k].data('rank')||0;
-        rankCount[r]=(rankCount[r]||0)+1;
-      }
-      var maxAtRank=0;
-      var rkeys=Object.keys(rankCount);
-      for(var k=0;k<rkeys.length;k++){if(rankCount[rkeys[k]]>maxAtRank)maxAtRank=rankCount[rkeys[k]]}
-      questWidths.push(Math.max(maxAtRank,1)*nodeSpacing);
-    }
-    /* Position nodes */
-    var cumX=padding;
-    cy.startBatch();
-    for(var ci=0;ci<qkeys.length;ci++){
-      var children=questChildren[qkeys[ci]];
-      var rankSlot={};
-      for(var k=0;k<children.length;k++){
-        var r=children[k].data('rank')||0;
-        if(rankSlot[r]===undefined)rankSlot[r]=0;
-        var xOff=rankSlot[r]*nodeSpacing;
-        rankSlot[r]++;
-        children[k].position({x:cumX+xOff,y:r*rowHeight+padding});
-      }
-      cumX+=questWidths[ci]+questGap;
-    }
-    cy.endBatch();
-    cy.fit(null,40);
-    console.log('[Topo] Layout applied, '+childNodes.length+' nodes, rank-based');
+    /* Chronological layout: positions are computed by Python
+       (layout_graph: rank layers, barycenter ordering, one column per
+       quest) and baked into each node, so this is a preset layout. */
+    cy.layout({name:'preset',positions:PRESET,fit:true,padding:40}).run();
   }
-  try{runTopo();console.log('[Graph] Using topo layout')}catch(e){console.error('[Graph] Topo failed:',e);try{runDagre()}catch(e2){runCose()}}
   /* Quest filter */
   let activeFilter='all';
   document.querySelectorAll('.filter-btn').forEach(function(btn){
@@ -2169,96 +3338,103 @@ function renderQuests(app,sub){
   h+='<div class="card-grid" id="quest-cards">';
   const sorted=Object.values(D.quests).sort(function(a,b){return(a.type==='quest'?0:1)-(b.type==='quest'?0:1)||a.name.localeCompare(b.name)});
   sorted.forEach(function(q){
-    const qid=q.id;const qtype=q.type||'quest';const open=sub===qid?' open':'';
-    h+='<div class="card card-'+qtype+open+'" data-qtype="'+qtype+'" id="q-'+esc(qid)+'">';
+    const qid=q.id;const qtype=q.type||'quest';
+    h+='<div class="card card-'+qtype+'" data-qtype="'+qtype+'" data-qid="'+esc(qid)+'" id="q-'+esc(qid)+'">';
     h+='<div class="card-hdr" onclick="toggleCard(this)">';
     h+='<div><div class="card-name">'+esc(q.name||qid)+'</div><div class="card-id">'+esc(qid)+'</div></div>';
     h+='<div class="card-badges"><span class="badge badge-'+qtype+'">'+qtype+'</span><span class="chevron">&#9654;</span></div></div>';
-    h+='<div class="card-body">';
-    // Basics
-    h+='<div class="sec"><div class="sec-title">Basics</div>';
-    h+='<div class="row"><span class="row-label">Level</span><span class="row-value">'+esc(q.level||'?')+'</span></div>';
-    if(q.secondary_levels&&q.secondary_levels.length)h+='<div class="row"><span class="row-label">Also</span><span class="row-value">'+esc(q.secondary_levels.join(', '))+'</span></div>';
-    const reward=q.reward&&q.reward.item_id?'<span class="reward-item">'+esc(q.reward.item_id)+'</span>':'<span class="muted">none</span>';
-    h+='<div class="row"><span class="row-label">Reward</span><span class="row-value">'+reward+'</span></div>';
-    if(q.prerequisites&&q.prerequisites.length)h+='<div class="row"><span class="row-label">Prereqs</span><span class="row-value">'+q.prerequisites.map(function(p){return keyChip(p)}).join('')+'</span></div>';
+    h+='<div class="card-body"></div></div>';
+  });
+  h+='</div>';
+  app.innerHTML=h;
+  if(sub){
+    const el=document.getElementById('q-'+sub);
+    if(el){el.classList.add('open');fillQuestBody(el);el.scrollIntoView({behavior:'smooth',block:'center'})}
+  }
+}
+function questBodyHtml(q){
+  let h='';
+  // Basics
+  h+='<div class="sec"><div class="sec-title">Basics</div>';
+  h+='<div class="row"><span class="row-label">Level</span><span class="row-value">'+esc(q.level||'?')+'</span></div>';
+  if(q.secondary_levels&&q.secondary_levels.length)h+='<div class="row"><span class="row-label">Also</span><span class="row-value">'+esc(q.secondary_levels.join(', '))+'</span></div>';
+  const reward=q.reward&&q.reward.item_id?'<span class="reward-item">'+esc(q.reward.item_id)+'</span>':'<span class="muted">none</span>';
+  h+='<div class="row"><span class="row-label">Reward</span><span class="row-value">'+reward+'</span></div>';
+  if(q.prerequisites&&q.prerequisites.length)h+='<div class="row"><span class="row-label">Prereqs</span><span class="row-value">'+q.prerequisites.map(function(p){return keyChip(p)}).join('')+'</span></div>';
+  h+='</div>';
+  // Quest keys
+  if(q.active_key||q.complete_key){
+    h+='<div class="sec"><div class="sec-title">Quest Keys</div>';
+    if(q.active_key)h+='<div class="row"><span class="row-label">Active</span><span class="row-value">'+keyChip(q.active_key,'kc-active')+'</span></div>';
+    if(q.complete_key)h+='<div class="row"><span class="row-label">Complete</span><span class="row-value">'+keyChip(q.complete_key,'kc-complete')+'</span></div>';
     h+='</div>';
-    // Quest keys
-    if(q.active_key||q.complete_key){
-      h+='<div class="sec"><div class="sec-title">Quest Keys</div>';
-      if(q.active_key)h+='<div class="row"><span class="row-label">Active</span><span class="row-value">'+keyChip(q.active_key,'kc-active')+'</span></div>';
-      if(q.complete_key)h+='<div class="row"><span class="row-label">Complete</span><span class="row-value">'+keyChip(q.complete_key,'kc-complete')+'</span></div>';
-      h+='</div>';
-    }
-    // NPCs
-    const npcs=q.npcs||{};
-    if(Object.keys(npcs).length){
-      h+='<div class="sec"><div class="sec-title">NPCs ('+Object.keys(npcs).length+')</div>';
-      for(const[nid,nd]of Object.entries(npcs)){
-        h+='<div class="npc-block"><div class="npc-hdr">'+npcLink(nid)+' <span class="npc-role">'+esc(nd.role||'')+'</span></div>';
-        // Dialog selection
-        if(nd.dialog_selection&&nd.dialog_selection.length){
-          h+='<div class="sub-t">dialog selection</div>';
-          nd.dialog_selection.forEach(function(entry){
-            const req=entry.requires||{};const did=entry.dialog||'?';
-            if(Object.keys(req).length){
-              const conds=Object.entries(req).map(function(e){return e[0]+'='+e[1]}).join(', ');
-              h+='<div class="sel-row"><span class="sel-cond">['+esc(conds)+']</span> &rarr; <span class="act-dialog">'+esc(did)+'</span></div>';
-            }else{
-              h+='<div class="sel-row"><span class="sel-cond">[default]</span> &rarr; <span class="act-dialog">'+esc(did)+'</span></div>';
-            }
-          });
-        }
-        // On dialog end
-        const onEnd=nd.on_dialog_end||{};
-        if(Object.keys(onEnd).length){
-          h+='<div class="sub-t">on dialog end</div>';
-          for(const[did,actions]of Object.entries(onEnd)){
-            h+='<div class="on-end"><div class="on-end-trigger">after <span class="act-dialog">'+esc(did)+'</span>:</div>';
-            actions.forEach(function(a){h+=renderAction(a)});
-            h+='</div>';
+  }
+  // NPCs
+  const npcs=q.npcs||{};
+  if(Object.keys(npcs).length){
+    h+='<div class="sec"><div class="sec-title">NPCs ('+Object.keys(npcs).length+')</div>';
+    for(const[nid,nd]of Object.entries(npcs)){
+      h+='<div class="npc-block"><div class="npc-hdr">'+npcLink(nid)+' <span class="npc-role">'+esc(nd.role||'')+'</span></div>';
+      // Dialog selection
+      if(nd.dialog_selection&&nd.dialog_selection.length){
+        h+='<div class="sub-t">dialog selection</div>';
+        nd.dialog_selection.forEach(function(entry){
+          const req=entry.requires||{};const did=entry.dialog||'?';
+          if(Object.keys(req).length){
+            const conds=Object.entries(req).map(function(e){return e[0]+'='+e[1]}).join(', ');
+            h+='<div class="sel-row"><span class="sel-cond">['+esc(conds)+']</span> &rarr; <span class="act-dialog">'+esc(did)+'</span></div>';
+          }else{
+            h+='<div class="sel-row"><span class="sel-cond">[default]</span> &rarr; <span class="act-dialog">'+esc(did)+'</span></div>';
           }
+        });
+      }
+      // On dialog end
+      const onEnd=nd.on_dialog_end||{};
+      if(Object.keys(onEnd).length){
+        h+='<div class="sub-t">on dialog end</div>';
+        for(const[did,actions]of Object.entries(onEnd)){
+          h+='<div class="on-end"><div class="on-end-trigger">after <span class="act-dialog">'+esc(did)+'</span>:</div>';
+          actions.forEach(function(a){h+=renderAction(a)});
+          h+='</div>';
         }
-        // Dialog transcripts
-        const allDialogIds=[];
-        (nd.dialog_selection||[]).forEach(function(e){if(e.dialog&&allDialogIds.indexOf(e.dialog)===-1)allDialogIds.push(e.dialog)});
-        Object.keys(onEnd).forEach(function(d){if(allDialogIds.indexOf(d)===-1)allDialogIds.push(d)});
-        const hasTranscripts=allDialogIds.some(function(did){return D.dialogs[did]&&D.dialogs[did].lines.length>0});
-        if(hasTranscripts){
-          h+='<div class="sub-t">dialog transcripts</div>';
-          allDialogIds.forEach(function(did){
-            const dl=D.dialogs[did];
-            if(!dl||!dl.lines.length)return;
-            h+='<div style="margin-bottom:6px"><span class="act-dialog" style="font-size:11px">'+esc(did)+'</span>';
-            if(dl.description)h+=' <span class="muted" style="font-size:10px">&mdash; '+esc(dl.description)+'</span>';
-            h+='<div class="transcript">';
-            dl.lines.forEach(function(line){
-              h+='<div class="dl-line"><div class="dl-char">'+esc(line.character)+'</div><div class="dl-text">'+esc(line.text)+'</div></div>';
-            });
-            h+='</div></div>';
+      }
+      // Dialog transcripts
+      const allDialogIds=[];
+      (nd.dialog_selection||[]).forEach(function(e){if(e.dialog&&allDialogIds.indexOf(e.dialog)===-1)allDialogIds.push(e.dialog)});
+      Object.keys(onEnd).forEach(function(d){if(allDialogIds.indexOf(d)===-1)allDialogIds.push(d)});
+      const dialogs=D.dialogs||{};
+      const hasTranscripts=allDialogIds.some(function(did){return dialogs[did]&&(dialogs[did].lines||[]).length>0});
+      if(hasTranscripts){
+        h+='<div class="sub-t">dialog transcripts</div>';
+        allDialogIds.forEach(function(did){
+          const dl=dialogs[did];
+          if(!dl||!(dl.lines||[]).length)return;
+          h+='<div style="margin-bottom:6px"><span class="act-dialog" style="font-size:11px">'+esc(did)+'</span>';
+          if(dl.description)h+=' <span class="muted" style="font-size:10px">&mdash; '+esc(dl.description)+'</span>';
+          h+='<div class="transcript">';
+          dl.lines.forEach(function(line){
+            h+='<div class="dl-line"><div class="dl-char">'+esc(line.character)+'</div><div class="dl-text">'+esc(line.text)+'</div></div>';
           });
-        }
-        h+='</div>';
+          h+='</div></div>';
+        });
       }
       h+='</div>';
     }
-    // State keys
-    const sks=q.state_keys||[];
-    if(sks.length){
-      h+='<div class="sec"><div class="sec-title">State Keys ('+sks.length+')</div>';
-      sks.forEach(function(sk){
-        const pg=sk.parallel_group?' <span class="muted">[parallel: '+esc(sk.parallel_group)+']</span>':'';
-        h+='<div style="margin-bottom:6px"><div>'+keyChip(sk.key)+pg+'</div>';
-        h+='<div style="color:var(--text-3);font-size:11px;padding-left:8px;margin-top:2px">'+esc(sk.meaning||'')+'</div>';
-        h+='<div style="color:var(--text-3);font-size:10px;padding-left:8px">'+esc(sk.set_by||'')+'</div></div>';
-      });
-      h+='</div>';
-    }
-    h+='</div></div>';
-  });
-  h+='</div>';
-  app.innerHTML=h;
-  if(sub){const el=document.getElementById('q-'+sub);if(el){el.classList.add('open');el.scrollIntoView({behavior:'smooth',block:'center'})}}
+    h+='</div>';
+  }
+  // State keys
+  const sks=q.state_keys||[];
+  if(sks.length){
+    h+='<div class="sec"><div class="sec-title">State Keys ('+sks.length+')</div>';
+    sks.forEach(function(sk){
+      const pg=sk.parallel_group?' <span class="muted">[parallel: '+esc(sk.parallel_group)+']</span>':'';
+      h+='<div style="margin-bottom:6px"><div>'+keyChip(sk.key)+pg+'</div>';
+      h+='<div style="color:var(--text-3);font-size:11px;padding-left:8px;margin-top:2px">'+esc(sk.meaning||'')+'</div>';
+      h+='<div style="color:var(--text-3);font-size:10px;padding-left:8px">'+esc(sk.set_by||'')+'</div></div>';
+    });
+    h+='</div>';
+  }
+  return h;
 }
 window.filterQuests=function(btn){
   document.querySelectorAll('.filter-btn').forEach(function(b){b.classList.remove('active')});
@@ -2295,7 +3471,7 @@ function renderNPCs(app,sub){
     if(np.dialog_ids.length){
       h+='<div class="sec"><div class="sec-title">All Dialogs</div>';
       np.dialog_ids.forEach(function(did){
-        const dl=D.dialogs[did];
+        const dl=(D.dialogs||{})[did];
         h+='<div style="margin-bottom:4px"><span class="act-dialog" style="font-size:12px">'+esc(did)+'</span>';
         if(dl){
           h+=' <span class="muted" style="font-size:10px">('+dl.line_count+' lines'+(dl.one_shot?', one-shot':'')+') '+esc(dl.description||'')+'</span>';
@@ -2411,198 +3587,172 @@ function renderWorld(app){
   app.innerHTML=h;
 }
 
-/* ---- Analytics ---- */
-let _sb=null;
-let _sbUrl='';
-let _sbKey='';
-
-function _initSupabase(){
-  if(_sb)return _sb;
-  if(!_sbUrl){
-    _sbUrl=localStorage.getItem('sb_url')||'';
-    _sbKey=localStorage.getItem('sb_key')||'';
-  }
-  if(!_sbUrl){
-    _sbUrl=prompt('Supabase URL (e.g. https://xxxx.supabase.co):');
-    _sbKey=prompt('Supabase anon key:');
-    if(!_sbUrl||!_sbKey){_sbUrl='';_sbKey='';return null}
-    localStorage.setItem('sb_url',_sbUrl);
-    localStorage.setItem('sb_key',_sbKey);
-  }
-  _sb=window.supabase.createClient(_sbUrl,_sbKey);
-  return _sb;
+/* ---- Analytics ----
+   Renders the rollup written by tools/telemetry_tool.py, which aggregates every
+   exported event offline instead of the browser pulling raw rows from Supabase.
+   The rollup is kept out of docs/ (published outside the password gate): --serve
+   serves it beside the page, otherwise open it from disk. */
+const ROLLUP_URL=SHARDED?'../telemetry-rollup.json':'telemetry-rollup.json';
+let _rollup=null;
+
+function _loadRollup(){
+  document.getElementById('ana-status').textContent='Loading...';
+  fetch(ROLLUP_URL,{cache:'no-cache'}).then(function(r){
+    if(!r.ok)throw new Error('HTTP '+r.status);
+    return r.json();
+  }).then(_showRollup).catch(function(e){
+    document.getElementById('ana-status').textContent='No rollup at '+ROLLUP_URL+' ('+e.message+') — open one from disk instead.';
+  });
 }
 
-async function _fetchEvents(ver,days){
-  const sb=_initSupabase();
-  if(!sb)return null;
-  let q=sb.from('events').select('*');
-  if(ver)q=q.eq('game_version',ver);
-  if(days>0){
-    const since=new Date(Date.now()-days*86400000).toISOString();
-    q=q.gte('created_at',since);
-  }
-  q=q.order('created_at',{ascending:true}).limit(10000);
-  const{data,error}=await q;
-  if(error){console.error('Analytics error:',error);return null}
-  return data;
+function _showRollup(r){
+  _rollup=r;
+  var m=r.meta||{};
+  var span=m.first_event?' · '+m.first_event.slice(0,10)+' → '+(m.last_event||'').slice(0,10):'';
+  document.getElementById('ana-status').textContent=m.rows+' events'+span+(m.version?' · v'+m.version:'')+' · generated '+(m.generated||'').slice(0,16).replace('T',' ');
+  _renderCharts(r);
 }
 
 function renderAnalytics(app){
   app.innerHTML='<div class="analytics-container">'
     +'<h2 style="color:var(--text-1);margin-bottom:16px">Analytics Dashboard</h2>'
     +'<div class="analytics-controls">'
-    +'<label style="color:var(--text-2)">Version: <input type="text" id="ana-ver" placeholder="all" class="analytics-input" /></label> '
-    +'<label style="color:var(--text-2)">Days back: <select id="ana-days" class="analytics-select">'
-    +'<option value="7">7</option><option value="30" selected>30</option><option value="90">90</option><option value="0">All</option></select></label> '
-    +'<button id="ana-fetch" class="analytics-btn">Load Data</button>'
-    +'<button id="ana-reset-creds" class="analytics-btn" style="background:var(--bg-3)">Reset Credentials</button>'
+    +'<button id="ana-fetch" class="analytics-btn">Reload Rollup</button>'
+    +'<label class="analytics-btn" style="background:var(--bg-3)">Open File...<input type="file" id="ana-file" accept=".json,application/json" style="display:none" /></label>'
     +'<span id="ana-status" style="color:var(--text-3);margin-left:12px"></span>'
     +'</div>'
-    +'<div id="ana-results"><div class="muted">Click "Load Data" to fetch analytics from Supabase.</div></div>'
+    +'<div id="ana-results"><div class="muted">Build a rollup with <code>python tools/telemetry_tool.py &lt;export&gt; --write</code>.</div></div>'
     +'</div>';
 
-  document.getElementById('ana-fetch').onclick=async function(){
-    var ver=document.getElementById('ana-ver').value.trim()||null;
-    var days=parseInt(document.getElementById('ana-days').value);
-    document.getElementById('ana-status').textContent='Loading...';
-    var data=await _fetchEvents(ver,days);
-    if(!data){document.getElementById('ana-status').textContent='Failed — check credentials.';return}
-    document.getElementById('ana-status').textContent=data.length+' events loaded.';
-    _renderCharts(data);
+  document.getElementById('ana-fetch').onclick=_loadRollup;
+  document.getElementById('ana-file').onchange=function(){
+    var f=this.files[0];
+    if(!f)return;
+    f.text().then(function(t){_showRollup(JSON.parse(t))}).catch(function(e){
+      document.getElementById('ana-status').textContent='Could not read '+f.name+': '+e.message;
+    });
   };
+  if(_rollup)_showRollup(_rollup);
+  else _loadRollup();
+}
 
-  document.getElementById('ana-reset-creds').onclick=function(){
-    localStorage.removeItem('sb_url');
-    localStorage.removeItem('sb_key');
-    _sb=null;_sbUrl='';_sbKey='';
-    document.getElementById('ana-status').textContent='Credentials cleared.';
-  };
+function _statCard(value,label,color){
+  return '<div class="stat-card"><div class="stat-value"'+(color?' style="color:'+color+'"':'')+'>'+value+'</div><div class="stat-label">'+label+'</div></div>';
 }
 
-function _parseEventData(e){
-  if(!e.event_data)return{};
-  if(typeof e.event_data==='string'){try{return JSON.parse(e.event_data)}catch(x){return{}}}
-  return e.event_data;
+function _funnelRow(label,value,max,text){
+  var barW=Math.max(Math.round(value/(max||1)*100),2);
+  return '<div class="funnel-row"><span class="funnel-label">'+esc(label)+'</span>'
+    +'<div class="funnel-bar-bg"><div class="funnel-bar" style="width:'+barW+'%"></div></div>'
+    +'<span class="funnel-value">'+text+'</span></div>';
 }
 
-function _renderCharts(events){
+function _duration(s){
+  if(s<60)return Math.round(s)+'s';
+  if(s<3600)return Math.round(s/60)+'m';
+  return (s/3600).toFixed(1)+'h';
+}
+
+function _renderCharts(r){
   var el=document.getElementById('ana-results');
-  if(!events.length){el.innerHTML='<div class="muted">No events found.</div>';return}
-
-  var sessions=new Set(events.map(function(e){return e.session_id}));
-  var players=new Set(events.map(function(e){return e.player_id}));
-  var byType={};
-  events.forEach(function(e){
-    if(!byType[e.event_name])byType[e.event_name]=[];
-    byType[e.event_name].push(e);
-  });
+  var t=r.totals||{};
+  if(!t.events){el.innerHTML='<div class="muted">No events found.</div>';return}
 
   var h='';
 
   /* Engagement */
   h+='<div class="analytics-section"><h3>Engagement</h3><div class="stat-grid">';
-  h+='<div class="stat-card"><div class="stat-value">'+players.size+'</div><div class="stat-label">Unique Players</div></div>';
-  h+='<div class="stat-card"><div class="stat-value">'+sessions.size+'</div><div class="stat-label">Sessions</div></div>';
-  h+='<div class="stat-card"><div class="stat-value">'+events.length+'</div><div class="stat-label">Total Events</div></div>';
-  var versions={};
-  events.forEach(function(e){versions[e.game_version]=(versions[e.game_version]||0)+1});
-  Object.keys(versions).forEach(function(v){
-    h+='<div class="stat-card"><div class="stat-value">'+versions[v]+'</div><div class="stat-label">v'+esc(v)+'</div></div>';
-  });
+  h+=_statCard(t.players,'Unique Players');
+  h+=_statCard(t.sessions,'Sessions');
+  h+=_statCard(t.events,'Total Events');
+  Object.keys(t.versions||{}).forEach(function(v){h+=_statCard(t.versions[v],'v'+esc(v))});
   h+='</div></div>';
 
   /* Session funnel */
-  var funnelSteps=['session_start','level_started','player_died','level_completed',
-    'quest_progressed','boss_fight_started','boss_fight_ended','achievement_unlocked'];
-  var funnelCounts=funnelSteps.map(function(s){
-    var evts=byType[s]||[];
-    return{step:s,sessions:new Set(evts.map(function(e){return e.session_id})).size,total:evts.length};
-  });
-  var maxS=funnelCounts[0]?funnelCounts[0].sessions:1;
-  if(maxS<1)maxS=1;
+  var funnel=r.funnel||[];
+  var maxS=funnel.length?funnel[0].sessions:1;
   h+='<div class="analytics-section"><h3>Session Funnel</h3><div class="funnel">';
-  funnelCounts.forEach(function(f){
-    var pct=Math.round(f.sessions/maxS*100);
-    var barW=Math.max(pct,2);
-    h+='<div class="funnel-row">';
-    h+='<span class="funnel-label">'+esc(f.step)+'</span>';
-    h+='<div class="funnel-bar-bg"><div class="funnel-bar" style="width:'+barW+'%"></div></div>';
-    h+='<span class="funnel-value">'+f.sessions+' sessions ('+f.total+' events)</span>';
-    h+='</div>';
-  });
+  funnel.forEach(function(f){h+=_funnelRow(f.step,f.sessions,maxS,f.sessions+' sessions ('+f.events+' events)')});
   h+='</div></div>';
 
+  /* Session lengths */
+  var s=r.sessions||{};
+  if(s.timed){
+    h+='<div class="analytics-section"><h3>Session Length</h3><div class="stat-grid">';
+    h+=_statCard(_duration(s.p50_s),'Median');
+    h+=_statCard(_duration(s.p90_s),'90th Percentile');
+    h+=_statCard(_duration(s.mean_s),'Mean');
+    h+=_statCard(_duration(s.max_s),'Longest');
+    h+='</div><div class="funnel">';
+    var maxH=Math.max.apply(null,s.histogram.map(function(b){return b[1]}));
+    s.histogram.forEach(function(b){h+=_funnelRow(b[0],b[1],maxH,b[1]+' sessions')});
+    h+='</div></div>';
+  }
+
   /* Deaths by level */
-  var deathsByLvl={};
-  (byType['player_died']||[]).forEach(function(e){
-    var lid=e.level_id||'unknown';
-    deathsByLvl[lid]=(deathsByLvl[lid]||0)+1;
-  });
+  var levels=r.levels||{};
+  var lids=Object.keys(levels);
   h+='<div class="analytics-section"><h3>Deaths by Level</h3><div class="stat-grid">';
-  Object.keys(deathsByLvl).sort(function(a,b){return deathsByLvl[b]-deathsByLvl[a]}).forEach(function(lvl){
-    h+='<div class="stat-card"><div class="stat-value" style="color:var(--red)">'+deathsByLvl[lvl]+'</div><div class="stat-label">'+esc(lvl)+'</div></div>';
+  lids.filter(function(l){return levels[l].deaths}).sort(function(a,b){return levels[b].deaths-levels[a].deaths}).forEach(function(lvl){
+    var L=levels[lvl];
+    var per=L.deaths_per_completion!=null?'<br><span style="color:var(--text-3);font-size:11px">'+L.deaths_per_completion+' per completion</span>':'';
+    h+=_statCard(L.deaths,esc(lvl)+per,'var(--red)');
   });
-  if(!Object.keys(deathsByLvl).length)h+='<div class="muted">No deaths recorded.</div>';
+  if(!lids.some(function(l){return levels[l].deaths}))h+='<div class="muted">No deaths recorded.</div>';
   h+='</div></div>';
 
-  /* Level completion rates */
-  var startsByLvl={};
-  var compsByLvl={};
-  (byType['level_started']||[]).forEach(function(e){
-    var d=_parseEventData(e);
-    var lid=d.level_id||e.level_id||'unknown';
-    startsByLvl[lid]=(startsByLvl[lid]||0)+1;
-  });
-  (byType['level_completed']||[]).forEach(function(e){
-    var d=_parseEventData(e);
-    var lid=d.level_id||e.level_id||'unknown';
-    compsByLvl[lid]=(compsByLvl[lid]||0)+1;
-  });
-  h+='<div class="analytics-section"><h3>Level Completion Rates</h3><div class="stat-grid">';
-  Object.keys(startsByLvl).forEach(function(lvl){
-    var starts=startsByLvl[lvl]||0;
-    var comps=compsByLvl[lvl]||0;
-    var rate=starts>0?Math.round(comps/starts*100):0;
+  /* Level completion funnels (sessions that started / died in / completed each level) */
+  var started=lids.filter(function(l){return levels[l].sessions.started});
+  h+='<div class="analytics-section"><h3>Level Completion</h3>';
+  started.sort(function(a,b){return levels[b].sessions.started-levels[a].sessions.started}).forEach(function(lvl){
+    var S=levels[lvl].sessions;
+    var rate=Math.round(S.completed/S.started*100);
     var color=rate>=50?'var(--green)':rate>=20?'var(--amber)':'var(--red)';
-    h+='<div class="stat-card"><div class="stat-value" style="color:'+color+'">'+rate+'%</div><div class="stat-label">'+esc(lvl)+'<br><span style="color:var(--text-3);font-size:11px">'+comps+'/'+starts+' completed</span></div></div>';
+    h+='<div style="margin-bottom:12px"><div style="color:var(--text-1);margin-bottom:4px">'+esc(lvl)+' <span style="color:'+color+'">'+rate+'%</span></div><div class="funnel">';
+    h+=_funnelRow('started',S.started,S.started,S.started+' sessions');
+    h+=_funnelRow('died',S.died,S.started,S.died+' sessions');
+    h+=_funnelRow('completed',S.completed,S.started,S.completed+' sessions');
+    h+='</div></div>';
   });
-  if(!Object.keys(startsByLvl).length)h+='<div class="muted">No level data.</div>';
-  h+='</div></div>';
+  if(!started.length)h+='<div class="muted">No level data.</div>';
+  h+='</div>';
+
+  /* Boss phase reach */
+  var boss=r.boss||{};
+  if(Object.keys(boss).length){
+    h+='<div class="analytics-section"><h3>Boss Phase Reach</h3>';
+    Object.keys(boss).forEach(function(lvl){
+      var B=boss[lvl];
+      var first=B.phases['1']||0;
+      h+='<div style="margin-bottom:12px"><div style="color:var(--text-1);margin-bottom:4px">'+esc(lvl)+' <span style="color:var(--text-3);font-size:11px">'+B.fights+' fights, '+B.ended+' ended</span></div><div class="funnel">';
+      Object.keys(B.phases).forEach(function(p){h+=_funnelRow('phase '+p,B.phases[p],first,B.phases[p]+' sessions')});
+      h+='</div></div>';
+    });
+    h+='</div>';
+  }
+
+  /* Portal / door flows */
+  var flows=(r.portals||[]).map(function(p){return[p[0]+' → '+p[1]+' (portal)',p[2]]})
+    .concat((r.doors||[]).map(function(d){return[d[0]+' → '+d[1]+(d[2]?' (exit)':' (door)'),d[3]]}))
+    .sort(function(a,b){return b[1]-a[1]}).slice(0,25);
+  if(flows.length){
+    h+='<div class="analytics-section"><h3>Portal &amp; Door Flows</h3><div class="funnel">';
+    flows.forEach(function(f){h+=_funnelRow(f[0],f[1],flows[0][1],f[1]+' uses')});
+    h+='</div></div>';
+  }
 
   /* Quest progression */
-  var questKeys={};
-  (byType['quest_progressed']||[]).forEach(function(e){
-    var d=_parseEventData(e);
-    var k=d.quest_key||'?';
-    questKeys[k]=(questKeys[k]||0)+1;
-  });
+  var questKeys=r.quests||{};
   h+='<div class="analytics-section"><h3>Quest State Changes</h3><div class="stat-grid">';
-  Object.keys(questKeys).sort(function(a,b){return questKeys[b]-questKeys[a]}).forEach(function(k){
-    h+='<div class="stat-card"><div class="stat-value" style="color:var(--purple)">'+questKeys[k]+'</div><div class="stat-label">'+esc(k)+'</div></div>';
-  });
+  Object.keys(questKeys).forEach(function(k){h+=_statCard(questKeys[k],esc(k),'var(--purple)')});
   if(!Object.keys(questKeys).length)h+='<div class="muted">No quest data.</div>';
   h+='</div></div>';
 
-  /* Recent events log */
-  h+='<div class="analytics-section"><h3>Recent Events (last 50)</h3>';
-  h+='<table style="width:100%;border-collapse:collapse;font-size:12px">';
-  h+='<tr style="border-bottom:1px solid var(--border)"><th style="text-align:left;padding:4px;color:var(--text-1)">Time</th><th style="text-align:left;padding:4px;color:var(--text-1)">Event</th><th style="text-align:left;padding:4px;color:var(--text-1)">Level</th><th style="text-align:left;padding:4px;color:var(--text-1)">Player</th><th style="text-align:left;padding:4px;color:var(--text-1)">Data</th></tr>';
-  var recent=events.slice(-50).reverse();
-  recent.forEach(function(e){
-    var t=new Date(e.created_at).toLocaleString();
-    var d=_parseEventData(e);
-    var dStr=Object.keys(d).length?JSON.stringify(d):'';
-    h+='<tr style="border-bottom:1px solid var(--bg-2)"><td style="padding:4px;color:var(--text-3)">'+esc(t)+'</td><td style="padding:4px;color:var(--blue)">'+esc(e.event_name)+'</td><td style="padding:4px">'+esc(e.level_id||'')+'</td><td style="padding:4px;color:var(--text-3);font-family:monospace;font-size:10px">'+esc((e.player_id||'').slice(0,8))+'</td><td style="padding:4px;color:var(--text-3);font-size:11px">'+esc(dStr)+'</td></tr>';
-  });
-  h+='</table></div>';
-
   el.innerHTML=h;
 }
 
 /* ---- Init ---- */
 function init(){
-  buildSearchIndex();
   document.getElementById('search-box').addEventListener('input',onSearch);
   document.addEventListener('click',function(e){
     if(!e.target.closest('.search-wrap'))document.getElementById('search-results').classList.remove('open');
@@ -2645,14 +3795,20 @@ checkGate();
 """
 
 DASHBOARD_FILE = GODOT_DIR.parent / "docs" / "game-bible.html"
+TELEMETRY_ROLLUP_FILE = TOOLS_DIR / ".cache" / "telemetry-rollup.json"   # see telemetry_tool.py
 
 
-def generate_dashboard(quests: dict, password_hash: str = "") -> str:
+def generate_dashboard(quests: dict, password_hash: str = "", index: QuestIndex = None) -> str:
     """Generate the full interactive HTML dashboard."""
-    data = _collect_game_data(quests)
+    data = _collect_game_data(quests, index)
+    data["search_index"] = build_search_index(data)
     data_json = json.dumps(data, indent=None, ensure_ascii=False)
+    return _dashboard_page(data["meta"], f'<script>window.GAME_DATA={data_json};</script>', password_hash)
+
+
+def _dashboard_page(m: dict, data_script: str, password_hash: str = "") -> str:
+    """HTML shell shared by the inline and sharded dashboards."""
     today = date.today().isoformat()
-    m = data["meta"]
 
     pw_script = ""
     gate_html = ""
@@ -2710,46 +3866,381 @@ def generate_dashboard(quests: dict, password_hash: str = "") -> str:
         '<div id="app"></div>\n'
         f'<div class="footer">{footer_text}</div>\n'
         '</div>\n'
-        '<script src="https://cdn.jsdelivr.net/npm/@supabase/supabase-js@2/dist/umd/supabase.min.js"></script>\n'
         '<script src="https://cdnjs.cloudflare.com/ajax/libs/cytoscape/3.30.4/cytoscape.min.js"></script>\n'
         '<script src="https://cdnjs.cloudflare.com/ajax/libs/dagre/0.8.5/dagre.min.js"></script>\n'
         '<script src="https://cdn.jsdelivr.net/npm/cytoscape-dagre@2.5.0/cytoscape-dagre.min.js"></script>\n'
-        f'<script>window.GAME_DATA={data_json};</script>\n'
+        f'{data_script}\n'
         f'{pw_script}\n'
         f'<script>{_DASHBOARD_JS}</script>\n'
         '</body>\n</html>'
     )
 
 
+# ---------------------------------------------------------------------------
+# Dashboard — search index
+# ---------------------------------------------------------------------------
+SEARCH_WORD_RE = re.compile(r"\w+")
+
+
+def _search_entries(data: dict) -> list:
+    """Searchable documents: (type, id, lowercased text, hash, title, sub)."""
+    entries = []
+    for qid, q in data["quests"].items():
+        parts = [q.get("name", ""), qid, q.get("level", ""), q.get("description", ""),
+                 q.get("active_key", ""), q.get("complete_key", "")]
+        for sk in q.get("state_keys", []):
+            parts += [sk["key"], sk.get("meaning", "")]
+        parts += list(q.get("npcs", {}))
+        if q.get("reward", {}).get("item_id"):
+            parts.append(q["reward"]["item_id"])
+        entries.append({"type": "quest", "id": qid, "text": " ".join(parts).lower(),
+                        "hash": f"#quests/{qid}", "title": q.get("name", qid),
+                        "sub": f"{q.get('type')} — {q.get('level', '')}"})
+    for nid, np in data["npc_profiles"].items():
+        text = " ".join([nid, np["role"], *np["quest_ids"], *np["dialog_ids"]])
+        entries.append({"type": "npc", "id": nid, "text": text.lower(),
+                        "hash": f"#npcs/{nid}", "title": nid, "sub": np["role"]})
+    for k, info in data["state_keys"].items():
+        text = " ".join([k, info["meaning"], info["set_by"], *info["read_by"]])
+        entries.append({"type": "key", "id": k, "text": text.lower(),
+                        "hash": f"#keys/{k}", "title": k, "sub": info["meaning"]})
+    for did, dl in data["dialogs"].items():
+        text = " ".join([did, dl.get("description", ""), " ".join(l["text"] for l in dl.get("lines", []))])
+        entries.append({"type": "dialog", "id": did, "text": text.lower(),
+                        "hash": "#quests", "title": did, "sub": dl.get("description", "")})
+    return entries
+
+
+def _delta(ids: list) -> list:
+    """Ascending doc IDs -> gaps (first entry is the first ID)."""
+    return [ids[0]] + [b - a for a, b in zip(ids, ids[1:])] if ids else []
+
+
+def build_search_index(data: dict) -> dict:
+    """Trigram inverted index over the dashboard's searchable text.
+
+    docs   -- [type, id, hash, title, sub, lowercased text] per document;
+              list position = doc ID
+    grams  -- every 3-char substring of every word -> delta-encoded doc IDs
+
+    The page intersects the postings of each query word's trigrams to get
+    candidates, then keeps those whose text contains every query word as a
+    substring (the check the old linear scan did), so trigrams that only
+    co-occur in different words never produce a hit.  Queries whose words
+    are all shorter than 3 chars have no trigrams and scan every text.
+    """
+    docs, grams = [], {}
+    for doc_id, e in enumerate(_search_entries(data)):
+        docs.append([e["type"], e["id"], e["hash"], e["title"], e["sub"], e["text"]])
+        doc_grams = set()
+        for w in set(SEARCH_WORD_RE.findall(e["text"])):
+            doc_grams.update(w[i:i + 3] for i in range(len(w) - 2))
+        for g in doc_grams:
+            grams.setdefault(g, []).append(doc_id)
+    return {
+        "docs": docs,
+        "grams": {g: _delta(ids) for g, ids in sorted(grams.items())},
+    }
+
+
+# ---------------------------------------------------------------------------
+# Dashboard — sharded output (docs/game-bible/)
+# ---------------------------------------------------------------------------
+BIBLE_DIR = GODOT_DIR.parent / "docs" / "game-bible"
+
+
+def _shard(files: dict, name: str, payload) -> str:
+    """Serialize ``payload`` as data/<name>.<content hash>.json; returns its path."""
+    text = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    path = f"data/{name}.{hashlib.sha1(text.encode('utf-8')).hexdigest()[:10]}.json"
+    files[path] = text
+    return path
+
+
+def build_dashboard_shards(quests: dict, password_hash: str = "", index: QuestIndex = None) -> dict:
+    """Split the dashboard into an index.html + manifest and lazily fetched shards.
+
+    Returns {relative path: text}.  The page embeds only the manifest (meta +
+    shard names), so its size does not grow with dialog text or quest count;
+    each view fetches its shards on first use and each quest card fetches
+    its own quest + dialog shard when opened.
+    """
+    index = index or QuestIndex(quests)
+    data = _collect_game_data(quests, index)
+    dialogs = data["dialogs"]
+    files = {}
+
+    summaries = {}
+    for qid, q in quests.items():
+        quest_dialogs = {d: dialogs[d] for d in index.dialog_refs[qid] if d in dialogs}
+        summaries[qid] = {
+            "id": q.get("id", qid), "name": q.get("name", qid), "type": q.get("type"),
+            "level": q.get("level", ""), "reward": q.get("reward", {}),
+            "npcs": {nid: {"role": nd.get("role", "")} for nid, nd in q.get("npcs", {}).items()},
+            "shard": _shard(files, f"quest-{_mid(qid)}", {"quests": {qid: q}, "dialogs": quest_dialogs}),
+        }
+
+    dialog_meta = {did: {k: v for k, v in dl.items() if k != "lines"} for did, dl in dialogs.items()}
+    shards = {
+        "quest_index": _shard(files, "quest-index", {"quests": summaries}),
+        "world":       _shard(files, "world", {"levels": data["levels"], "items": data["items"],
+                                               "achievements": data["achievements"]}),
+        "keys":        _shard(files, "keys", {"state_keys": data["state_keys"]}),
+        "npcs":        _shard(files, "npcs", {"npc_profiles": data["npc_profiles"], "dialogs": dialog_meta}),
+        "graph":       _shard(files, "graph", {"graph": data["graph"]}),
+        "search":      _shard(files, "search", {"search_index": build_search_index(data)}),
+    }
+    manifest = {"meta": data["meta"], "shards": shards}
+    manifest_json = json.dumps(manifest, ensure_ascii=False, indent=1)
+    files["manifest.json"] = manifest_json
+    files["index.html"] = _dashboard_page(
+        data["meta"], f'<script>window.GAME_MANIFEST={manifest_json};</script>', password_hash)
+    return files
+
+
+def write_dashboard_shards(files: dict, out_dir: Path = None, dry_run: bool = False) -> tuple:
+    """Write shard files atomically, skipping unchanged ones and deleting stale shards.
+
+    Returns (written, unchanged, removed) counts; with ``dry_run`` nothing is
+    touched and the counts say what a real run would do.
+    """
+    out_dir = out_dir or BIBLE_DIR
+    if not dry_run:
+        (out_dir / "data").mkdir(parents=True, exist_ok=True)
+    written = unchanged = removed = 0
+    # Shards first, then manifest.json and index.html, so the page never
+    # points at a shard that is not on disk yet
+    for rel in sorted(files, key=lambda rel: not rel.startswith("data/")):
+        text = files[rel]
+        path = out_dir / rel
+        # Hashed shard names mean an existing file already has this content
+        if rel.startswith("data/") and path.exists():
+            unchanged += 1
+            continue
+        try:
+            same = path.read_text(encoding="utf-8") == text
+        except (OSError, UnicodeDecodeError):
+            same = False
+        if same:
+            unchanged += 1
+            continue
+        if not dry_run:
+            write_atomic(path, [text])
+        written += 1
+    for old in (out_dir / "data").glob("*.json"):
+        if f"data/{old.name}" not in files:
+            if not dry_run:
+                old.unlink()
+            removed += 1
+    return written, unchanged, removed
+
 # ---------------------------------------------------------------------------
 # Local dev server (optional)
 # ---------------------------------------------------------------------------
 
+SERVE_POLL_SECONDS = 1.0
+
+
+def _dashboard_sources() -> list:
+    """Every file the dashboard is generated from."""
+    files = list(QUESTS_DIR.glob("*.json"))
+    files += tres_parser.dialog_files(GODOT_DIR / "levels")
+    files += (GODOT_DIR / "data").glob("*Defs.gd")
+    return sorted(files)
+
+
+def _http_entry(body: bytes) -> tuple:
+    """(strong ETag, body, gzip body) for one served resource."""
+    import gzip
+    etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+    return etag, body, gzip.compress(body, compresslevel=6)
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """True if an Accept-Encoding header allows gzip (q-values honoured, RFC 9110)."""
+    q_by_coding = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        q_by_coding[coding] = q
+    if "gzip" in q_by_coding:
+        return q_by_coding["gzip"] > 0
+    if "x-gzip" in q_by_coding:
+        return q_by_coding["x-gzip"] > 0
+    return q_by_coding.get("*", 0.0) > 0
+
+
+def _sources_fingerprint() -> str:
+    h = hashlib.sha1()
+    for path in _dashboard_sources():
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        h.update(f"{path}\0{st.st_mtime_ns}\0{st.st_size}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+class _DashboardCache:
+    """The generated page, kept in memory with its gzip body and ETag.
+
+    A watcher thread polls the source files' mtimes/sizes and drops the page
+    when anything changes; the next request regenerates it once, however
+    many requests arrive at the same time.
+    """
+
+    def __init__(self):
+        import threading
+        self._lock = threading.Lock()
+        self._entry = None          # (etag, body, gzip body)
+        self._fingerprint = _sources_fingerprint()
+        self._watcher = threading.Thread(target=self._watch, daemon=True)
+        self._watcher.start()
+
+    def _watch(self):
+        while True:
+            time.sleep(SERVE_POLL_SECONDS)
+            fp = _sources_fingerprint()
+            if fp != self._fingerprint:
+                with self._lock:
+                    self._fingerprint = fp
+                    self._entry = None
+                print("  Sources changed -- dashboard will regenerate on next request")
+
+    def get(self) -> tuple:
+        with self._lock:
+            if self._entry is None:
+                t0 = time.perf_counter()
+                report = load_corpus()
+                report.print_errors()
+                body = generate_dashboard(report.quests).encode("utf-8")
+                self._entry = _http_entry(body)
+                print(f"  Regenerated dashboard in {(time.perf_counter() - t0) * 1000:.0f} ms "
+                      f"({len(body) // 1024} KB, {len(self._entry[2]) // 1024} KB gzipped)")
+            return self._entry
+
+
+class _StaticFiles:
+    """Files under ``root`` (the sharded docs/game-bible/), cached by mtime + size."""
+
+    TYPES = {".html": "text/html; charset=utf-8", ".json": "application/json"}
+
+    def __init__(self, root: Path):
+        import threading
+        self.root = root.resolve()
+        self._lock = threading.Lock()
+        self._entries = {}          # path -> (mtime_ns, size, entry)
+
+    def get(self, rel: str):
+        """(entry, content type) for ``rel``, or None if it is not a file under root."""
+        path = (self.root / rel).resolve()
+        if self.root not in path.parents or not path.is_file():
+            return None
+        st = path.stat()
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached is None or cached[:2] != (st.st_mtime_ns, st.st_size):
+                cached = self._entries[path] = (st.st_mtime_ns, st.st_size, _http_entry(path.read_bytes()))
+        return cached[2], self.TYPES.get(path.suffix, "application/octet-stream")
+
+
 def _serve_dashboard(port: int) -> None:
-    """Start a local HTTP server that regenerates the dashboard on each request."""
+    """Serve the dashboard from memory, regenerating only when sources change.
+
+    The sharded build in docs/game-bible/ (--dashboard --sharded --write) is
+    served as written under /game-bible/, with the same ETag / gzip handling.
+    """
     import http.server
-    import socketserver
+    from urllib.parse import unquote
+
+    cache = _DashboardCache()
+    shards = _StaticFiles(BIBLE_DIR)
+    shard_root = "/" + BIBLE_DIR.name
 
     class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
         def do_GET(self):
-            if self.path == '/' or self.path == '/index.html':
-                quests = load_all()
-                html = generate_dashboard(quests)
+            self._respond(with_body=True)
+
+        def do_HEAD(self):
+            self._respond(with_body=False)
+
+        def _respond(self, with_body: bool):
+            path = unquote(self.path.split("?")[0])
+            if path == "/" + TELEMETRY_ROLLUP_FILE.name and TELEMETRY_ROLLUP_FILE.is_file():
+                # Written by telemetry_tool.py; the Analytics tab fetches it from beside the page
+                body = TELEMETRY_ROLLUP_FILE.read_bytes()
                 self.send_response(200)
-                self.send_header('Content-Type', 'text/html; charset=utf-8')
-                self.send_header('Cache-Control', 'no-store')
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-cache")
                 self.end_headers()
-                self.wfile.write(html.encode('utf-8'))
-            else:
-                self.send_response(404)
+                if with_body:
+                    self.wfile.write(body)
+                return
+            if path in ("/", "/index.html"):
+                self._send_entry(cache.get(), "text/html; charset=utf-8", with_body)
+                return
+            if path == shard_root:
+                # Shard URLs are relative to the page, so it needs the trailing slash
+                self.send_response(301)
+                self.send_header("Location", shard_root + "/")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if path.startswith(shard_root + "/"):
+                found = shards.get(path[len(shard_root) + 1:] or "index.html")
+                if found is not None:
+                    self._send_entry(found[0], found[1], with_body)
+                    return
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def _send_entry(self, entry: tuple, content_type: str, with_body: bool):
+            etag, body, gz_body = entry
+            use_gzip = _accepts_gzip(self.headers.get("Accept-Encoding", ""))
+            if use_gzip:
+                # Strong ETags are per representation
+                etag, body = etag[:-1] + '-gz"', gz_body
+            inm = self.headers.get("If-None-Match", "")
+            if etag in [t.strip() for t in inm.split(",")]:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Vary", "Accept-Encoding")
                 self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Vary", "Accept-Encoding")
+            if use_gzip:
+                self.send_header("Content-Encoding", "gzip")
+            self.end_headers()
+            if with_body:
+                self.wfile.write(body)
 
         def log_message(self, format, *args):
             print(f"  [{self.log_date_time_string()}] {format % args}")
 
-    with socketserver.TCPServer(("", port), Handler) as httpd:
+    with http.server.ThreadingHTTPServer(("", port), Handler) as httpd:
         print(f"  Dashboard server: http://localhost:{port}")
-        print(f"  Regenerates on every page load. Press Ctrl+C to stop.\n")
+        if BIBLE_DIR.is_dir():
+            print(f"  Sharded build:    http://localhost:{port}{shard_root}/")
+        print("  Regenerates when quests, dialogs or *Defs.gd change. Press Ctrl+C to stop.\n")
         try:
             httpd.serve_forever()
         except KeyboardInterrupt:
@@ -2760,17 +4251,167 @@ def _serve_dashboard(port: int) -> None:
 # Entry point
 # ---------------------------------------------------------------------------
 
+# ---------------------------------------------------------------------------
+# One-shot build (--all)
+# ---------------------------------------------------------------------------
+
+FLOWCHART_HEADER = (
+    "# Quest Flowchart\n\n"
+    "**Auto-generated** by `tools/quest_tool.py --graph --write`.\n"
+    "Do not edit by hand -- edit the JSON files in `godot_port/data/quests/` instead.\n"
+    "To re-render: copy the Mermaid block into [mermaid.live](https://mermaid.live).\n\n"
+)
+
+
+def _all_outputs() -> dict:
+    """name -> destination of every document ``--all`` builds."""
+    return {
+        "flowchart": FLOWCHART_FILE,
+        "storyline": STORYLINE_FILE,
+        "html":      HTML_FILE,
+        "dashboard": DASHBOARD_FILE,
+        "tables":    TABLES_FILE,
+    }
+
+
+def _output_chunks(name: str, quests: dict, index: QuestIndex, password_hash: str):
+    if name == "flowchart":
+        return itertools.chain([FLOWCHART_HEADER], join_lines(iter_mermaid(quests, index)))
+    if name == "storyline":
+        return join_lines(iter_story(quests, index))
+    if name == "html":
+        return iter_html(quests)
+    if name == "dashboard":
+        return [generate_dashboard(quests, password_hash=password_hash, index=index)]
+    if name == "tables":
+        model = StateModel(quests, index)
+        tables = compile_dialog_tables(quests, model)
+        mismatches = verify_dialog_tables(quests, tables, model)
+        if mismatches:
+            raise ValueError(f"{len(mismatches)} compiled/interpreted dialog table mismatch(es), "
+                             f"first: {mismatches[0]}; run --compile for the full list")
+        return [tables_json(tables)]
+    raise ValueError(f"unknown output {name!r}")
+
+
+def _build_output(name: str, path: Path, quests: dict, index: QuestIndex,
+                  password_hash: str, write: bool) -> tuple:
+    """Worker: render one document. Returns (name, changed, seconds)."""
+    t0 = time.perf_counter()
+    chunks = _output_chunks(name, quests, index, password_hash)
+    if write:
+        changed = write_atomic(path, chunks, skip_unchanged=True)
+    else:
+        changed = _stable_digest(chunks) != _file_digest(path)
+    return name, changed, time.perf_counter() - t0
+
+
+def build_all(quests: dict, index: QuestIndex, password_hash: str = "", write: bool = True) -> list:
+    """Render every docs/ output and data/quest_tables.json in parallel worker processes.
+
+    Quests are loaded once by the caller and shipped to each worker; dialog
+    .tres files and *Defs.gd are only read by the dashboard worker.  Outputs
+    whose content (ignoring generation dates) matches the file on disk are
+    not rewritten.  Returns [(name, path, changed, seconds)] in output order.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    outputs = _all_outputs()
+    with ProcessPoolExecutor(max_workers=min(len(outputs), os.cpu_count() or 1)) as pool:
+        futures = [pool.submit(_build_output, name, path, quests, index, password_hash, write)
+                   for name, path in outputs.items()]
+        results = [f.result() for f in futures]
+    return [(name, outputs[name], changed, secs) for name, changed, secs in results]
+
+
+# ---------------------------------------------------------------------------
+# Output files
+# ---------------------------------------------------------------------------
+
+def join_lines(lines):
+    """Stream ``"\\n".join(lines)`` as chunks without building the string."""
+    it = iter(lines)
+    for first in it:
+        yield first
+        break
+    for line in it:
+        yield "\n"
+        yield line
+
+
+# Generation dates are left out of the unchanged-output comparison, or
+# every output would differ every day.  Only the stamps the generators
+# write are matched -- "Auto-generated 2026-02-24" (report),
+# "**Auto-generated** on 2026-02-24" (storyline), "Generated 2026-02-24"
+# (dashboard footer) and "generated": "2026-02-24" (dashboard meta) -- so
+# an edited date anywhere in quest text still counts as a change.
+_STAMP_RE = re.compile(r'(\bAuto-generated(?:\*\*)? (?:on )?|\bGenerated |"generated": ?")\d{4}-\d{2}-\d{2}\b')
+
+
+def _stable_digest(chunks) -> str:
+    h = hashlib.sha1()
+    for chunk in chunks:
+        h.update(_STAMP_RE.sub(r"\1", chunk).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _file_digest(path: Path) -> str:
+    """``_stable_digest`` of a file on disk ("" if it does not exist)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return _stable_digest(f)
+    except (OSError, UnicodeDecodeError):
+        return ""
+
+
+def write_atomic(path: Path, chunks, skip_unchanged: bool = False) -> bool:
+    """Write text chunks to ``path`` via a temp file in the same directory.
+
+    The temp file replaces ``path`` only once every chunk was written, so a
+    crash or Ctrl-C mid-render leaves the old file untouched; it keeps the
+    old file's permissions (see atomic_write.py).  With
+    ``skip_unchanged`` the content is hashed while it streams and the old
+    file is kept (mtime and all) when it only differs in generation dates.
+    Returns True if ``path`` was replaced.
+    """
+    h = hashlib.sha1()
+    with atomic_write.AtomicWriter(path, "w", encoding="utf-8") as f:
+        for chunk in chunks:
+            f.write(chunk)
+            if skip_unchanged:
+                h.update(_STAMP_RE.sub(r"\1", chunk).encode("utf-8"))
+        if skip_unchanged and h.hexdigest() == _file_digest(path):
+            f.discard()
+            return False
+    return True
+
+
+def print_chunks(chunks):
+    """``print("".join(chunks))`` without joining."""
+    for chunk in chunks:
+        sys.stdout.write(chunk)
+    sys.stdout.write("\n")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Quest graph validation and visualization tool",
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
     parser.add_argument("--validate",  action="store_true", help="Validate all quest files")
+    parser.add_argument("--explore",   action="store_true", help="Search reachable quest states for softlocks")
+    parser.add_argument("--compile",   action="store_true", help="Compile NPC dialog decision tables for QuestManager")
     parser.add_argument("--graph",     action="store_true", help="Generate Mermaid flowchart")
     parser.add_argument("--story",     action="store_true", help="Generate narrative storyline Markdown")
     parser.add_argument("--html",      action="store_true", help="Generate static HTML report (simple card view)")
     parser.add_argument("--dashboard", action="store_true", help="Generate interactive Game Bible dashboard")
+    parser.add_argument("--all",       action="store_true",
+                        help="Build flowchart, storyline, HTML report and dashboard in one pass")
     parser.add_argument("--write",     action="store_true", help="Write output to docs/")
+    parser.add_argument("--sharded",   action="store_true", help="With --dashboard: write docs/game-bible/ shards")
+    parser.add_argument("--partition", choices=PARTITION_MODES,
+                        help="With --graph: one chart per level / prerequisite component")
+    parser.add_argument("--no-cache",  action="store_true", help="Validate every file, bypassing the validation cache")
+    parser.add_argument("--timings",   action="store_true", help="Print per-file read/parse times to stderr")
     parser.add_argument("--serve",     type=int, nargs='?', const=8080, metavar="PORT",
                         help="Start local dashboard server (default port 8080)")
     parser.add_argument("--password",  metavar="PW", help="Set password gate for dashboard")
@@ -2783,28 +4424,89 @@ def main():
         print(f"ERROR: quests directory not found: {QUESTS_DIR}", file=sys.stderr)
         sys.exit(1)
 
-    quests = load_all()
+    if args.validate and not args.no_cache and args.serve is None:
+        errors = validate_cached(timings=args.timings)
+        sys.exit(1 if errors else 0)
+
+    report = load_corpus()
+    report.print_errors()
+    if args.timings:
+        report.print_timings()
+    quests = report.quests
     if not quests:
         print("No quest files found.", file=sys.stderr)
         sys.exit(1)
 
     print(f"Loaded {len(quests)} quest file(s) from {QUESTS_DIR.relative_to(GODOT_DIR.parent)}\n")
+    index = QuestIndex(quests)
 
     if args.serve is not None:
         _serve_dashboard(args.serve)
         return
 
     if args.validate:
-        errors = validate(quests)
+        errors = validate(quests, index)
         sys.exit(1 if errors else 0)
 
+    elif args.explore:
+        issues = report_explore(quests, index)
+        sys.exit(1 if issues else 0)
+
+    elif args.compile:
+        model = StateModel(quests, index)
+        tables = compile_dialog_tables(quests, model)
+        mismatches = verify_dialog_tables(quests, tables, model)
+        if mismatches:
+            for m in mismatches:
+                print(f"  FAIL {m}", file=sys.stderr)
+            print(f"\n  {len(mismatches)} compiled/interpreted mismatch(es); nothing written", file=sys.stderr)
+            sys.exit(1)
+        print(f"  {len(tables['npcs'])} NPC table(s) verified against the JSON rules", file=sys.stderr)
+        text = tables_json(tables)
+        if args.write:
+            write_atomic(TABLES_FILE, [text])
+            print(f"Written to {TABLES_FILE.relative_to(GODOT_DIR.parent)}")
+        else:
+            print(text)
+
+    elif args.all:
+        pw_hash = hashlib.sha256(args.password.encode()).hexdigest()[:16] if args.password else ""
+        try:
+            results = build_all(quests, index, password_hash=pw_hash, write=args.write)
+        except ValueError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            sys.exit(1)
+        for name, path, changed, secs in results:
+            rel = path.relative_to(GODOT_DIR.parent)
+            if args.write:
+                state = "written" if changed else "unchanged"
+            else:
+                state = "would change" if changed else "up to date"
+            print(f"  {name:<10} {rel}  {state}  ({secs * 1000:.0f} ms)")
+        if not args.write and any(changed for _n, _p, changed, _s in results):
+            print("\nRun with --write to update docs/ and data/quest_tables.json.")
+
     elif args.dashboard:
         pw_hash = ""
         if args.password:
             pw_hash = hashlib.sha256(args.password.encode()).hexdigest()[:16]
-        html = generate_dashboard(quests, password_hash=pw_hash)
+        if args.sharded:
+            files = build_dashboard_shards(quests, password_hash=pw_hash, index=index)
+            written, unchanged, removed = write_dashboard_shards(files, dry_run=not args.write)
+            rel = BIBLE_DIR.relative_to(GODOT_DIR.parent)
+            if args.write:
+                print(f"Written to {rel}/ "
+                      f"({written} written, {unchanged} unchanged, {removed} stale removed)")
+            else:
+                size = sum(len(text.encode("utf-8")) for text in files.values())
+                print(f"  {len(files)} file(s), {size // 1024} KB: {written} would be written, "
+                      f"{unchanged} unchanged, {removed} stale would be removed in {rel}/")
+                if written or removed:
+                    print("\nRun with --write to update it.")
+            return
+        html = generate_dashboard(quests, password_hash=pw_hash, index=index)
         if args.write:
-            DASHBOARD_FILE.write_text(html, encoding="utf-8")
+            write_atomic(DASHBOARD_FILE, [html])
             print(f"Written to {DASHBOARD_FILE.relative_to(GODOT_DIR.parent)}")
             if pw_hash:
                 print(f"  Password gate enabled (hash: {pw_hash})")
@@ -2812,24 +4514,34 @@ def main():
             print(html)
 
     elif args.story:
-        story = generate_story(quests)
+        story = join_lines(iter_story(quests, index))
         if args.write:
-            STORYLINE_FILE.write_text(story, encoding="utf-8")
+            write_atomic(STORYLINE_FILE, story)
             print(f"Written to {STORYLINE_FILE.relative_to(GODOT_DIR.parent)}")
         else:
-            print(story)
+            print_chunks(story)
 
     elif args.html:
-        html = generate_html(quests)
+        html = iter_html(quests)
         if args.write:
-            HTML_FILE.write_text(html, encoding="utf-8")
+            write_atomic(HTML_FILE, html)
             print(f"Written to {HTML_FILE.relative_to(GODOT_DIR.parent)}")
         else:
-            print(html)
+            print_chunks(html)
 
     elif args.graph:
-        if args.quest:
-            chart = generate_mermaid_single(quests, args.quest)
+        if args.partition:
+            files = build_flowchart_partitions(quests, args.partition, index)
+            if args.write:
+                written, unchanged, removed = write_flowchart_partitions(files)
+                print(f"Written to {FLOWCHART_DIR.relative_to(GODOT_DIR.parent)}/ "
+                      f"({written} written, {unchanged} unchanged, {removed} stale removed)")
+            else:
+                for name, chunks in files.items():
+                    print(f"<!-- ==== {name} ==== -->")
+                    print_chunks(chunks)
+        elif args.quest:
+            chart = generate_mermaid_single(quests, args.quest, index)
             if args.write:
                 out = GODOT_DIR.parent / "docs" / f"quest-flowchart-{args.quest}.md"
                 header = (
@@ -2837,23 +4549,17 @@ def main():
                     f"**Auto-generated** by `tools/quest_tool.py --graph --quest {args.quest} --write`.\n"
                     f"Do not edit by hand.\n\n"
                 )
-                out.write_text(header + chart, encoding="utf-8")
+                write_atomic(out, [header, chart])
                 print(f"Written to {out.relative_to(GODOT_DIR.parent)}")
             else:
                 print(chart)
         else:
-            chart = generate_mermaid(quests)
+            chart = join_lines(iter_mermaid(quests, index))
             if args.write:
-                header = (
-                    "# Quest Flowchart\n\n"
-                    "**Auto-generated** by `tools/quest_tool.py --graph --write`.\n"
-                    "Do not edit by hand -- edit the JSON files in `godot_port/data/quests/` instead.\n"
-                    "To re-render: copy the Mermaid block into [mermaid.live](https://mermaid.live).\n\n"
-                )
-                FLOWCHART_FILE.write_text(header + chart, encoding="utf-8")
+                write_atomic(FLOWCHART_FILE, itertools.chain([FLOWCHART_HEADER], chart))
                 print(f"Written to {FLOWCHART_FILE.relative_to(GODOT_DIR.parent)}")
             else:
-                print(chart)
+                print_chunks(chart)
 
     elif args.npc:
         show_npc(quests, args.npc)
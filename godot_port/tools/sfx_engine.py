@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+sfx_engine.py -- Vectorized building blocks for the procedural sound tools
+
+Everything works on whole float64 NumPy arrays instead of one sample at a
+time, and reproduces the per-sample loops generate_ui_sounds.py used to run
+to within 1 LSB of 16-bit output:
+
+  phase()          accumulated oscillator phase (``phase += f / sr`` per sample)
+  sine / saw / pulse
+                   oscillators over a phase array; square is ``pulse(duty=0.5)``
+  lcg_states / lcg_noise
+                   the ``(s * 1103515245 + 12345) & 0x7FFFFFFF`` noise,
+                   bit-exact, computed a block at a time with jump-ahead
+  lfilter          linear time-invariant IIR (one_pole, biquad) computed in
+                   fixed-size blocks: zero-state response by matrix product,
+                   block-to-block state carried by a short scalar recurrence
+  biquad_varying   biquad with per-sample coefficients (filter sweeps)
+  bandpass         RBJ band-pass coefficients, scalars or arrays
+  pcm16 / write_wav
+                   truncating 16-bit conversion and a single-buffer WAV write
+"""
+
+import math
+import os
+import wave
+
+import numpy as np
+
+SAMPLE_RATE = 44100
+
+LCG_MUL  = 1103515245
+LCG_INC  = 12345
+LCG_MASK = 0x7FFFFFFF
+
+FILTER_BLOCK = 64
+
+# ---------------------------------------------------------------------------
+# Time / oscillators
+# ---------------------------------------------------------------------------
+
+def times(n: int, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Sample times ``i / sample_rate``."""
+    return np.arange(n) / sample_rate
+
+
+def phase(freq, n: int, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Oscillator phase in cycles after each sample's ``phase += freq / sr``.
+
+    ``freq`` may be a scalar or a per-sample array.  ``np.cumsum`` adds in
+    order, so this matches the running float sum of a sample loop exactly.
+    """
+    step = np.broadcast_to(np.asarray(freq, dtype=np.float64) / sample_rate, (n,))
+    return np.cumsum(step)
+
+
+def sine(ph: np.ndarray) -> np.ndarray:
+    return np.sin(2.0 * math.pi * ph)
+
+
+def saw(ph: np.ndarray) -> np.ndarray:
+    """Rising ramp -1..1."""
+    return 2.0 * (ph % 1.0) - 1.0
+
+
+def pulse(ph: np.ndarray, duty: float = 0.5, high: float = 1.0, low: float = -1.0) -> np.ndarray:
+    """``high`` for the first ``duty`` of each cycle, ``low`` for the rest."""
+    return np.where(ph % 1.0 < duty, high, low)
+
+# ---------------------------------------------------------------------------
+# Noise
+# ---------------------------------------------------------------------------
+
+def lcg_states(seed: int, n: int) -> np.ndarray:
+    """The LCG's state after each of ``n`` steps from ``seed`` (int64 array).
+
+    The first block is stepped directly; every later block is the previous
+    block advanced by ``block`` steps at once (x -> A*x + C mod 2**31, with A
+    and C composed from the single-step constants).  Products stay below
+    2**62, so uint64 arithmetic is exact.
+    """
+    if n <= 0:
+        return np.zeros(0, dtype=np.int64)
+    block = max(1, min(n, int(math.isqrt(n)) + 1))
+    first = np.empty(block, dtype=np.uint64)
+    s = seed
+    for i in range(block):
+        s = (s * LCG_MUL + LCG_INC) & LCG_MASK
+        first[i] = s
+    mul, inc = 1, 0
+    for _ in range(block):
+        mul, inc = (mul * LCG_MUL) & LCG_MASK, (inc * LCG_MUL + LCG_INC) & LCG_MASK
+    blocks = -(-n // block)
+    out = np.empty((blocks, block), dtype=np.uint64)
+    out[0] = first
+    mul64, inc64, mask64 = np.uint64(mul), np.uint64(inc), np.uint64(LCG_MASK)
+    for j in range(1, blocks):
+        out[j] = (out[j - 1] * mul64 + inc64) & mask64
+    return out.reshape(-1)[:n].astype(np.int64)
+
+
+def lcg_noise(seed: int, n: int) -> np.ndarray:
+    """White noise in [-1, 1] from ``lcg_states``: ``state / 0x7FFFFFFF * 2 - 1``."""
+    return (lcg_states(seed, n) / LCG_MASK) * 2.0 - 1.0
+
+# ---------------------------------------------------------------------------
+# Filters
+# ---------------------------------------------------------------------------
+
+def _df1(b: list, a: list, x: list, xh: list, yh: list) -> list:
+    """Direct-form-I reference recurrence over a short list (a[0] == 1).
+
+    xh / yh are the previous inputs / outputs, most recent first.
+    """
+    xh, yh = list(xh), list(yh)
+    out = []
+    for v in x:
+        y = b[0] * v
+        for k in range(1, len(b)):
+            y += b[k] * xh[k - 1]
+        for k in range(1, len(a)):
+            y -= a[k] * yh[k - 1]
+        if xh:
+            xh = [v] + xh[:-1]
+        if yh:
+            yh = [y] + yh[:-1]
+        out.append(y)
+    return out
+
+
+def lfilter(b, a, x: np.ndarray, block: int = FILTER_BLOCK) -> np.ndarray:
+    """``y[n] = sum(b[k] x[n-k]) - sum(a[k] y[n-k])`` with ``a[0] == 1``, zero initial state.
+
+    The input is cut into blocks.  Within a block the output is the
+    zero-state response (block @ Toeplitz matrix of the impulse response)
+    plus the responses to the previous block's trailing inputs and outputs.
+    Only that short output tail is carried from block to block in Python.
+    """
+    b = [float(v) for v in b]
+    a = [float(v) for v in a]
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    if n == 0:
+        return x.copy()
+    q, p = len(b) - 1, len(a) - 1
+    blocks = -(-n // block)
+    xs = np.zeros(blocks * block)
+    xs[:n] = x
+    xs = xs.reshape(blocks, block)
+
+    zeros = [0.0] * block
+    h = np.array(_df1(b, a, [1.0] + zeros[1:], [0.0] * q, [0.0] * p))
+    toeplitz = np.zeros((block, block))
+    for k in range(block):
+        toeplitz[k, k:] = h[:block - k]
+    rx = np.array([_df1(b, a, zeros, [float(i == k) for i in range(q)], [0.0] * p) for k in range(q)])
+    ry = np.array([_df1(b, a, zeros, [0.0] * q, [float(i == k) for i in range(p)]) for k in range(p)])
+
+    y = xs @ toeplitz
+    if q:
+        xh = np.zeros((blocks, q))
+        for k in range(q):
+            xh[1:, k] = xs[:-1, block - 1 - k]
+        y += xh @ rx
+    if p:
+        # The only sequential part: each block's last p outputs seed the next block
+        tails = y[:, block - p:][:, ::-1].tolist()
+        ry_tail = ry[:, block - p:][:, ::-1].tolist()
+        yh = np.zeros((blocks, p))
+        prev = [0.0] * p
+        for j in range(1, blocks):
+            prev = [tails[j - 1][i] + sum(prev[k] * ry_tail[k][i] for k in range(p)) for i in range(p)]
+            yh[j] = prev
+        y += yh @ ry
+    return y.reshape(-1)[:n]
+
+
+def one_pole(x: np.ndarray, alpha: float) -> np.ndarray:
+    """Low-pass ``y = alpha * x + (1 - alpha) * y_prev``."""
+    return lfilter([alpha], [1.0, -(1.0 - alpha)], x)
+
+
+def biquad(x: np.ndarray, coeffs: tuple) -> np.ndarray:
+    """Biquad with constant normalized coefficients ``(b0, b1, b2, a1, a2)``."""
+    b0, b1, b2, a1, a2 = coeffs
+    return lfilter([b0, b1, b2], [1.0, a1, a2], x)
+
+
+def biquad_varying(x: np.ndarray, coeffs: tuple) -> np.ndarray:
+    """Biquad whose normalized coefficients are per-sample arrays.
+
+    The feed-forward half is vectorized; the feedback recurrence can't be
+    (its coefficients change every sample), so it runs over plain floats.
+    """
+    b0, b1, b2, a1, a2 = (np.broadcast_to(c, x.shape) for c in coeffs)
+    x1 = np.concatenate(([0.0], x[:-1]))
+    x2 = np.concatenate(([0.0, 0.0], x[:-2]))[:len(x)]
+    u = (b0 * x + b1 * x1 + b2 * x2).tolist()
+    a1, a2 = a1.tolist(), a2.tolist()
+    out = [0.0] * len(u)
+    y1 = y2 = 0.0
+    for i, v in enumerate(u):
+        y = v - a1[i] * y1 - a2[i] * y2
+        out[i] = y
+        y2, y1 = y1, y
+    return np.array(out)
+
+
+def bandpass(center, bw, sample_rate: int = SAMPLE_RATE) -> tuple:
+    """Normalized constant-skirt band-pass ``(b0, b1, b2, a1, a2)``.
+
+    ``center`` / ``bw`` in Hz, scalars or arrays.
+    """
+    omega = 2.0 * math.pi * np.asarray(center, dtype=np.float64) / sample_rate
+    sin_w = np.sin(omega)
+    cos_w = np.cos(omega)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        alpha = np.where(sin_w != 0,
+                         sin_w * np.sinh(math.log(2.0) / 2.0 * (bw / np.asarray(center)) * omega / sin_w),
+                         0.1)
+    a0 = 1.0 + alpha
+    return alpha / a0, 0.0 * alpha, -alpha / a0, -2.0 * cos_w / a0, (1.0 - alpha) / a0
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+def pcm16(samples) -> bytes:
+    """Clamp to [-1, 1], scale by 32767 and truncate toward zero (like ``int()``)."""
+    s = np.clip(np.asarray(samples, dtype=np.float64), -1.0, 1.0)
+    return (s * 32767).astype("<i2").tobytes()
+
+
+def write_wav(path: str, samples, sample_rate: int = SAMPLE_RATE):
+    """Write mono 16-bit PCM in one ``writeframes`` call."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with wave.open(path, "w") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(pcm16(samples))
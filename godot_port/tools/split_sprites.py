@@ -1,55 +1,398 @@
 #!/usr/bin/env python3
-from PIL import Image
+"""
+split_sprites.py -- Split sprite sheets into per-state animation strips
+
+For every sheet:
+  1. Key out the background: the colour shared by most of the four corners
+    (or --bg) becomes transparent, within --tolerance per RGB channel.
+    Pixels that are already transparent count as background too.
+  2. Find the animation rows from the opaque-pixel profile of each scanline,
+    and the frames inside a row from its column profile (runs of opaque
+    columns; gaps up to --gap pixels are bridged).
+  3. With --labels, drop the text label at the start of each row: everything
+    before the first gap that is clearly wider than the gaps between frames.
+  4. Cut the row on the regular grid that best lines successive frames up
+    and whose cell edges fall in the gaps (see grid_pitch), so each frame
+    keeps its offset inside its cell and detached pieces of one frame stay
+    together; without such a grid, warn and centre each run in a cell as
+    wide as the widest one.
+  5. Write one horizontal strip per row, <prefix>_<state>.png, with equal
+    cells, plus <prefix>_frames.json describing each frame's cell in the
+    strip and its rectangle in the sheet.
+
+Directories are expanded to their *.png files and sheets are processed in
+parallel.
+
+Usage:
+  python tools/split_sprites.py sheet.png --out assets/sprites/player --prefix player \\
+      --states attack,death,hurt,idle,walk --labels
+      The player sheet: five labelled rows -> player_attack.png ... player_walk.png.
+
+  python tools/split_sprites.py downloads/pack/ --out assets/sprites/pack --tolerance 12
+      Every sheet in a directory; strips are named <sheet>_row<N>.png.
+
+  python tools/split_sprites.py --selftest
+      Regression check: build labelled sheets from the Owlet_Monster_*_<N>
+      strips at 1x, 2x and 3x, split them and check every row comes back as
+      its N frames, pixel for pixel.  Exits 1 on a mismatch.
+"""
+
+import argparse
+import json
 import os
+import re
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+TOOLS_DIR    = Path(__file__).parent
+OWLET_STRIPS = TOOLS_DIR.parent / "player" / "sprites"
+
+CUT_TOLERANCE = 0.01  # share of a row's pixels a frame grid may separate from their neighbours
+
+# ---------------------------------------------------------------------------
+# Keying / profiles
+# ---------------------------------------------------------------------------
+
+def background_colour(rgba: np.ndarray) -> tuple:
+    """The RGB value most of the four corners agree on (top-left on a tie)."""
+    corners = [tuple(int(v) for v in rgba[y, x, :3]) for y, x in ((0, 0), (0, -1), (-1, 0), (-1, -1))]
+    return max(corners, key=lambda c: (corners.count(c), -corners.index(c)))
+
+
+def key_background(rgba: np.ndarray, bg: tuple, tolerance: int) -> np.ndarray:
+    """Opaque mask; background pixels in ``rgba`` are cleared to (0, 0, 0, 0) in place."""
+    diff = np.abs(rgba[..., :3].astype(np.int16) - np.array(bg, dtype=np.int16)).max(axis=2)
+    clear = (diff <= tolerance) | (rgba[..., 3] == 0)
+    rgba[clear] = 0
+    return ~clear
+
+
+def runs(profile: np.ndarray, gap: int = 0) -> list:
+    """[start, end) runs of True, bridging gaps of up to ``gap`` False values."""
+    padded = np.concatenate(([False], profile, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    spans = edges.reshape(-1, 2).tolist()
+    merged = []
+    for start, end in spans:
+        if merged and start - merged[-1][1] <= gap:
+            merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [tuple(s) for s in merged]
+
+
+def strip_label(segments: list) -> list:
+    """Drop leading segments that end before a gap wider than twice the others' median."""
+    if len(segments) < 3:
+        return segments
+    gaps = [b[0] - a[1] for a, b in zip(segments, segments[1:])]
+    widest = max(range(len(gaps)), key=lambda i: (gaps[i], -i))
+    rest = gaps[:widest] + gaps[widest + 1:]
+    if gaps[widest] > 2 * max(float(np.median(rest)), 1.0) and widest < len(segments) - 2:
+        return segments[widest + 1:]
+    return segments
+
 
-# Load the sprite sheet
-img = Image.open(r'C:\Users\Robin\Desktop\codex\godot_port\assets\sprites\player\2BjgJIH.png')
+def grid_pitch(band: np.ndarray, segments: list) -> tuple:
+    """(pitch, origin) of the frame grid of one row, or None.
 
-# Convert to RGBA to support transparency
-img = img.convert('RGBA')
+    ``band`` is the row's opaque mask and ``segments`` its kept column runs.
+    Frames of one animation look alike, so shifting the row by the true pitch
+    lines every frame up with the next one: each pitch is scored by that
+    overlap (the row's autocorrelation, over its opaque pixel count).  Only
+    pitches with a grid that separates (almost) no touching pixels count --
+    cell edges fall in the gaps, bar the odd stray pixel that crosses into
+    the next cell, as in the Owlet death animation.  The pitch is the
+    smallest one scoring within 10% of the best (twice the pitch pairs up
+    frames and scores about as well); within 25% above it the pitch with
+    the most factors of two wins, as pixel-art grids are 16 / 32 / 48 / ...
+    (31, 32 and 33 all line frames up nearly as well).  The origin is the
+    middle of the longest run of cheapest cell edges, so edges fall in the
+    middle of the gaps.
+    """
+    if len(segments) < 2:
+        return None
+    x0, x1 = segments[0][0], segments[-1][1]
+    keep = np.zeros(band.shape[1], dtype=bool)
+    for s, e in segments:
+        keep[s:e] = True
+    m = (band & keep)[:, x0:x1]
+    w = x1 - x0
+    mass = int(m.sum())
 
-width, height = img.size
+    # overlap[p]: opaque pixels that stay opaque when the row is shifted by p
+    n = 1 << (2 * w - 1).bit_length()
+    f = np.fft.rfft(m.astype(np.float64), n, axis=1)
+    overlap = np.rint(np.fft.irfft((f * f.conj()).sum(axis=0), n)[:w])
 
-# Calculate row height (divide image into 5 equal rows)
-row_height = height // 5
+    # cut[x]: pixel pairs (8-connected) a cell edge before column x0 + x separates
+    a, b = m[:, :-1], m[:, 1:]
+    cut = np.zeros(w + 1, dtype=np.int64)
+    cut[1:w] = (a & b).sum(axis=0) + (a[1:] & b[:-1]).sum(axis=0) + (a[:-1] & b[1:]).sum(axis=0)
 
-# Define output directory
-output_dir = r'C:\Users\Robin\Desktop\codex\godot_port\assets\sprites\player'
-os.makedirs(output_dir, exist_ok=True)
+    candidates = []            # (pitch, score, cut cost per origin)
+    for p in range(2, w):
+        k = -(-(w + 1) // p)
+        costs = np.zeros(k * p, dtype=np.int64)
+        costs[:w + 1] = cut
+        costs = costs.reshape(k, p).sum(axis=0)
+        if costs.min() <= CUT_TOLERANCE * mass:
+            candidates.append((p, overlap[p] / mass, costs))
+    top = max((score for _, score, _ in candidates), default=0.0)
+    if top <= 0:
+        return None
+    near = [c for c in candidates if c[1] >= 0.9 * top]
+    near = [c for c in near if c[0] <= 1.25 * near[0][0]]
+    p, _, costs = max(near, key=lambda c: ((c[0] & -c[0]).bit_length(), c[1]))
 
-# State names in order from top to bottom
-states = ['attack', 'death', 'hurt', 'idle', 'walk']
+    # Longest run of cheapest origins on the circle: walk it twice
+    ok = np.concatenate([costs, costs]) == costs.min()
+    run = end = length = 0
+    for i, cheap in enumerate(ok):
+        run = run + 1 if cheap else 0
+        if run > length:
+            length, end = run, i
+    length = min(length, p)
+    o = (end - length + 1 + (length - 1) // 2) % p
+    return p, x0 - (p - o) % p
 
-# Get the background color from the top-left corner (should be the background)
-background_color = img.getpixel((0, 0))
 
-# Crop and save each state with transparency
-for i, state in enumerate(states):
-    top = i * row_height
-    bottom = (i + 1) * row_height
+def frame_cells(band: np.ndarray, segments: list) -> tuple:
+    """(cell width, [(cell x0, [segment parts in that cell])], on grid) for one row.
 
-    # Crop the row
-    cropped = img.crop((0, top, width, bottom))
+    On a regular grid every non-empty cell is a frame, with the frame's
+    offset inside its cell preserved; pieces of one frame (e.g. debris in a
+    death animation) stay together, and a segment crossing a cell edge is
+    split at it.  Otherwise every segment is a frame, centred in a cell as
+    wide as the widest one, and ``on grid`` is False.
+    """
+    grid = grid_pitch(band, segments)
+    if grid is None:
+        width = max(e - s for s, e in segments)
+        return width, [(int(round((s + e - width) / 2.0)), [(s, e)]) for s, e in segments], False
+    pitch, origin = grid
+    cells = {}
+    for s, e in segments:
+        for k in range((s - origin) // pitch, (e - 1 - origin) // pitch + 1):
+            x0 = origin + k * pitch
+            cells.setdefault(k, []).append((max(s, x0), min(e, x0 + pitch)))
+    return pitch, [(origin + k * pitch, parts) for k, parts in sorted(cells.items())], True
 
-    # Remove text area (fixed amount from left to remove all text labels)
-    # Text labels take up approximately 180 pixels
-    crop_left = 180
-    sprites_only = cropped.crop((crop_left, 0, cropped.width, cropped.height))
+# ---------------------------------------------------------------------------
+# Sheets
+# ---------------------------------------------------------------------------
 
-    # Convert background color to transparent
-    data = sprites_only.getdata()
-    new_data = []
-    for item in data:
-        if item[:3] == background_color[:3]:  # Compare RGB values
-            new_data.append((255, 255, 255, 0))  # Fully transparent
+def split_sheet(job: tuple) -> dict:
+    """Worker: split one sheet and write its strips + metadata; returns the metadata."""
+    sheet, out_dir, prefix, states, opts = job
+    rgba = np.array(Image.open(sheet).convert("RGBA"))
+    bg = tuple(opts["bg"]) if opts["bg"] else background_colour(rgba)
+    opaque = key_background(rgba, bg, opts["tolerance"])
+
+    rows = [r for r in runs(opaque.any(axis=1), opts["gap"]) if r[1] - r[0] >= opts["min_size"]]
+    names = list(states or [])
+    if names and len(names) != len(rows):
+        print(f"  WARN: {sheet.name}: found {len(rows)} row(s) but {len(names)} state name(s); "
+              f"naming rows row<N>", file=sys.stderr)
+        names = []
+    names = names or [f"row{i}" for i in range(len(rows))]
+
+    meta = {"sheet": sheet.name, "background": "#%02x%02x%02x" % bg, "tolerance": opts["tolerance"], "rows": []}
+    for name, (y0, y1) in zip(names, rows):
+        band = opaque[y0:y1]
+        segments = [s for s in runs(band.any(axis=0), opts["gap"]) if s[1] - s[0] >= opts["min_size"]]
+        if opts["labels"]:
+            segments = strip_label(segments)
+        if not segments:
+            continue
+        cell_w, cells, on_grid = frame_cells(band, segments)
+        if not on_grid and len(segments) > 1:
+            print(f"  WARN: {sheet.name}: row {name}: no regular frame grid found; "
+                  f"cutting one frame per segment ({len(segments)} frame(s))", file=sys.stderr)
+        h = y1 - y0
+        strip = np.zeros((h, cell_w * len(cells), 4), dtype=np.uint8)
+        frames = []
+        for i, (x0, segs) in enumerate(cells):
+            # Copy only the frame's own columns, so a neighbour never leaks into the cell
+            for s0, s1 in segs:
+                c0, c1 = max(s0, x0), min(s1, x0 + cell_w)
+                strip[:, i * cell_w + c0 - x0:i * cell_w + c1 - x0] = rgba[y0:y1, c0:c1]
+            s0, s1 = segs[0][0], segs[-1][1]
+            ys = np.flatnonzero(band[:, s0:s1].any(axis=1))
+            frames.append({
+                "cell": [i * cell_w, 0, cell_w, h],
+                "source": [s0, y0 + int(ys[0]), s1 - s0, int(ys[-1] - ys[0]) + 1],
+            })
+        path = out_dir / f"{prefix}_{name}.png"
+        Image.fromarray(strip, "RGBA").save(path)
+        meta["rows"].append({"state": name, "file": path.name, "frame_size": [cell_w, h],
+                             "source_y": y0, "frames": frames})
+
+    (out_dir / f"{prefix}_frames.json").write_text(json.dumps(meta, indent=2) + "\n", encoding="utf-8")
+    return meta
+
+
+# ---------------------------------------------------------------------------
+# Self-test
+# ---------------------------------------------------------------------------
+
+def _label(scale: int, glyphs: int) -> np.ndarray:
+    """A fake text label: a run of 3x5 blocks, like a pixel font."""
+    glyph = np.ones((5 * scale, 3 * scale), dtype=bool)
+    space = np.zeros((5 * scale, scale), dtype=bool)
+    return np.hstack([glyph if i % 2 == 0 else space for i in range(2 * glyphs - 1)])
+
+
+def selftest(strips_dir: Path = OWLET_STRIPS) -> bool:
+    """Split labelled sheets built from <name>_<N>.png strips; True if every frame survives.
+
+    One sheet per scale (1x, 2x, 3x, nearest-neighbour), one row per strip on
+    a magenta background, each row behind a label of a different length so
+    the frames sit at a different offset on every row.
+    """
+    strips = sorted(p for p in strips_dir.glob("*_*.png") if re.search(r"_\d+$", p.stem))
+    if not strips:
+        print(f"ERROR: no <name>_<N>.png strips in {strips_dir}", file=sys.stderr)
+        return False
+    bg = (255, 0, 255)
+    failures = 0
+    with tempfile.TemporaryDirectory(prefix="split_sprites_") as tmp:
+        tmp = Path(tmp)
+        for scale in (1, 2, 3):
+            images = []
+            for p in strips:
+                im = Image.open(p).convert("RGBA")
+                images.append(np.array(im.resize((im.width * scale, im.height * scale), Image.NEAREST)))
+            pad = 8 * scale
+            width = pad + 40 * scale + 48 * scale + max(a.shape[1] for a in images) + pad
+            height = pad + sum(a.shape[0] + pad for a in images)
+            sheet = np.zeros((height, width, 4), dtype=np.uint8)
+            sheet[...] = bg + (255,)
+            y = pad
+            for i, a in enumerate(images):
+                label = _label(scale, 2 + i % 5)
+                sheet[y + 4 * scale:y + 4 * scale + label.shape[0], pad:pad + label.shape[1]] = (255, 255, 255, 255)
+                x = pad + label.shape[1] + 48 * scale + i * 3 * scale % 29
+                opaque = a[..., 3] > 0
+                sheet[y:y + a.shape[0], x:x + a.shape[1]][opaque] = a[opaque]
+                y += a.shape[0] + pad
+            path = tmp / f"owlet_{scale}x.png"
+            Image.fromarray(sheet, "RGBA").save(path)
+            out = tmp / f"{scale}x"
+            out.mkdir()
+            opts = {"bg": None, "tolerance": 0, "gap": 0, "min_size": 2, "labels": True}
+            meta = split_sheet((path, out, "owlet", [p.stem for p in strips], opts))
+
+            rows = {row["state"]: row for row in meta["rows"]}
+            for p, a in zip(strips, images):
+                count = int(p.stem.rsplit("_", 1)[1])
+                pitch = a.shape[1] // count
+                row = rows.get(p.stem)
+                got = None if row is None else np.array(Image.open(out / row["file"]))
+                problem = None
+                if row is None:
+                    problem = "row not found"
+                elif len(row["frames"]) != count or row["frame_size"][0] != pitch:
+                    problem = (f"{len(row['frames'])} frame(s) of {row['frame_size'][0]} px, "
+                               f"expected {count} of {pitch} px")
+                else:
+                    for i in range(count):
+                        if not np.array_equal(_trimmed(a[:, i * pitch:(i + 1) * pitch]),
+                                              _trimmed(got[:, i * pitch:(i + 1) * pitch])):
+                            problem = f"frame {i} differs"
+                            break
+                print(f"  {'FAIL' if problem else 'ok  '}  {scale}x  {p.stem}"
+                      + (f": {problem}" if problem else ""))
+                failures += problem is not None
+    print(f"{failures} failure(s)" if failures else "All frames recovered.")
+    return not failures
+
+
+def _trimmed(cell: np.ndarray) -> np.ndarray:
+    """RGBA pixels of a cell cropped to its opaque bounding box."""
+    opaque = cell[..., 3] > 0
+    if not opaque.any():
+        return cell[:0, :0]
+    ys, xs = np.flatnonzero(opaque.any(axis=1)), np.flatnonzero(opaque.any(axis=0))
+    return cell[ys[0]:ys[-1] + 1, xs[0]:xs[-1] + 1]
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def _sheets(inputs: list) -> list:
+    sheets = []
+    for p in inputs:
+        if p.is_dir():
+            sheets.extend(sorted(q for q in p.iterdir() if q.suffix.lower() == ".png"))
         else:
-            new_data.append(item)
+            sheets.append(p)
+    return sheets
+
+
+def _parse_colour(text: str) -> tuple:
+    text = text.lstrip("#")
+    if len(text) != 6:
+        raise argparse.ArgumentTypeError("expected #rrggbb")
+    return tuple(int(text[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Split sprite sheets into per-state strips with transparent backgrounds",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("inputs",      nargs="*", type=Path, help="Sheet PNGs and/or directories of sheets")
+    parser.add_argument("--out",       type=Path, help="Output directory")
+    parser.add_argument("--prefix",    help="Strip name prefix (single sheet only; default: sheet name)")
+    parser.add_argument("--states",    help="Comma-separated state names, top row first")
+    parser.add_argument("--bg",        type=_parse_colour, help="Background colour #rrggbb (default: corners)")
+    parser.add_argument("--tolerance", type=int, default=0, help="Max per-channel difference keyed as background")
+    parser.add_argument("--gap",       type=int, default=0, help="Bridge transparent gaps up to N px inside a frame/row")
+    parser.add_argument("--min-size",  type=int, default=2, help="Ignore rows / frames thinner than N px (specks)")
+    parser.add_argument("--labels",    action="store_true", help="Rows start with a text label; drop it")
+    parser.add_argument("--jobs",      type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--selftest",  action="store_true", help="Split sheets built from the Owlet strips and verify")
+    args = parser.parse_args()
+
+    if args.selftest:
+        sys.exit(0 if selftest() else 1)
+    if not args.inputs or args.out is None:
+        parser.error("give sheet PNGs / directories and --out")
+
+    sheets = _sheets(args.inputs)
+    missing = [s for s in sheets if not s.is_file()]
+    if missing:
+        print(f"ERROR: not found: {', '.join(map(str, missing))}", file=sys.stderr)
+        sys.exit(2)
+    if not sheets:
+        print("ERROR: no PNG sheets given", file=sys.stderr)
+        sys.exit(2)
+    if args.prefix and len(sheets) > 1:
+        parser.error("--prefix only applies to a single sheet")
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    states = [s.strip() for s in args.states.split(",")] if args.states else None
+    opts = {"bg": args.bg, "tolerance": args.tolerance, "gap": args.gap,
+            "min_size": args.min_size, "labels": args.labels}
+    jobs = [(s, args.out, args.prefix or s.stem, states, opts) for s in sheets]
+    if len(jobs) > 1 and args.jobs != 1:
+        with ProcessPoolExecutor(max_workers=min(args.jobs or os.cpu_count() or 1, len(jobs))) as pool:
+            results = list(pool.map(split_sheet, jobs))
+    else:
+        results = [split_sheet(job) for job in jobs]
 
-    sprites_only.putdata(new_data)
+    for (sheet, _, prefix, _, _), meta in zip(jobs, results):
+        for row in meta["rows"]:
+            w, h = row["frame_size"]
+            print(f"  Saved: {args.out / row['file']}  ({len(row['frames'])} frame(s) of {w}x{h})")
+    print(f"Done! {len(results)} sheet(s) split with transparent backgrounds.")
 
-    # Save as PNG with transparency
-    output_path = os.path.join(output_dir, f'player_{state}.png')
-    sprites_only.save(output_path, 'PNG')
-    print(f'Saved: {output_path}')
 
-print('Done! Sprite sheets split with transparent backgrounds.')
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+telemetry_columns.py -- Columnar, memory-mapped store for telemetry exports
+
+Converts exported ``events`` rows (the formats telemetry_tool.py reads) into
+a directory of NumPy ``.npy`` columns:
+
+  player_id, session_id, event_name, game_version, level_id
+      int32 codes into a per-column dictionary (<column>.dict.json); -1 = missing
+  created_at
+      int64 microseconds since the Unix epoch (UTC); NULL_INT = missing
+  data.<field>
+      the event_data fields TelemetryManager sends, one typed column each
+      (see DATA_FIELDS): strings dictionary-encoded as above, ints int64 with
+      NULL_INT, floats float64 with NaN, bools int8 with -1 = missing.
+      Fields not in DATA_FIELDS go to data.extra as a dictionary-encoded
+      JSON object.
+
+Conversion streams rows in chunks straight to disk, so only the string
+dictionaries are held in memory.  Queries open columns with
+``np.load(mmap_mode="r")`` and touch only the columns they use: filtering by
+version / days (like the dashboard's old ``_fetchEvents``) and grouping by a
+level or event column are a handful of vectorized array operations.
+
+Usage:
+  python tools/telemetry_columns.py telemetry.cols --from events.jsonl export.csv.gz
+      (Re)build the store from exports.
+
+  python tools/telemetry_columns.py telemetry.cols --info
+      Print row count, columns, dtypes and dictionary sizes.
+
+  python tools/telemetry_columns.py telemetry.cols --by level_id --event player_died
+      Deaths per level.  Add --version / --days to filter and
+      --distinct session_id to count sessions instead of rows.
+
+  python tools/telemetry_columns.py telemetry.cols --by data.phase --event boss_phase_changed --json
+      Group by an int column; print JSON instead of a table.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+import telemetry_tool
+
+# ---------------------------------------------------------------------------
+# Schema
+# ---------------------------------------------------------------------------
+
+STORE_SCHEMA = 1
+CHUNK_ROWS   = 1 << 16
+
+NULL_INT = np.iinfo(np.int64).min
+EPOCH    = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+STRING_COLUMNS = ["player_id", "session_id", "event_name", "game_version", "level_id"]
+
+# event_data field -> kind ("str", "int", "float", "bool"), from TelemetryManager.track() calls
+DATA_FIELDS = {
+    "level_id":            "str",
+    "deaths_this_session": "int",
+    "death_count":         "int",
+    "quest_key":           "str",
+    "value":               "bool",
+    "max_health":          "float",
+    "phase":               "int",
+    "achievement_id":      "str",
+    "from_level":          "str",
+    "to_level":            "str",
+    "destination":         "str",
+    "is_exit":             "bool",
+}
+
+_DTYPES = {"str": np.int32, "int": np.int64, "float": np.float64, "bool": np.int8, "time": np.int64}
+
+
+def _columns() -> dict:
+    """column name -> kind, in file order."""
+    cols = {name: "str" for name in STRING_COLUMNS}
+    cols["created_at"] = "time"
+    for field, kind in DATA_FIELDS.items():
+        cols[f"data.{field}"] = kind
+    cols["data.extra"] = "str"
+    return cols
+
+
+def time_us(t: datetime) -> int:
+    return (t - EPOCH) // timedelta(microseconds=1)
+
+# ---------------------------------------------------------------------------
+# Conversion
+# ---------------------------------------------------------------------------
+
+class _Encoder:
+    """Accumulates one chunk of rows as per-column Python lists."""
+
+    def __init__(self, columns: dict):
+        self.columns = columns
+        self.dicts = {name: {} for name, kind in columns.items() if kind == "str"}
+        self.lists = {name: [] for name in columns}
+
+    def _code(self, name: str, value) -> int:
+        if value is None or value == "":
+            return -1
+        if not isinstance(value, str):
+            value = json.dumps(value, sort_keys=True)
+        d = self.dicts[name]
+        code = d.get(value)
+        if code is None:
+            code = d[value] = len(d)
+        return code
+
+    def add(self, row: dict):
+        lists = self.lists
+        for name in STRING_COLUMNS:
+            lists[name].append(self._code(name, row.get(name)))
+        t = telemetry_tool.parse_time(row.get("created_at"))
+        lists["created_at"].append(NULL_INT if t is None else time_us(t))
+
+        data = telemetry_tool.event_data(row)
+        for field, kind in DATA_FIELDS.items():
+            v = data.get(field)
+            name = f"data.{field}"
+            if kind == "str":
+                lists[name].append(self._code(name, v))
+            elif kind == "int":
+                lists[name].append(_to_int(v))
+            elif kind == "float":
+                lists[name].append(_to_float(v))
+            else:
+                lists[name].append(-1 if v is None else int(bool(v)))
+        extra = {k: v for k, v in data.items() if k not in DATA_FIELDS}
+        lists["data.extra"].append(self._code("data.extra", extra or None))
+
+    def flush(self, files: dict) -> int:
+        n = len(self.lists["created_at"])
+        for name, values in self.lists.items():
+            np.asarray(values, dtype=_DTYPES[self.columns[name]]).tofile(files[name])
+            values.clear()
+        return n
+
+
+def _to_int(v) -> int:
+    if v is None:
+        return NULL_INT
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        return NULL_INT
+
+
+def _to_float(v) -> float:
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _write_npy(path: Path, raw: Path, dtype, rows: int):
+    """Wrap a raw column file in an .npy header (data stays 64-byte aligned for mmap)."""
+    with open(path, "wb") as out, open(raw, "rb") as src:
+        np.lib.format.write_array_header_1_0(out, {
+            "descr": np.lib.format.dtype_to_descr(np.dtype(dtype)),
+            "fortran_order": False,
+            "shape": (rows,),
+        })
+        shutil.copyfileobj(src, out, 1 << 20)
+
+
+def convert(rows, out_dir: Path, chunk_rows: int = CHUNK_ROWS) -> int:
+    """Write ``rows`` as a column store at ``out_dir``; returns the row count.
+
+    The store is built in a sibling temp directory and swapped in at the end,
+    so readers never see a half-written store.
+    """
+    out_dir = Path(out_dir)
+    out_dir.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=out_dir.parent, prefix=f".{out_dir.name}."))
+    columns = _columns()
+    enc = _Encoder(columns)
+    total = 0
+    try:
+        files = {name: open(tmp / f"{name}.raw", "wb") for name in columns}
+        try:
+            for row in rows:
+                enc.add(row)
+                if len(enc.lists["created_at"]) >= chunk_rows:
+                    total += enc.flush(files)
+            total += enc.flush(files)
+        finally:
+            for f in files.values():
+                f.close()
+
+        meta = {"schema": STORE_SCHEMA, "rows": total, "columns": {}}
+        for name, kind in columns.items():
+            raw = tmp / f"{name}.raw"
+            _write_npy(tmp / f"{name}.npy", raw, _DTYPES[kind], total)
+            raw.unlink()
+            meta["columns"][name] = {"kind": kind, "dtype": np.dtype(_DTYPES[kind]).name}
+            if kind == "str":
+                values = list(enc.dicts[name])
+                (tmp / f"{name}.dict.json").write_text(json.dumps(values, ensure_ascii=False), encoding="utf-8")
+                meta["columns"][name]["values"] = len(values)
+        (tmp / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+        old = None
+        if out_dir.exists():
+            old = out_dir.with_name(f".{out_dir.name}.old")
+            shutil.rmtree(old, ignore_errors=True)
+            os.replace(out_dir, old)
+        os.replace(tmp, out_dir)
+        if old is not None:
+            shutil.rmtree(old, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return total
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+class EventStore:
+    """Read-only view of a column store.  Columns are memory-mapped on first use."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.meta = json.loads((self.path / "meta.json").read_text(encoding="utf-8"))
+        if self.meta.get("schema") != STORE_SCHEMA:
+            raise ValueError(f"{self.path}: store schema {self.meta.get('schema')}, expected {STORE_SCHEMA}")
+        self.rows = self.meta["rows"]
+        self._columns: dict[str, np.ndarray] = {}
+        self._dicts: dict[str, list] = {}
+
+    def kind(self, name: str) -> str:
+        try:
+            return self.meta["columns"][name]["kind"]
+        except KeyError:
+            raise KeyError(f"no column {name!r} (have: {', '.join(self.meta['columns'])})") from None
+
+    def column(self, name: str) -> np.ndarray:
+        col = self._columns.get(name)
+        if col is None:
+            self.kind(name)
+            col = self._columns[name] = np.load(self.path / f"{name}.npy", mmap_mode="r")
+        return col
+
+    def dictionary(self, name: str) -> list:
+        d = self._dicts.get(name)
+        if d is None:
+            if self.kind(name) != "str":
+                raise ValueError(f"column {name!r} is not dictionary-encoded")
+            d = self._dicts[name] = json.loads((self.path / f"{name}.dict.json").read_text(encoding="utf-8"))
+        return d
+
+    def code(self, name: str, value: str) -> int:
+        """Dictionary code of ``value`` in column ``name``, or -2 if it never occurs."""
+        try:
+            return self.dictionary(name).index(value)
+        except ValueError:
+            return -2
+
+    def mask(self, version: str = None, days: int = 0, since: datetime = None,
+             event: str = None) -> np.ndarray:
+        """Boolean row mask, the same filters as the dashboard's old ``_fetchEvents``."""
+        m = np.ones(self.rows, dtype=bool)
+        if version:
+            m &= self.column("game_version") == self.code("game_version", version)
+        if days > 0 and since is None:
+            since = datetime.now(timezone.utc) - timedelta(days=days)
+        if since is not None:
+            m &= self.column("created_at") >= time_us(since)
+        if event:
+            m &= self.column("event_name") == self.code("event_name", event)
+        return m
+
+    def group_count(self, by: str, mask: np.ndarray = None, distinct: str = None) -> dict:
+        """value of ``by`` -> rows (or distinct values of ``distinct``) among masked rows."""
+        keys = self.column(by)
+        if mask is not None:
+            keys = keys[mask]
+        kind = self.kind(by)
+        if distinct:
+            other = self.column(distinct)
+            if mask is not None:
+                other = other[mask]
+            pairs = np.unique(np.stack([keys.astype(np.int64), other.astype(np.int64)]), axis=1)
+            keys = pairs[0]
+        values, counts = np.unique(keys, return_counts=True)
+        if kind == "str":
+            names = self.dictionary(by)
+            labels = [names[v] if v >= 0 else None for v in values.tolist()]
+        elif kind in ("int", "time"):
+            labels = [None if v == NULL_INT else v for v in values.tolist()]
+        elif kind == "bool":
+            labels = [None if v < 0 else bool(v) for v in values.tolist()]
+        else:
+            labels = values.tolist()
+        return dict(sorted(zip(labels, counts.tolist()), key=lambda kv: -kv[1]))
+
+    def info(self) -> dict:
+        cols = {}
+        for name, c in self.meta["columns"].items():
+            size = (self.path / f"{name}.npy").stat().st_size
+            cols[name] = {**c, "bytes": size}
+        return {"rows": self.rows, "columns": cols}
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert and query columnar telemetry stores",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("store",      type=Path, help="Store directory")
+    parser.add_argument("--from",     dest="sources", nargs="+", metavar="FILE",
+                        help="Rebuild the store from .jsonl / .csv exports (optionally .gz)")
+    parser.add_argument("--info",     action="store_true", help="Describe the store")
+    parser.add_argument("--by",       metavar="COLUMN", help="Group by this column (e.g. level_id, event_name, data.phase)")
+    parser.add_argument("--event",    help="Only rows with this event_name")
+    parser.add_argument("--version",  help="Only rows with this game_version")
+    parser.add_argument("--days",     type=int, default=0, help="Only rows from the last N days")
+    parser.add_argument("--distinct", metavar="COLUMN", help="Count distinct values of COLUMN (e.g. session_id)")
+    parser.add_argument("--json",     action="store_true", help="Print JSON")
+    args = parser.parse_args()
+
+    if args.sources:
+        rows = (row for path in args.sources for row in telemetry_tool.iter_file(path))
+        n = convert(rows, args.store)
+        print(f"  {n} row(s) written to {args.store}", file=sys.stderr)
+
+    if not (args.info or args.by):
+        return
+    store = EventStore(args.store)
+    if args.info:
+        info = store.info()
+        if args.json:
+            print(json.dumps(info, indent=2))
+        else:
+            print(f"  {info['rows']} row(s)")
+            for name, c in info["columns"].items():
+                extra = f"  {c['values']} value(s)" if "values" in c else ""
+                print(f"    {name:<26} {c['dtype']:<8} {c['bytes'] / 1024:10.1f} KB{extra}")
+    if args.by:
+        try:
+            mask = store.mask(args.version, args.days, event=args.event)
+            groups = store.group_count(args.by, mask, args.distinct)
+        except KeyError as e:
+            print(f"ERROR: {e.args[0]}", file=sys.stderr)
+            sys.exit(2)
+        if args.json:
+            print(json.dumps({str(k): v for k, v in groups.items()}, indent=2))
+        else:
+            unit = f"distinct {args.distinct}" if args.distinct else "rows"
+            print(f"  {int(mask.sum())} matching row(s); {unit} by {args.by}:")
+            for k, v in groups.items():
+                print(f"    {v:>10}  {k}")
+
+
+if __name__ == "__main__":
+    main()
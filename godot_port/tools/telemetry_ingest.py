@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+telemetry_ingest.py -- Local stand-in for the Supabase telemetry endpoint
+
+Accepts what TelemetryManager._flush_buffer() sends to
+``SUPABASE_URL + "/rest/v1/events"``: a POST with ``apikey`` and
+``Authorization: Bearer`` headers, ``Content-Type: application/json``,
+``Prefer: return=minimal`` and a JSON array of rows (a single row object is
+accepted too, as PostgREST does).  Rows get a server-side ``created_at`` and
+are appended to a JSONL file that telemetry_tool.py / telemetry_columns.py
+read directly.
+
+Requests are handled concurrently.  They hand their encoded rows to one
+writer thread, which appends everything that queued up while the previous
+write was in progress in a single write() (group commit) and then
+acknowledges those requests.  The file is only ever appended to.
+
+Usage:
+  python tools/telemetry_ingest.py
+      Listen on :8787 and append to tools/.cache/telemetry/events.jsonl.
+      Point the game at it by setting Constants.SUPABASE_URL to
+      "http://127.0.0.1:8787".
+
+  python tools/telemetry_ingest.py --port 9000 --out events.jsonl --key KEY --fsync
+      Require that API key, and fsync every group commit.
+
+  GET /stats returns request / row / write counters as JSON.
+"""
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import orjson as _fastjson   # optional: several times faster than stdlib json
+except ImportError:
+    _fastjson = None
+
+TOOLS_DIR    = Path(__file__).parent
+DEFAULT_OUT  = TOOLS_DIR / ".cache" / "telemetry" / "events.jsonl"
+DEFAULT_PORT = 8787
+EVENTS_PATH  = "/rest/v1/events"
+MAX_BODY     = 1 << 20
+
+# ---------------------------------------------------------------------------
+# Append-only writer
+# ---------------------------------------------------------------------------
+
+class _Pending:
+    __slots__ = ("data", "rows", "done", "error")
+
+    def __init__(self, data: bytes, rows: int):
+        self.data = data
+        self.rows = rows
+        self.done = threading.Event()
+        self.error = None
+
+
+class AppendWriter:
+    """Group-commits JSONL chunks from many threads to one append-only file."""
+
+    def __init__(self, path: Path, fsync: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fsync = fsync
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.stats = {"rows": 0, "bytes": 0, "writes": 0, "largest_write_rows": 0}
+        self._file = open(self.path, "ab", buffering=0)
+        self._thread = threading.Thread(target=self._run, name="ingest-writer", daemon=True)
+        self._thread.start()
+
+    def append(self, data: bytes, rows: int):
+        """Queue ``data`` and block until it is written; re-raises write errors."""
+        p = _Pending(data, rows)
+        self.queue.put(p)
+        p.done.wait()
+        if p.error is not None:
+            raise p.error
+
+    def _run(self):
+        while True:
+            first = self.queue.get()
+            if first is None:
+                return
+            group = [first]
+            while True:
+                try:
+                    p = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if p is None:
+                    self.queue.put(None)
+                    break
+                group.append(p)
+            data = b"".join(p.data for p in group)
+            try:
+                self._file.write(data)
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+            except OSError as e:
+                for p in group:
+                    p.error = e
+            else:
+                rows = sum(p.rows for p in group)
+                self.stats["rows"] += rows
+                self.stats["bytes"] += len(data)
+                self.stats["writes"] += 1
+                self.stats["largest_write_rows"] = max(self.stats["largest_write_rows"], rows)
+            for p in group:
+                p.done.set()
+
+    def close(self):
+        self.queue.put(None)
+        self._thread.join()
+        self._file.close()
+
+# ---------------------------------------------------------------------------
+# Request handling
+# ---------------------------------------------------------------------------
+
+def _dumps(obj) -> bytes:
+    if _fastjson is not None:
+        return _fastjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _loads(raw: bytes):
+    if _fastjson is not None:
+        return _fastjson.loads(raw)
+    return json.loads(raw)
+
+
+class IngestError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def encode_rows(body: bytes, now: str) -> tuple:
+    """Validate a POST body; returns (JSONL bytes, row count).
+
+    Rows must be objects with an event_name.  created_at is set to ``now``
+    unless the client sent one.
+    """
+    try:
+        payload = _loads(body)
+    except ValueError as e:
+        raise IngestError(400, f"invalid JSON: {e}") from None
+    if isinstance(payload, dict):
+        payload = [payload]
+    if not isinstance(payload, list):
+        raise IngestError(400, "body must be a JSON array of rows")
+    lines = []
+    for i, row in enumerate(payload):
+        if not isinstance(row, dict) or not row.get("event_name"):
+            raise IngestError(400, f"row {i}: expected an object with event_name")
+        if not row.get("created_at"):
+            row["created_at"] = now
+        lines.append(_dumps(row))
+    lines.append(b"")
+    return b"\n".join(lines), len(payload)
+
+
+def make_handler(writer: AppendWriter, key: str = None, max_body: int = MAX_BODY):
+    import http.server
+
+    counters = {"requests": 0, "rejected": 0}
+    lock = threading.Lock()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            try:
+                status, body = self._ingest()
+            except IngestError as e:
+                with lock:
+                    counters["rejected"] += 1
+                status, body = e.status, _dumps({"message": e.message})
+            self._reply(status, body)
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/stats":
+                self._reply(404, _dumps({"message": "not found"}))
+                return
+            with lock:
+                stats = {**counters, **writer.stats}
+            self._reply(200, _dumps(stats))
+
+        def _ingest(self) -> tuple:
+            # Read the body first so a rejected request leaves the keep-alive
+            # connection usable for the client's next batch
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+            except ValueError:
+                length = -1
+            if not 0 <= length <= max_body:
+                self.close_connection = True
+                raise IngestError(413 if length > 0 else 400, f"Content-Length must be 0..{max_body}")
+            body = self.rfile.read(length)
+
+            if self.path.split("?")[0] != EVENTS_PATH:
+                raise IngestError(404, "not found")
+            if key is not None:
+                if self.headers.get("apikey") != key or self.headers.get("Authorization") != f"Bearer {key}":
+                    raise IngestError(401, "invalid API key")
+            elif not self.headers.get("apikey"):
+                raise IngestError(401, "no API key found in request")
+            if not self.headers.get("Content-Type", "").startswith("application/json"):
+                raise IngestError(415, "Content-Type must be application/json")
+            data, rows = encode_rows(body, datetime.now(timezone.utc).isoformat())
+            try:
+                writer.append(data, rows)
+            except OSError as e:
+                raise IngestError(500, f"write failed: {e}") from None
+            with lock:
+                counters["requests"] += 1
+            if "return=representation" in self.headers.get("Prefer", ""):
+                return 201, b"[" + data.rstrip(b"\n").replace(b"\n", b",") + b"]"
+            return 201, b""
+
+        def _reply(self, status: int, body: bytes):
+            self.send_response(status)
+            if body:
+                self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def make_server(port: int, out: Path, key: str = None, fsync: bool = False, host: str = ""):
+    """A ThreadingHTTPServer (not yet serving) and its AppendWriter."""
+    import http.server
+
+    writer = AppendWriter(out, fsync)
+    server = http.server.ThreadingHTTPServer((host, port), make_handler(writer, key))
+    server.daemon_threads = True
+    return server, writer
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Receive TelemetryManager batches locally",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--port",  type=int, default=DEFAULT_PORT)
+    parser.add_argument("--host",  default="", help="Bind address (default: all interfaces)")
+    parser.add_argument("--out",   type=Path, default=DEFAULT_OUT, help="JSONL file to append to")
+    parser.add_argument("--key",   help="Require this apikey / Bearer token (default: any)")
+    parser.add_argument("--fsync", action="store_true", help="fsync after every group commit")
+    args = parser.parse_args()
+
+    server, writer = make_server(args.port, args.out, args.key, args.fsync, args.host)
+    print(f"  Telemetry ingest: http://localhost:{server.server_address[1]}{EVENTS_PATH}")
+    print(f"  Appending to {args.out}. Press Ctrl+C to stop.\n")
+    t0 = time.perf_counter()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
+    writer.close()
+    s = writer.stats
+    print(f"\n  {s['rows']} row(s) in {s['writes']} write(s) over {time.perf_counter() - t0:.0f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
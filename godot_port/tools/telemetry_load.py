@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+telemetry_load.py -- Load generator for the telemetry ingest endpoint
+
+Simulates many players running TelemetryManager at once.  Each player owns
+one keep-alive connection (the game's persistent HTTPRequest), buffers a
+realistic event mix at --rate events per second, caps the buffer at
+TELEMETRY_MAX_BUFFER and POSTs it every TELEMETRY_BATCH_INTERVAL seconds
+with the same headers and stringified event_data the game sends.  Interval,
+buffer cap, game version and level IDs are read from core/Constants.gd and
+data/LevelDefs.gd.
+
+Reports request latency percentiles, requests/s and events/s.
+
+Usage:
+  python tools/telemetry_load.py --spawn
+      Start telemetry_ingest.py in-process on a free port (appending to a
+      temp file) and run 200 players for 30 s against it.
+
+  python tools/telemetry_load.py --url http://127.0.0.1:8787 --players 1000 --duration 60
+      Load an already running ingest server (or anything speaking the
+      Supabase REST insert API; https:// URLs are fine).  The API key
+      defaults to a placeholder, never the game's production anon key --
+      pass --key to load a real project on purpose.
+
+  python tools/telemetry_load.py --spawn --interval 1 --rate 20
+      Stress test: flush every second with 20 events/s per player.
+"""
+
+import argparse
+import http.client
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import gdscript_consts
+import telemetry_ingest
+
+TOOLS_DIR = Path(__file__).parent
+GODOT_DIR = TOOLS_DIR.parent
+
+DEFAULT_KEY = "local"   # placeholder; a telemetry_ingest started without --key accepts any key
+
+# event name -> relative weight once a level is running
+EVENT_WEIGHTS = {
+    "player_died":          30,
+    "enemy_killed":         25,
+    "player_spawned":       12,
+    "quest_progressed":      8,
+    "door_entered":          6,
+    "level_completed":       5,
+    "portal_used":           3,
+    "boss_phase_changed":    2,
+    "boss_fight_started":    1,
+    "boss_fight_ended":      1,
+    "achievement_unlocked":  1,
+}
+
+
+def _game_settings() -> dict:
+    consts = gdscript_consts.load_consts(GODOT_DIR / "core" / "Constants.gd")
+    levels = gdscript_consts.load_consts(GODOT_DIR / "data" / "LevelDefs.gd").get("ALL", [])
+    return {
+        "interval": float(consts.get("TELEMETRY_BATCH_INTERVAL", 10.0)),
+        "max_buffer": int(consts.get("TELEMETRY_MAX_BUFFER", 200)),
+        "version": consts.get("APP_VERSION", "0.0.0"),
+        "levels": [lv["id"] for lv in levels if isinstance(lv, dict) and lv.get("id")] or ["level_1"],
+    }
+
+# ---------------------------------------------------------------------------
+# Simulated player
+# ---------------------------------------------------------------------------
+
+class _Player:
+    """Produces the rows one TelemetryManager instance would buffer."""
+
+    def __init__(self, rng: random.Random, version: str, levels: list):
+        self.rng = rng
+        self.version = version
+        self.levels = levels
+        self.player_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        self.session_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        self.level = ""
+        self.deaths = 0
+        self.phase = 0
+        self.names = list(EVENT_WEIGHTS)
+        self.weights = list(EVENT_WEIGHTS.values())
+
+    def _row(self, name: str, data: dict = None) -> dict:
+        return {
+            "player_id": self.player_id,
+            "session_id": self.session_id,
+            "event_name": name,
+            "event_data": data or {},
+            "game_version": self.version,
+            "level_id": self.level,
+        }
+
+    def _start_level(self, level: str) -> dict:
+        self.level, self.deaths, self.phase = level, 0, 0
+        return self._row("level_started", {"level_id": level})
+
+    def next_event(self) -> dict:
+        if not self.level:
+            return self._start_level(self.rng.choice(self.levels))
+        name = self.rng.choices(self.names, self.weights)[0]
+        if name == "player_died":
+            self.deaths += 1
+            return self._row(name, {"death_count": self.deaths})
+        if name == "level_completed":
+            row = self._row(name, {"level_id": self.level, "deaths_this_session": self.deaths})
+            self.level = ""
+            return row
+        if name == "quest_progressed":
+            return self._row(name, {"quest_key": f"quest_{self.rng.randrange(40)}", "value": True})
+        if name == "boss_fight_started":
+            self.phase = 1
+            return self._row(name, {"max_health": 300.0})
+        if name == "boss_phase_changed":
+            self.phase = min(self.phase + 1, 3)
+            return self._row(name, {"phase": self.phase})
+        if name == "achievement_unlocked":
+            return self._row(name, {"achievement_id": f"ach_{self.rng.randrange(20)}"})
+        if name == "portal_used":
+            to = self.rng.choice(self.levels)
+            row = self._row(name, {"from_level": self.level, "to_level": to})
+            self.level = ""
+            return row
+        if name == "door_entered":
+            return self._row(name, {"destination": f"res://levels/{self.level}/Room.tscn",
+                                    "is_exit": self.rng.random() < 0.3})
+        return self._row(name)
+
+
+def _post(conn: http.client.HTTPConnection, path: str, key: str, batch: list) -> int:
+    payload = []
+    for event in batch:
+        row = dict(event)
+        row["event_data"] = json.dumps(row["event_data"], separators=(",", ":"))
+        payload.append(row)
+    conn.request("POST", path, body=json.dumps(payload).encode("utf-8"), headers={
+        "apikey": key,
+        "Authorization": f"Bearer {key}",
+        "Content-Type": "application/json",
+        "Prefer": "return=minimal",
+    })
+    resp = conn.getresponse()
+    resp.read()
+    return resp.status
+
+
+def _run_player(n: int, url, key: str, settings: dict, args, deadline: float, out: dict, lock):
+    rng = random.Random(args.seed * 100003 + n)
+    player = _Player(rng, settings["version"], settings["levels"])
+    interval = args.interval or settings["interval"]
+    latencies, statuses, sent = [], {}, 0
+    conn = None
+    buffer = [player._row("session_start")]
+    # Players launch at random points within one interval
+    next_flush = time.perf_counter() + rng.random() * interval
+    carry = 0.0
+    try:
+        while True:
+            now = time.perf_counter()
+            if next_flush > now:
+                time.sleep(max(0.0, min(next_flush, deadline) - now))
+            if time.perf_counter() >= deadline:
+                break
+            carry += args.rate * interval
+            for _ in range(int(carry)):
+                buffer.append(player.next_event())
+            carry -= int(carry)
+            if len(buffer) > settings["max_buffer"]:
+                buffer = buffer[-settings["max_buffer"]:]
+            if buffer:
+                batch, buffer = buffer, []
+                t0 = time.perf_counter()
+                try:
+                    if conn is None:
+                        conn_class = (http.client.HTTPSConnection if url.scheme == "https"
+                                      else http.client.HTTPConnection)
+                        conn = conn_class(url.hostname, url.port, timeout=8.0)
+                    status = _post(conn, url.path.rstrip("/") + telemetry_ingest.EVENTS_PATH, key, batch)
+                except (OSError, http.client.HTTPException):
+                    status = 0        # like the game: the batch is dropped, not retried
+                    if conn is not None:
+                        conn.close()
+                    conn = None
+                latencies.append(time.perf_counter() - t0)
+                statuses[status] = statuses.get(status, 0) + 1
+                if 200 <= status < 300:
+                    sent += len(batch)
+            next_flush += interval
+    finally:
+        # Merge whatever this player measured, even if the loop died
+        if conn is not None:
+            conn.close()
+        with lock:
+            out["latencies"].extend(latencies)
+            out["events"] += sent
+            for s, c in statuses.items():
+                out["statuses"][s] = out["statuses"].get(s, 0) + c
+
+
+def run_load(url: str, players: int, duration: float, args, settings: dict) -> dict:
+    parts = urlsplit(url)
+    key = args.key or DEFAULT_KEY
+    out = {"latencies": [], "events": 0, "statuses": {}}
+    lock = threading.Lock()
+    t0 = time.perf_counter()
+    deadline = t0 + duration
+    threads = [threading.Thread(target=_run_player, args=(n, parts, key, settings, args, deadline, out, lock),
+                                daemon=True) for n in range(players)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    lat = sorted(out["latencies"])
+
+    def pct(p: float) -> float:
+        return round(lat[min(len(lat) - 1, int(p * len(lat)))] * 1000, 2) if lat else 0.0
+
+    requests = len(lat)
+    return {
+        "players": players,
+        "seconds": round(elapsed, 2),
+        "interval": args.interval or settings["interval"],
+        "rate": args.rate,
+        "requests": requests,
+        "statuses": {str(k): v for k, v in sorted(out["statuses"].items())},
+        "events": out["events"],
+        "requests_per_s": round(requests / elapsed, 1),
+        "events_per_s": round(out["events"] / elapsed, 1),
+        "latency_ms": {"p50": pct(0.5), "p90": pct(0.9), "p99": pct(0.99), "max": pct(1.0)},
+    }
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay simulated TelemetryManager batches against an ingest endpoint",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--url",      help="Base URL (SUPABASE_URL); the events path is appended")
+    parser.add_argument("--spawn",    action="store_true", help="Run telemetry_ingest in-process and load it")
+    parser.add_argument("--players",  type=int, default=200)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--interval", type=float, default=0.0,
+                        help="Seconds between flushes (default: Constants.TELEMETRY_BATCH_INTERVAL)")
+    parser.add_argument("--rate",     type=float, default=0.5, help="Events per second per player")
+    parser.add_argument("--key",      help=f"API key (default: {DEFAULT_KEY!r}, which a keyless "
+                                           "telemetry_ingest accepts)")
+    parser.add_argument("--seed",     type=int, default=1)
+    parser.add_argument("--json",     action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    if not args.url and not args.spawn:
+        parser.error("give --url or --spawn")
+    settings = _game_settings()
+
+    server = writer = tmp = None
+    url = args.url
+    if args.spawn:
+        import tempfile
+        tmp = tempfile.TemporaryDirectory(prefix="telemetry_load_")
+        server, writer = telemetry_ingest.make_server(0, Path(tmp.name) / "events.jsonl", host="127.0.0.1")
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+    elif urlsplit(url).scheme not in ("http", "https") or not urlsplit(url).hostname:
+        parser.error(f"--url must be an http:// or https:// URL, got {url!r}")
+
+    print(f"  {args.players} player(s) x {args.duration:.0f}s against {url}", file=sys.stderr)
+    try:
+        report = run_load(url, args.players, args.duration, args, settings)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            writer.close()
+            report_writes = dict(writer.stats)
+            tmp.cleanup()
+    if server is not None:
+        report["server"] = report_writes
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    lat = report["latency_ms"]
+    print(f"  requests   {report['requests']:>10}  ({report['requests_per_s']}/s)  statuses {report['statuses']}")
+    print(f"  events     {report['events']:>10}  ({report['events_per_s']}/s)")
+    print(f"  latency    p50 {lat['p50']} ms  p90 {lat['p90']} ms  p99 {lat['p99']} ms  max {lat['max']} ms")
+    if "server" in report:
+        s = report["server"]
+        avg = s["rows"] / s["writes"] if s["writes"] else 0
+        print(f"  writes     {s['writes']:>10}  ({avg:.1f} rows per group commit)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+telemetry_tool.py -- Offline rollups of exported telemetry events
+
+Reads rows of the Supabase ``events`` table -- one per TelemetryManager.track()
+call: player_id, session_id, event_name, event_data (a JSON string),
+game_version, level_id and the table's created_at -- and folds them into a
+compact rollup JSON that the Game Bible's Analytics tab renders as-is:
+engagement totals, the session funnel, deaths and completion funnels per
+level, boss phase reach, portal / door flows, quest progress and session
+lengths.
+
+The rollup holds counts only -- no player IDs, session IDs or raw
+event_data -- and --write puts it in tools/.cache/, which is git-ignored:
+docs/ is published as-is (GitHub Pages), outside the dashboard's password
+gate, so telemetry must not land there.  quest_tool.py --serve serves the
+rollup beside the dashboard; elsewhere, open it with the Analytics tab's
+"Open File..." button.
+
+Rows are streamed.  Memory holds the rollup counters, the set of player IDs
+and the sessions still open -- never the rows -- so exports with millions of
+events are fine.  With time-ordered input (the default export order), a
+session is folded into the rollup once no event of it has been seen for
+--session-gap minutes of event time; use --session-gap 0 for unordered input.
+
+Usage:
+  python tools/telemetry_tool.py events.jsonl
+      Print the rollup of a JSONL export (one row object per line).
+
+  python tools/telemetry_tool.py export.csv.gz more.jsonl --write
+      Roll up several exports (.csv / .jsonl, optionally gzipped) and write
+      tools/.cache/telemetry-rollup.json, which quest_tool.py --serve
+      serves beside the dashboard.  Use --out PATH to write somewhere else.
+
+  python tools/telemetry_tool.py --supabase --version 0.4.0 --days 30 --write
+      Page the events straight out of Supabase's REST API instead of reading
+      files (needs SUPABASE_URL and SUPABASE_KEY in the environment; the
+      anon key in Constants.gd can insert but not read).
+
+  --version / --days keep only one game version / the last N days, like the
+  dashboard's old filters.
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+from array import array
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+try:
+    import orjson as _fastjson   # optional: several times faster than stdlib json
+except ImportError:
+    _fastjson = None
+
+# ---------------------------------------------------------------------------
+# Paths / constants
+# ---------------------------------------------------------------------------
+TOOLS_DIR    = Path(__file__).parent
+GODOT_DIR    = TOOLS_DIR.parent
+ROLLUP_FILE  = TOOLS_DIR / ".cache" / "telemetry-rollup.json"   # git-ignored, never published
+
+ROLLUP_SCHEMA = 1
+
+FUNNEL_STEPS = ["session_start", "level_started", "player_died", "level_completed",
+                "quest_progressed", "boss_fight_started", "boss_fight_ended", "achievement_unlocked"]
+
+# Session length histogram: (upper bound in seconds, label)
+SESSION_BUCKETS = [(60, "<1m"), (300, "1-5m"), (900, "5-15m"), (1800, "15-30m"),
+                   (3600, "30-60m"), (7200, "1-2h"), (float("inf"), "2h+")]
+
+SUPABASE_PAGE = 1000
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+def _loads(raw):
+    if _fastjson is not None:
+        return _fastjson.loads(raw)
+    return json.loads(raw)
+
+
+def _open_binary(path: str):
+    if path == "-":
+        return sys.stdin.buffer
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def iter_file(path: str):
+    """Row dicts from a .jsonl or .csv export (either optionally .gz)."""
+    base = path[:-3] if path.endswith(".gz") else path
+    with _open_binary(path) as f:
+        if base.endswith(".csv"):
+            yield from csv.DictReader(io.TextIOWrapper(f, encoding="utf-8", newline=""))
+            return
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = _loads(line)
+            except ValueError as e:
+                print(f"  WARN: {path}:{lineno}: invalid JSON -- {e}", file=sys.stderr)
+                continue
+            if isinstance(row, dict):
+                yield row
+
+
+def iter_supabase(url: str, key: str, version: str = None, since: datetime = None,
+                  page: int = SUPABASE_PAGE):
+    """Row dicts paged out of ``<url>/rest/v1/events`` in created_at order."""
+    from urllib.parse import urlencode
+    from urllib.request import Request, urlopen
+
+    params = [("select", "*"), ("order", "created_at.asc")]
+    if version:
+        params.append(("game_version", f"eq.{version}"))
+    if since is not None:
+        params.append(("created_at", f"gte.{since.isoformat()}"))
+    headers = {"apikey": key, "Authorization": f"Bearer {key}"}
+    offset = 0
+    while True:
+        query = urlencode(params + [("limit", page), ("offset", offset)])
+        with urlopen(Request(f"{url.rstrip('/')}/rest/v1/events?{query}", headers=headers)) as resp:
+            rows = _loads(resp.read())
+        yield from rows
+        if len(rows) < page:
+            return
+        offset += len(rows)
+
+
+def parse_time(value) -> datetime:
+    """created_at as an aware datetime (naive values are taken as UTC), or None."""
+    if not value:
+        return None
+    try:
+        t = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    return t if t.tzinfo else t.replace(tzinfo=timezone.utc)
+
+
+def event_data(row: dict) -> dict:
+    """The row's event_data, which TelemetryManager sends JSON-stringified."""
+    d = row.get("event_data")
+    if isinstance(d, dict):
+        return d
+    if not d:
+        return {}
+    try:
+        d = _loads(d)
+    except ValueError:
+        return {}
+    return d if isinstance(d, dict) else {}
+
+# ---------------------------------------------------------------------------
+# Rollup
+# ---------------------------------------------------------------------------
+
+class _Session:
+    __slots__ = ("first", "last", "steps", "started", "died", "completed", "boss")
+
+    def __init__(self):
+        self.first = None
+        self.last = None
+        self.steps = set()       # event names seen
+        self.started = set()     # level IDs
+        self.died = set()
+        self.completed = set()
+        self.boss = {}           # level ID -> highest phase reached
+
+
+def _level_stats() -> dict:
+    return {"started": 0, "completed": 0, "deaths": 0, "completion_deaths": 0,
+            "sessions": {"started": 0, "died": 0, "completed": 0}}
+
+
+class Rollup:
+    """Folds event rows into dashboard-ready aggregates.
+
+    Feed rows with ``add()``, then call ``result()`` once.
+    """
+
+    def __init__(self, version: str = None, since: datetime = None, session_gap: float = 360.0):
+        self.version = version
+        self.since = since
+        self.gap = timedelta(minutes=session_gap) if session_gap > 0 else None
+
+        self.rows = 0
+        self.skipped = 0
+        self.first = None
+        self.last = None
+        self.players = set()
+        self.events = Counter()
+        self.versions = Counter()
+        self.funnel = Counter()              # step -> sessions
+        self.levels: dict[str, dict] = {}
+        self.boss: dict[str, dict] = {}
+        self.portals = Counter()
+        self.doors = Counter()
+        self.quests = Counter()
+        self.achievements = Counter()
+
+        self.open: OrderedDict[str, _Session] = OrderedDict()   # least recently seen first
+        self.closed = 0
+        self.lengths = array("d")
+        self.late = 0                        # rows older than the gap behind the newest row
+
+    # -- per row --------------------------------------------------------------
+
+    def _level(self, lid: str) -> dict:
+        stats = self.levels.get(lid)
+        if stats is None:
+            stats = self.levels[lid] = _level_stats()
+        return stats
+
+    def add(self, row: dict):
+        name = row.get("event_name")
+        if not name or (self.version and row.get("game_version") != self.version):
+            self.skipped += 1
+            return
+        t = parse_time(row.get("created_at"))
+        if self.since is not None and (t is None or t < self.since):
+            self.skipped += 1
+            return
+
+        self.rows += 1
+        self.events[name] += 1
+        self.versions[row.get("game_version") or "?"] += 1
+        self.players.add(row.get("player_id"))
+        if t is not None:
+            if self.first is None or t < self.first:
+                self.first = t
+            if self.last is None or t > self.last:
+                self.last = t
+            if self.gap is not None:
+                if t < self.last - self.gap:
+                    self.late += 1
+                self._close_idle(t)
+
+        sid = row.get("session_id") or ""
+        s = self.open.get(sid)
+        if s is None:
+            s = self.open[sid] = _Session()
+        else:
+            self.open.move_to_end(sid)
+        if t is not None:
+            if s.first is None or t < s.first:
+                s.first = t
+            if s.last is None or t > s.last:
+                s.last = t
+        s.steps.add(name)
+
+        d = event_data(row)
+        lid = row.get("level_id") or "unknown"
+        if name == "player_died":
+            self._level(lid)["deaths"] += 1
+            s.died.add(lid)
+        elif name == "level_started":
+            lid = d.get("level_id") or lid
+            self._level(lid)["started"] += 1
+            s.started.add(lid)
+        elif name == "level_completed":
+            lid = d.get("level_id") or lid
+            stats = self._level(lid)
+            stats["completed"] += 1
+            stats["completion_deaths"] += _int(d.get("deaths_this_session"))
+            s.completed.add(lid)
+        elif name == "boss_fight_started" or name == "boss_phase_changed":
+            boss = self.boss.setdefault(lid, {"fights": 0, "ended": 0, "phases": Counter()})
+            if name == "boss_fight_started":
+                boss["fights"] += 1
+                phase = 1
+            else:
+                phase = _int(d.get("phase"))
+            if phase > s.boss.get(lid, 0):
+                s.boss[lid] = phase
+        elif name == "boss_fight_ended":
+            self.boss.setdefault(lid, {"fights": 0, "ended": 0, "phases": Counter()})["ended"] += 1
+        elif name == "portal_used":
+            self.portals[(str(d.get("from_level") or lid), str(d.get("to_level") or "?"))] += 1
+        elif name == "door_entered":
+            self.doors[(lid, str(d.get("destination") or "?"), bool(d.get("is_exit")))] += 1
+        elif name == "quest_progressed":
+            self.quests[str(d.get("quest_key") or "?")] += 1
+        elif name == "achievement_unlocked":
+            self.achievements[str(d.get("achievement_id") or "?")] += 1
+
+    # -- sessions -------------------------------------------------------------
+
+    def _close_idle(self, now: datetime):
+        cutoff = now - self.gap
+        while self.open:
+            sid, s = next(iter(self.open.items()))
+            if s.last is None or s.last >= cutoff:
+                break
+            del self.open[sid]
+            self._close(sid, s)
+
+    def _close(self, sid: str, s: _Session):
+        self.closed += 1
+        for step in s.steps:
+            self.funnel[step] += 1
+        for lid in s.started:
+            self._level(lid)["sessions"]["started"] += 1
+        for lid in s.died:
+            self._level(lid)["sessions"]["died"] += 1
+        for lid in s.completed:
+            self._level(lid)["sessions"]["completed"] += 1
+        for lid, phase in s.boss.items():
+            phases = self.boss[lid]["phases"]
+            for p in range(1, phase + 1):
+                phases[p] += 1
+        if s.first is not None:
+            self.lengths.append((s.last - s.first).total_seconds())
+
+    # -- output ---------------------------------------------------------------
+
+    def _session_stats(self) -> dict:
+        lengths = sorted(self.lengths)
+        hist = [[label, 0] for _, label in SESSION_BUCKETS]
+        for sec in lengths:
+            for i, (upper, _) in enumerate(SESSION_BUCKETS):
+                if sec < upper:
+                    hist[i][1] += 1
+                    break
+
+        def pct(p: float) -> float:
+            return round(lengths[min(len(lengths) - 1, int(p * len(lengths)))], 1) if lengths else 0
+
+        return {
+            "timed": len(lengths),
+            "mean_s": round(sum(lengths) / len(lengths), 1) if lengths else 0,
+            "p50_s": pct(0.5),
+            "p90_s": pct(0.9),
+            "max_s": round(lengths[-1], 1) if lengths else 0,
+            "histogram": hist,
+        }
+
+    def result(self, sources: list) -> dict:
+        """Close the remaining sessions and return the rollup dict."""
+        while self.open:
+            self._close(*self.open.popitem(last=False))
+        if self.late:
+            print(f"  WARN: {self.late} row(s) arrived more than --session-gap behind newer ones;"
+                  f" their sessions may be split (try --session-gap 0 for unordered input)", file=sys.stderr)
+
+        levels = {}
+        for lid in sorted(self.levels):
+            stats = self.levels[lid]
+            comp = stats.pop("completion_deaths")
+            stats["deaths_per_completion"] = round(comp / stats["completed"], 2) if stats["completed"] else None
+            levels[lid] = stats
+
+        return {
+            "meta": {
+                "schema": ROLLUP_SCHEMA,
+                "generated": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "sources": sources,
+                "version": self.version,
+                "since": self.since.isoformat(timespec="seconds") if self.since else None,
+                "rows": self.rows,
+                "skipped": self.skipped,
+                "first_event": self.first.isoformat() if self.first else None,
+                "last_event": self.last.isoformat() if self.last else None,
+            },
+            "totals": {
+                "events": self.rows,
+                "sessions": self.closed,
+                "players": len(self.players - {None, ""}),
+                "versions": dict(self.versions.most_common()),
+            },
+            "events": dict(self.events.most_common()),
+            "funnel": [{"step": step, "sessions": self.funnel[step], "events": self.events[step]}
+                       for step in FUNNEL_STEPS],
+            "levels": levels,
+            "boss": {lid: {"fights": b["fights"], "ended": b["ended"],
+                           "phases": {str(p): n for p, n in sorted(b["phases"].items())}}
+                     for lid, b in sorted(self.boss.items())},
+            "portals": [[a, b, n] for (a, b), n in self.portals.most_common()],
+            "doors": [[lid, dest, exit_, n] for (lid, dest, exit_), n in self.doors.most_common()],
+            "quests": dict(self.quests.most_common()),
+            "achievements": dict(self.achievements.most_common()),
+            "sessions": self._session_stats(),
+        }
+
+
+def _int(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def rollup(rows, version: str = None, since: datetime = None, session_gap: float = 360.0,
+           sources: list = None) -> dict:
+    """Roll up an iterable of event rows in one pass."""
+    r = Rollup(version, since, session_gap)
+    for row in rows:
+        r.add(row)
+    return r.result(sources or [])
+
+
+def rollup_json(data: dict) -> str:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False) + "\n"
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Roll up exported telemetry events for the dashboard's Analytics tab",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("files",         nargs="*", help=".jsonl / .csv exports (optionally .gz), or - for stdin")
+    parser.add_argument("--supabase",    action="store_true",
+                        help="Read from $SUPABASE_URL/rest/v1/events using $SUPABASE_KEY")
+    parser.add_argument("--version",     help="Only events of this game_version")
+    parser.add_argument("--days",        type=int, default=0, help="Only events from the last N days")
+    parser.add_argument("--session-gap", type=float, default=360.0, metavar="MIN",
+                        help="Fold sessions idle this many minutes (0 = keep all open until the end)")
+    parser.add_argument("--write",       action="store_true", help=f"Write {ROLLUP_FILE.name} into tools/.cache/")
+    parser.add_argument("--out",         type=Path, metavar="PATH", help="Write the rollup to PATH")
+    args = parser.parse_args()
+
+    if not args.files and not args.supabase:
+        parser.error("give export files or --supabase")
+
+    since = datetime.now(timezone.utc) - timedelta(days=args.days) if args.days > 0 else None
+    r = Rollup(args.version, since, args.session_gap)
+    sources = []
+    if args.supabase:
+        url, key = os.environ.get("SUPABASE_URL"), os.environ.get("SUPABASE_KEY")
+        if not url or not key:
+            print("ERROR: --supabase needs SUPABASE_URL and SUPABASE_KEY", file=sys.stderr)
+            sys.exit(2)
+        for row in iter_supabase(url, key, args.version, since):
+            r.add(row)
+        sources.append("supabase")
+    for path in args.files:
+        for row in iter_file(path):
+            r.add(row)
+        sources.append(Path(path).name)
+    data = r.result(sources)
+
+    t = data["totals"]
+    print(f"  {t['events']} event(s), {t['sessions']} session(s), {t['players']} player(s)"
+          f" ({data['meta']['skipped']} row(s) filtered out)", file=sys.stderr)
+
+    out = args.out or (ROLLUP_FILE if args.write else None)
+    text = rollup_json(data)
+    if out is None:
+        sys.stdout.write(text)
+        return
+    from quest_tool import write_atomic
+    write_atomic(out, [text])
+    print(f"Written to {out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""
+tres_parser.py -- Godot 4 text resource (.tres / .tscn) parser
+
+A single-pass scanner + recursive-descent parser for the format the editor
+writes: ``[section key=value ...]`` headers, ``key = value`` properties,
+strings with escapes (and literal newlines), numbers, bools, null,
+arrays, dictionaries, ``ExtResource("id")`` / ``SubResource("id")``
+references, typed arrays (``Array[ExtResource("2_line")]([...])``) and
+constructor calls such as ``Vector2(1, 2)`` or ``Color(1, 1, 1, 1)``.
+
+Section headers and ``key = value`` lines whose value is a plain literal
+(string, number, bool, null, Ext/SubResource reference) -- nearly every
+line of a DialogSequence -- are matched whole by one compiled regex; only
+arrays, dictionaries and constructor calls go through the tokenizer and
+the recursive-descent parser.  Both paths produce the same values.
+
+Any tool in this directory can ``import tres_parser``.  quest_tool.py uses
+``load_dialogs()``, which keeps parsed DialogSequence resources in an on-disk
+cache keyed on each file's mtime + size, so unchanged .tres files are only
+stat()ed, never re-read.
+
+Usage:
+  python tools/tres_parser.py levels/level_1/dialogs/spawn.tres
+      Print the parsed resource as JSON.
+
+  python tools/tres_parser.py --dialog levels/level_1/dialogs/spawn.tres
+      Print the dialog summary quest_tool.py builds from it.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+try:
+    import orjson as _fastjson   # optional: the dialog cache loads several times faster
+except ImportError:
+    _fastjson = None
+
+# ---------------------------------------------------------------------------
+# Values
+# ---------------------------------------------------------------------------
+
+class ExtResource(NamedTuple):
+    id: str
+
+
+class SubResource(NamedTuple):
+    id: str
+
+
+class Constructor(NamedTuple):
+    """Any other ``Name(args...)`` value: Vector2, Color, NodePath, Rect2, ..."""
+    name: str
+    args: tuple
+
+
+class TresParseError(ValueError):
+    def __init__(self, msg: str, lineno: int, colno: int):
+        super().__init__(f"{msg} (line {lineno}, column {colno})")
+        self.msg = msg
+        self.lineno = lineno
+        self.colno = colno
+
+# ---------------------------------------------------------------------------
+# Tokenizer
+# ---------------------------------------------------------------------------
+
+# A property key is only recognised at the start of a line and must be
+# followed by '='; keys may contain '/', ':' and '.' (metadata/foo, 0:0/0).
+_TOKEN_RE = re.compile(r"""
+    (?P<skip>[ \t\r\n]+|;[^\n]*)
+  | (?P<key>^[A-Za-z0-9_][\w/:.@-]*)(?=[ \t]*=)
+  | (?P<string>[&^]?"[^"\\]*(?:\\.[^"\\]*)*")
+  | (?P<number>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+  | (?P<ident>[A-Za-z_]\w*)
+  | (?P<punct>[\[\]{}(),:=])
+""", re.VERBOSE | re.MULTILINE | re.DOTALL)
+
+_ESCAPE_RE = re.compile(r'\\(u[0-9a-fA-F]{4}|U[0-9a-fA-F]{6}|.)', re.DOTALL)
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "a": "\a", "v": "\v"}
+
+_KEYWORDS = {"true": True, "false": False, "null": None, "nil": None,
+             "inf": float("inf"), "inf_neg": float("-inf"), "nan": float("nan")}
+
+
+def _unescape(body: str) -> str:
+    def sub(m: re.Match) -> str:
+        e = m.group(1)
+        if e[0] in "uU" and len(e) > 1:
+            return chr(int(e[1:], 16))
+        return _ESCAPES.get(e, e)
+    return _ESCAPE_RE.sub(sub, body) if "\\" in body else body
+
+
+def quote(s: str) -> str:
+    """Quote a string the way the editor writes it (newlines stay literal)."""
+    return '"' + s.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _line_col(text: str, pos: int) -> tuple:
+    line = text.count("\n", 0, pos) + 1
+    return line, pos - (text.rfind("\n", 0, pos) + 1) + 1
+
+
+def tokenize(text: str, pos: int = 0):
+    """Yield ``(kind, value, pos)``; kind is key/string/number/ident/punct/eof."""
+    end = len(text)
+    match = _TOKEN_RE.match
+    while pos < end:
+        m = match(text, pos)
+        if m is None:
+            msg = "unterminated string" if text[pos] in '"&^' else f"unexpected character {text[pos]!r}"
+            raise TresParseError(msg, *_line_col(text, pos))
+        kind = m.lastgroup
+        if kind != "skip":
+            tok = m.group(kind)
+            if kind == "string":
+                tok = _unescape(tok[tok.index('"') + 1:-1])
+            elif kind == "number":
+                tok = float(tok) if any(c in tok for c in ".eE") else int(tok)
+            yield kind, tok, pos
+        pos = m.end()
+    yield "eof", None, end
+
+# ---------------------------------------------------------------------------
+# Parser
+# ---------------------------------------------------------------------------
+
+class _Parser:
+    def __init__(self, text: str, pos: int = 0):
+        self.text = text
+        self.tokens = tokenize(text, pos)
+        self.tok = next(self.tokens)
+
+    def error(self, msg: str):
+        raise TresParseError(msg, *_line_col(self.text, self.tok[2]))
+
+    def advance(self) -> tuple:
+        tok = self.tok
+        self.tok = next(self.tokens)
+        return tok
+
+    def expect(self, punct: str):
+        if self.tok[0] != "punct" or self.tok[1] != punct:
+            self.error(f"expected {punct!r}, got {self.tok[1]!r}")
+        self.advance()
+
+    def at(self, punct: str) -> bool:
+        return self.tok[0] == "punct" and self.tok[1] == punct
+
+    def _items(self, close: str, item) -> list:
+        out = []
+        while not self.at(close):
+            out.append(item())
+            if not self.at(close):
+                self.expect(",")
+        self.advance()
+        return out
+
+    def value(self):
+        kind, tok, _pos = self.tok
+        if kind in ("string", "number"):
+            self.advance()
+            return tok
+        if kind == "punct" and tok == "[":
+            self.advance()
+            return self._items("]", self.value)
+        if kind == "punct" and tok == "{":
+            self.advance()
+            return dict(self._items("}", self._pair))
+        if kind == "ident":
+            self.advance()
+            if tok in _KEYWORDS:
+                return _KEYWORDS[tok]
+            if tok in ("Array", "Dictionary") and self.at("["):
+                self.advance()
+                self._items("]", self._type)      # element type(s): not needed
+                self.expect("(")
+                inner = self.value()
+                self.expect(")")
+                return inner
+            self.expect("(")
+            args = self._items(")", self.value)
+            if tok == "ExtResource":
+                return ExtResource(args[0])
+            if tok == "SubResource":
+                return SubResource(args[0])
+            return Constructor(tok, tuple(args))
+        self.error(f"unexpected {tok!r}")
+
+    def _type(self):
+        """A typed-container element type: ``int``, ``String`` or ``ExtResource("id")``."""
+        if self.tok[0] == "ident":
+            name = self.advance()[1]
+            if self.at("("):
+                self.advance()
+                return Constructor(name, tuple(self._items(")", self.value)))
+            return name
+        self.error(f"expected type name, got {self.tok[1]!r}")
+
+    def _pair(self) -> tuple:
+        k = self.value()
+        self.expect(":")
+        return k, self.value()
+
+    def header(self) -> tuple:
+        """``[tag attr=value ...]`` -> (tag, attrs)."""
+        self.expect("[")
+        if self.tok[0] != "ident":
+            self.error(f"expected section name, got {self.tok[1]!r}")
+        tag, attrs = self.advance()[1], {}
+        while not self.at("]"):
+            if self.tok[0] not in ("ident", "key"):
+                self.error(f"expected attribute name, got {self.tok[1]!r}")
+            name = self.advance()[1]
+            self.expect("=")
+            attrs[name] = self.value()
+        self.advance()
+        return tag, attrs
+
+    def prop(self) -> tuple:
+        """``key = value`` -> (key, value)."""
+        name = self.advance()[1]
+        self.expect("=")
+        return name, self.value()
+
+    def resume_pos(self) -> int:
+        """Where the token after the last parsed one starts."""
+        return self.tok[2]
+
+# ---------------------------------------------------------------------------
+# Scanner (fast path)
+# ---------------------------------------------------------------------------
+
+_LITERAL = r"""(?:[&^]?"[^"\\]*(?:\\.[^"\\]*)*"
+              |[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?(?![\w.])
+              |true\b|false\b|null\b
+              |(?:Ext|Sub)Resource\([ \t]*"[^"\\]*"[ \t]*\))"""
+_ITEMS = r"\[\s*(?P<items>(?:" + _LITERAL + r"(?:\s*,\s*" + _LITERAL + r")*\s*,?)?)\s*\]"
+_KEY = r"[A-Za-z0-9_][\w/:.@-]*"
+
+# One match per header or property line, trailing blank lines included.
+# A property value must be a literal or a (typed) array of literals that
+# ends the line; anything else is left to the parser.
+_LINE_RE = re.compile(r"""
+    (?P<prop>^(?P<key>""" + _KEY + r""")[ \t]*=[ \t]*
+        (?:(?P<value>""" + _LITERAL + r""")
+          |Array\[[^\[\]()]*(?:\([^()]*\))?\]\(""" + _ITEMS + r"""\)
+          |""" + _ITEMS.replace("items", "items2") + r"""
+        )[ \t]*(?:\r?\n|\Z)(?:[ \t]*\r?\n)*)
+  | (?P<head>\[(?P<tag>[A-Za-z_]\w*)
+        (?P<attrs>(?:[ \t]+""" + _KEY + r"""[ \t]*=[ \t]*""" + _LITERAL + r""")*)[ \t]*\](?:[ \t]*\r?\n)*)
+  | (?P<skip>[ \t\r\n]+|;[^\n]*)
+""", re.VERBOSE | re.MULTILINE | re.DOTALL)
+
+_ATTR_RE = re.compile(r"(" + _KEY + r")[ \t]*=[ \t]*(" + _LITERAL + ")", re.VERBOSE | re.DOTALL)
+_LITERAL_RE = re.compile(_LITERAL, re.VERBOSE | re.DOTALL)
+
+
+def _literal(tok: str):
+    """Value of a token matched by _LITERAL, exactly as the parser would build it."""
+    c = tok[0]
+    if c == '"':
+        body = tok[1:-1]
+        return _unescape(body) if "\\" in body else body
+    if c in "&^":
+        return _unescape(tok[2:-1])
+    if c == "E" or c == "S":
+        ref = tok[tok.index('"') + 1:tok.rindex('"')]
+        return ExtResource(ref) if c == "E" else SubResource(ref)
+    if tok in _KEYWORDS:
+        return _KEYWORDS[tok]
+    return float(tok) if "." in tok or "e" in tok or "E" in tok else int(tok)
+
+
+def iter_sections(text: str):
+    """Lazily parse ``text``, yielding ``{"tag", "attrs", "props"}`` per ``[section]``.
+
+    Consecutive _LINE_RE matches are decoded directly; where the next match
+    does not start at the current position (or there is none), a _Parser
+    takes over for one header or property and hands back the position
+    after it.
+    """
+    pos, end = 0, len(text)
+    section = props = None
+    while pos < end:
+        for m in _LINE_RE.finditer(text, pos):
+            if m.start() != pos:
+                break
+            prop, key, value, items, items2, head, tag, attrs, _skip = m.groups()
+            if prop is not None:
+                if section is None:
+                    break           # a property before any section: the parser reports it
+                if value is not None:
+                    props[key] = _literal(value)
+                else:
+                    props[key] = [_literal(v) for v in _LITERAL_RE.findall(items if items is not None else items2)]
+            elif head is not None:
+                if section is not None:
+                    yield section
+                props = {}
+                section = {"tag": tag, "attrs": {k: _literal(v) for k, v in _ATTR_RE.findall(attrs)},
+                           "props": props}
+            pos = m.end()
+        if pos >= end:
+            break
+        p = _Parser(text, pos)
+        if p.at("["):
+            tag, attrs = p.header()
+            if section is not None:
+                yield section
+            props = {}
+            section = {"tag": tag, "attrs": attrs, "props": props}
+        elif p.tok[0] == "key" and section is not None:
+            key, value = p.prop()
+            props[key] = value
+        else:
+            p.expect("[")
+        pos = p.resume_pos()
+    if section is not None:
+        yield section
+
+
+def parse(text: str) -> dict:
+    """Parse a whole .tres/.tscn into
+
+    ``{"header": attrs, "type": str, "ext_resources": {id: attrs},
+    "sub_resources": {id: {"type", "props"}}, "resource": props,
+    "sections": [every section in file order]}``
+    """
+    res = {"header": {}, "type": "", "ext_resources": {}, "sub_resources": {},
+           "resource": {}, "sections": []}
+    for section in iter_sections(text):
+        tag, attrs = section["tag"], section["attrs"]
+        res["sections"].append(section)
+        if tag in ("gd_resource", "gd_scene"):
+            res["header"] = attrs
+            res["type"] = attrs.get("script_class") or attrs.get("type", tag)
+        elif tag == "ext_resource":
+            res["ext_resources"][attrs.get("id")] = attrs
+        elif tag == "sub_resource":
+            res["sub_resources"][attrs.get("id")] = {"type": attrs.get("type", ""), "props": section["props"]}
+        elif tag == "resource":
+            res["resource"] = section["props"]
+    return res
+
+
+def parse_file(path: Path) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return parse(f.read())
+
+
+def to_json(value):
+    """Make a parsed value JSON-serialisable (refs become {"ExtResource": id} etc.)."""
+    if isinstance(value, (ExtResource, SubResource)):
+        return {type(value).__name__: value.id}
+    if isinstance(value, Constructor):
+        return {value.name: [to_json(a) for a in value.args]}
+    if isinstance(value, dict):
+        return {str(k): to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(v) for v in value]
+    return value
+
+# ---------------------------------------------------------------------------
+# DialogSequence resources
+# ---------------------------------------------------------------------------
+
+DIALOG_CACHE_VERSION = 1
+
+
+def dialog_from_resource(res: dict) -> dict:
+    """Summarise a parsed DialogSequence the way quest_tool.py reports it."""
+    props = res["resource"]
+    lines = []
+    for ref in props.get("lines", []):
+        sub = res["sub_resources"].get(ref.id) if isinstance(ref, SubResource) else None
+        if sub is None:
+            continue
+        p = sub["props"]
+        lines.append({
+            "character": p.get("character_name", ""),
+            "text": p.get("text", ""),
+            "voice_pitch": float(p.get("voice_pitch", 1.0)),
+        })
+    return {
+        "description": props.get("description", ""),
+        "one_shot": bool(props.get("one_shot", True)),
+        "line_count": len(lines),
+        "lines": lines,
+    }
+
+
+def _scan_dialogs(levels_dir: Path) -> list:
+    """Sorted ``(rel parts, os.DirEntry)`` for levels/<level>/dialogs/**/*.tres.
+
+    os.scandir instead of Path.glob: at tens of thousands of dialogs the
+    pathlib overhead costs more than parsing the cached ones.
+    """
+    found = []
+    try:
+        levels = sorted(e.name for e in os.scandir(levels_dir) if e.is_dir())
+    except OSError:
+        return []
+    for level in levels:
+        stack = [((level, "dialogs"), os.path.join(levels_dir, level, "dialogs"))]
+        while stack:
+            parts, path = stack.pop()
+            try:
+                entries = list(os.scandir(path))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir():
+                    stack.append((parts + (entry.name,), entry.path))
+                elif entry.name.endswith(".tres"):
+                    found.append((parts + (entry.name,), entry))
+    found.sort(key=lambda item: item[0])
+    return found
+
+
+def dialog_files(levels_dir: Path) -> list:
+    """Every levels/<level>/dialogs/**/*.tres, sorted."""
+    return [Path(entry.path) for _parts, entry in _scan_dialogs(levels_dir)]
+
+
+def dialog_id(parts: tuple) -> str:
+    """levels-relative path parts -> dialog id (level_town/purple_karim/intro)."""
+    return parts[0] + "/" + "/".join(parts[2:])[:-len(".tres")]
+
+
+def _parser_fingerprint() -> str:
+    return hashlib.sha1(Path(__file__).read_bytes()).hexdigest()
+
+
+def load_dialogs(levels_dir: Path, cache_path: Path = None) -> dict:
+    """dialog id -> dialog summary (plus "file") for every dialog .tres.
+
+    With ``cache_path``, files whose mtime and size match the cached entry
+    are not opened.  The cache is rewritten only when something changed and
+    is discarded when this parser changes.
+    """
+    cache = {}
+    if cache_path is not None and cache_path.exists():
+        try:
+            raw = cache_path.read_bytes()
+            cache = _fastjson.loads(raw) if _fastjson else json.loads(raw)
+        except (OSError, ValueError):
+            cache = {}
+    fingerprint = f"{DIALOG_CACHE_VERSION}:{_parser_fingerprint()}"
+    cached = cache.get("files", {}) if cache.get("fingerprint") == fingerprint else {}
+
+    dialogs = {}
+    files = {}
+    dirty = False
+    for parts, dirent in _scan_dialogs(levels_dir):
+        key = "/".join(parts)
+        try:
+            st = dirent.stat()
+        except OSError:
+            continue
+        entry = cached.get(key)
+        if entry is None or entry["mtime_ns"] != st.st_mtime_ns or entry["size"] != st.st_size:
+            try:
+                dialog = dialog_from_resource(parse_file(dirent.path))
+            except (OSError, UnicodeDecodeError, TresParseError) as e:
+                print(f"  WARN: failed to parse {dirent.name}: {e}", file=sys.stderr)
+                continue
+            entry = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "dialog": dialog}
+            dirty = True
+        files[key] = entry
+        dialogs[dialog_id(parts)] = dict(entry["dialog"], file=key)
+    dirty = dirty or files.keys() != cached.keys()
+
+    if cache_path is not None and dirty:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"fingerprint": fingerprint, "files": files}, ensure_ascii=False),
+                           encoding="utf-8")
+            os.replace(tmp, cache_path)
+        except OSError as e:
+            print(f"  WARN: could not write dialog cache: {e}", file=sys.stderr)
+    return dialogs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse a Godot text resource and print it as JSON")
+    parser.add_argument("files", type=Path, nargs="+")
+    parser.add_argument("--dialog", action="store_true", help="Print the DialogSequence summary instead")
+    args = parser.parse_args()
+
+    status = 0
+    for path in args.files:
+        try:
+            res = parse_file(path)
+        except (OSError, TresParseError) as e:
+            print(f"ERROR: {path}: {e}", file=sys.stderr)
+            status = 1
+            continue
+        out = dialog_from_resource(res) if args.dialog else to_json(res)
+        print(json.dumps(out, indent=2, ensure_ascii=False))
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+trim_frames.py -- Trim animation frames and share identical ones across strips
+
+Cuts every strip into frames (``<name>_<frames>.png``, or the cells listed in
+a split_sprites.py ``*_frames.json`` next to it), crops each frame to the
+bounding box of its non-transparent pixels and hashes the cropped pixels.
+Identical frames -- within a strip or across strips -- are stored once.  The
+unique frames are packed (atlas_pack.py's MaxRects, padding and extrusion)
+into one compacted sheet, and every original frame gets an AtlasTexture
+.tres whose ``margin`` restores the untrimmed frame size, so an animation
+built from them lines up exactly like the strip did.  Fully transparent
+pixels are cleared to (0, 0, 0, 0) before hashing.
+
+The report lists per strip: frames, unique frames (not seen in an earlier
+strip), pixels before (the strip), its newly stored trimmed pixels, and its
+share of the packed sheet(s) -- the sheet area split over the frames in
+proportion to the space each takes, padding and extrusion included -- with
+the RGBA8 VRAM that saves (4 bytes per pixel).  The shares add up to the
+sheet, so the per-strip savings add up to the total.
+
+Usage:
+  python tools/trim_frames.py --dry-run
+      Report the savings for the default strips without writing anything.
+
+  python tools/trim_frames.py
+      Write assets/sprites/trimmed/frames.png (+ frames.json and
+      <strip>/<strip>_<n>.tres per frame).
+
+  python tools/trim_frames.py "levels/shared/*_[0-9].png" --name dust --json
+      Other strips, another sheet name, machine-readable report.
+
+Sheet metadata (<name>.json):
+  {"sheets": {...}, "strips": {res path: {"frame_size": [w, h], "frames":
+   [{"hash", "sheet", "rect": [x, y, w, h] | null, "offset": [x, y],
+     "texture"}]}}}
+  A frame is drawn from ``rect`` at ``offset`` inside a frame_size cell;
+  empty frames have no rect.
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+import atlas_pack
+
+TOOLS_DIR   = Path(__file__).parent
+GODOT_DIR   = TOOLS_DIR.parent
+DEFAULT_OUT = GODOT_DIR / "assets" / "sprites" / "trimmed"
+
+DEFAULT_STRIPS = [
+    "player/sprites/Owlet_Monster_*_[0-9]*.png",
+    "assets/sprites/player/player_*.png",         # split_sprites.py output, when present
+    "items/sprites/rocket_flame_4.png",
+    "levels/shared/*_Dust_[0-9]*.png",
+]
+
+BYTES_PER_PIXEL = 4
+
+# ---------------------------------------------------------------------------
+# Frames
+# ---------------------------------------------------------------------------
+
+def trim(frame: np.ndarray) -> tuple:
+    """(cropped RGBA, (x, y)) for the non-transparent bounding box; (None, (0, 0)) if empty."""
+    opaque = frame[..., 3] > 0
+    ys = np.flatnonzero(opaque.any(axis=1))
+    if not len(ys):
+        return None, (0, 0)
+    xs = np.flatnonzero(opaque.any(axis=0))
+    crop = frame[ys[0]:ys[-1] + 1, xs[0]:xs[-1] + 1].copy()
+    crop[crop[..., 3] == 0] = 0
+    return crop, (int(xs[0]), int(ys[0]))
+
+
+def frame_hash(crop: np.ndarray) -> str:
+    h = hashlib.sha1(np.array(crop.shape[:2], dtype="<u4").tobytes())
+    h.update(np.ascontiguousarray(crop).tobytes())
+    return h.hexdigest()
+
+# ---------------------------------------------------------------------------
+# Compaction
+# ---------------------------------------------------------------------------
+
+def compact(strips: list, out_dir: Path, name: str, padding: int = 1, extrude: int = 1,
+            max_size: int = 1024, dry_run: bool = False) -> tuple:
+    """Trim, dedupe and pack ``strips``; returns (metadata, report rows, changed paths)."""
+    unique = {}          # hash -> cropped pixels, in first-seen order
+    strip_frames = {}
+    stored = {}          # strip -> hashes it stored first
+    report = []
+    for path in strips:
+        rgba = np.asarray(Image.open(path).convert("RGBA"))
+        h, w = rgba.shape[:2]
+        cells = atlas_pack.frame_cells(path, w, h)
+        frames, new_px, dupes, new = [], 0, 0, []
+        for cx, cy, cw, ch in cells:
+            crop, offset = trim(rgba[cy:cy + ch, cx:cx + cw])
+            digest = None
+            if crop is not None:
+                digest = frame_hash(crop)
+                if digest in unique:
+                    dupes += 1
+                else:
+                    unique[digest] = crop
+                    new.append(digest)
+                    new_px += crop.shape[0] * crop.shape[1]
+            frames.append({"hash": digest, "offset": list(offset), "size": [cw, ch]})
+        strip_frames[path] = frames
+        stored[path] = new
+        before = w * h
+        report.append({
+            "strip": atlas_pack._res(path),
+            "frames": len(cells),
+            "unique": len(cells) - dupes - sum(1 for f in frames if f["hash"] is None),
+            "duplicates": dupes,
+            "pixels_before": before,
+            "pixels_trimmed": new_px,
+        })
+
+    # Pack the unique frames like atlas_pack.py packs sprites
+    out_dir = out_dir.resolve()
+    hashes = list(unique)
+    border = extrude * 2 + padding
+    order = sorted(range(len(hashes)), key=lambda i: (-max(unique[hashes[i]].shape[:2]),
+                                                     -unique[hashes[i]].shape[0] * unique[hashes[i]].shape[1], i))
+    sizes = [(unique[hashes[i]].shape[1] + border, unique[hashes[i]].shape[0] + border) for i in order]
+    outputs = atlas_pack._Outputs(dry_run)
+    placed = {}
+    sheets = {}
+    pages = atlas_pack.pack_pages(sizes, max_size, padding) if sizes else []
+    for page_no, ((pw, ph), positions) in enumerate(pages):
+        sheet_path = out_dir / (f"{name}.png" if len(pages) == 1 else f"{name}_{page_no}.png")
+        sheet_res = atlas_pack._res(sheet_path)
+        canvas = np.zeros((ph, pw, 4), dtype=np.uint8)
+        for k, (x, y) in sorted(positions.items()):
+            crop = unique[hashes[order[k]]]
+            ch, cw = crop.shape[:2]
+            if extrude:
+                crop = np.pad(crop, ((extrude, extrude), (extrude, extrude), (0, 0)), mode="edge")
+            canvas[y:y + crop.shape[0], x:x + crop.shape[1]] = crop
+            placed[hashes[order[k]]] = (sheet_res, [x + extrude, y + extrude, cw, ch])
+        outputs.add(sheet_path, atlas_pack._png_bytes(canvas))
+        sheets[sheet_path.stem] = {"file": sheet_res, "size": [pw, ph], "frames": len(positions)}
+
+    # Charge each strip the share of the sheet area its stored frames take up
+    sheet_px = sum(pw * ph for (pw, ph), _ in pages)
+    box_px = {hashes[i]: w * h for i, (w, h) in zip(order, sizes)}
+    total_box = sum(box_px.values()) or 1
+    charged = 0.0
+    for r, path in zip(report, strips):
+        # Round the running total, so the shares add up to sheet_px exactly
+        share = -round(charged)
+        charged += sheet_px * sum(box_px[d] for d in stored[path]) / total_box
+        share += round(charged)
+        r["pixels_after"] = share
+        r["pixels_saved"] = r["pixels_before"] - share
+        r["vram_saved"] = r["pixels_saved"] * BYTES_PER_PIXEL
+
+    meta = {"padding": padding, "extrude": extrude, "sheets": sheets, "strips": {}}
+    for path, frames in strip_frames.items():
+        stem = path.stem
+        entries = []
+        for i, f in enumerate(frames):
+            fw, fh = f["size"]
+            entry = {"hash": f["hash"], "sheet": None, "rect": None, "offset": f["offset"]}
+            if f["hash"] is not None:
+                sheet_res, rect = placed[f["hash"]]
+                entry["sheet"], entry["rect"] = sheet_res, rect
+                ox, oy = f["offset"]
+                tex_path = out_dir / stem / f"{stem}_{i}.tres"
+                margin = (ox, oy, fw - rect[2], fh - rect[3])
+                outputs.add(tex_path, atlas_pack.atlas_texture_tres(sheet_res, rect, margin).encode("utf-8"))
+                entry["texture"] = atlas_pack._res(tex_path)
+            entries.append(entry)
+        meta["strips"][atlas_pack._res(path)] = {"frame_size": frames[0]["size"] if frames else [0, 0],
+                                                 "frames": entries}
+
+    meta_path = out_dir / f"{name}.json"
+    stale = []
+    try:
+        previous = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        previous = {}
+    for sheet in previous.get("sheets", {}).values():
+        stale.append(GODOT_DIR / sheet["file"][len("res://"):])
+    for strip in previous.get("strips", {}).values():
+        for f in strip["frames"]:
+            if f.get("texture"):
+                stale.append(GODOT_DIR / f["texture"][len("res://"):])
+    outputs.add(meta_path, (json.dumps(meta, indent=2, sort_keys=True) + "\n").encode("utf-8"))
+    changed = outputs.commit([p.resolve() for p in stale])
+    return meta, report, changed
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def _human(n: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(n) < 1024 or unit == "MiB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Trim animation frames, dedupe identical ones and pack a compacted sheet",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("strips",     nargs="*", help="Strip globs relative to the project (default: player, flame, dust)")
+    parser.add_argument("--out",      type=Path, default=DEFAULT_OUT, help="Output directory (inside the project)")
+    parser.add_argument("--name",     default="frames", help="Sheet / metadata file name")
+    parser.add_argument("--padding",  type=int, default=1)
+    parser.add_argument("--extrude",  type=int, default=1)
+    parser.add_argument("--max-size", type=int, default=1024, help="Largest sheet side (power of two)")
+    parser.add_argument("--dry-run",  action="store_true", help="Report only; write nothing")
+    parser.add_argument("--json",     action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    out_dir = (GODOT_DIR / args.out) if not args.out.is_absolute() else args.out
+    if not out_dir.resolve().is_relative_to(GODOT_DIR.resolve()):
+        parser.error("--out must be inside the Godot project (textures are referenced by res:// path)")
+    strips = atlas_pack._inputs(args.strips or DEFAULT_STRIPS)
+    if not strips:
+        print("ERROR: no strips matched", file=sys.stderr)
+        sys.exit(2)
+
+    try:
+        meta, report, changed = compact(strips, out_dir, args.name, args.padding, args.extrude,
+                                        args.max_size, args.dry_run)
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    before = sum(r["pixels_before"] for r in report)
+    trimmed = sum(r["pixels_trimmed"] for r in report)
+    sheet_px = sum(s["size"][0] * s["size"][1] for s in meta["sheets"].values())
+    if args.json:
+        print(json.dumps({"strips": report, "pixels_before": before, "pixels_trimmed": trimmed,
+                          "pixels_after": sheet_px, "sheets": meta["sheets"]}, indent=2))
+        return
+
+    print(f"  {'strip':<48} {'frames':>6} {'uniq':>5} {'dup':>4} {'px before':>10} {'trimmed px':>10} "
+          f"{'sheet px':>9} {'saved':>6} {'VRAM saved':>11}")
+    for r in report:
+        pct = r["pixels_saved"] / r["pixels_before"] if r["pixels_before"] else 0.0
+        print(f"  {r['strip'][len('res://'):]:<48} {r['frames']:>6} {r['unique']:>5} {r['duplicates']:>4} "
+              f"{r['pixels_before']:>10} {r['pixels_trimmed']:>10} {r['pixels_after']:>9} {pct:>6.0%} "
+              f"{_human(r['vram_saved']):>11}")
+    print(f"  total: {before} px -> {trimmed} px of unique trimmed frames, packed into {sheet_px} px of "
+          f"sheet(s): {_human((before - sheet_px) * BYTES_PER_PIXEL)} VRAM saved")
+    if args.dry_run:
+        print(f"  {len(changed)} file(s) would change")
+        return
+    for path in changed:
+        print(f"  written: {path}")
+
+
+if __name__ == "__main__":
+    main()